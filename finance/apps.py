@@ -8,3 +8,13 @@ class FinanceConfig(AppConfig):
     def ready(self):
         # import signals
         from . import signals  # noqa
+
+        # SQLite table rebuilds drop the full-text sync triggers
+        from django.db.models.signals import post_migrate
+        from .search import ensure_search_index
+        post_migrate.connect(ensure_search_index, sender=self)
+
+        # Request metrics time the queries of every connection (see finance/metrics.py)
+        from django.db.backends.signals import connection_created
+        from .metrics import install_query_timer
+        connection_created.connect(install_query_timer)
@@ -0,0 +1,135 @@
+# finance/archive.py
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from .balances import effect_amount
+from .models import ArchivedTransaction, ArchivedTransfer, CarryForward, Transaction, Transfer
+from .watermarks import touch_owners
+
+# Rows moved per database transaction (one id list per INSERT ... SELECT and DELETE)
+ARCHIVE_CHUNK_SIZE = 500
+
+# Default age of the archived rows
+DEFAULT_ARCHIVE_MONTHS = 24
+
+
+def default_cutoff(months=DEFAULT_ARCHIVE_MONTHS, today=None):
+    """First day of the month ``months`` months before ``today``: older rows are archived."""
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _move_rows(model, archive_model, pks):
+    """
+    Copies rows into the archive table and deletes them from the hot table
+    with one INSERT ... SELECT and one DELETE, so no model signal reverses
+    their balance or rollup effect.
+    """
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in archive_model._meta.concrete_fields)
+    hot, archive = quote(model._meta.db_table), quote(archive_model._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {archive} ({columns}) SELECT {columns} FROM {hot} WHERE id IN ({placeholders})", pks
+        )
+        cursor.execute(f"DELETE FROM {hot} WHERE id IN ({placeholders})", pks)
+
+
+def _carry_forward(amounts, counts, cutoff):
+    """Adds the moved rows' effects to the accounts' CarryForward rows."""
+    existing = CarryForward.objects.select_for_update().in_bulk(amounts.keys())
+    created = []
+    for account_id, amount in amounts.items():
+        carry = existing.get(account_id)
+        if carry is None:
+            created.append(CarryForward(account_id=account_id, cutoff=cutoff, amount=amount,
+                                        count=counts[account_id]))
+            continue
+        carry.amount += amount
+        carry.count += counts[account_id]
+        carry.cutoff = max(carry.cutoff, cutoff)
+    CarryForward.objects.bulk_create(created)
+    CarryForward.objects.bulk_update(existing.values(), ['amount', 'count', 'cutoff'])
+
+
+def _archive_chunk(rows, model, archive_model, effects, cutoff):
+    """Moves ``rows`` (tuples starting with ``pk, owner_id``) and records ``effects``."""
+    amounts = defaultdict(Decimal)
+    counts = defaultdict(int)
+    for row in rows:
+        for account_id, amount in effects(row):
+            amounts[account_id] += amount
+            counts[account_id] += 1
+    _move_rows(model, archive_model, [row[0] for row in rows])
+    _carry_forward(amounts, counts, cutoff)
+    # Lists, ETags and cached responses no longer include the rows
+    touch_owners(*{row[1] for row in rows})
+
+
+def _transaction_effects(row):
+    _pk, _owner_id, account_id, amount, category_type = row
+    return [(account_id, effect_amount(amount, category_type))]
+
+
+def _transfer_effects(row):
+    _pk, _owner_id, from_account_id, to_account_id, amount = row
+    if from_account_id == to_account_id:
+        return [(from_account_id, Decimal('0.00'))]
+    return [(from_account_id, -amount), (to_account_id, amount)]
+
+
+def archive_chunk(kind, cutoff, after_id=0, owner_ids=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Archives the next ``chunk_size`` transactions (``kind='transactions'``)
+    or transfers dated before ``cutoff`` with an id above ``after_id``, in
+    one database transaction.
+
+    ``Account.balance`` is not touched: the moved rows' effect is added to
+    the accounts' CarryForward, and the rollup and budget counters keep
+    counting them.
+
+    Returns:
+        tuple: (last id or None when nothing is left, rows archived)
+    """
+    if kind == 'transactions':
+        model, archive_model, effects = Transaction, ArchivedTransaction, _transaction_effects
+        columns = ('pk', 'owner_id', 'account_id', 'amount', 'category__type')
+    else:
+        model, archive_model, effects = Transfer, ArchivedTransfer, _transfer_effects
+        columns = ('pk', 'owner_id', 'from_account_id', 'to_account_id', 'amount')
+
+    with transaction.atomic():
+        rows = model.objects.filter(date__lt=cutoff, pk__gt=after_id)
+        if owner_ids:
+            rows = rows.filter(owner_id__in=owner_ids)
+        rows = list(rows.order_by('pk').values_list(*columns)[:chunk_size])
+        if not rows:
+            return None, 0
+        _archive_chunk(rows, model, archive_model, effects, cutoff)
+    return rows[-1][0], len(rows)
+
+
+def archive_ledger(cutoff, owner_ids=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Moves every transaction and transfer dated before ``cutoff`` to the
+    archive tables, chunk by chunk. Running it again (or after an
+    interruption) only picks up what is left.
+
+    Returns:
+        tuple: (transactions archived, transfers archived)
+    """
+    archived = []
+    for kind in ('transactions', 'transfers'):
+        after_id = total = 0
+        while True:
+            after_id, count = archive_chunk(kind, cutoff, after_id, owner_ids, chunk_size)
+            if after_id is None:
+                break
+            total += count
+        archived.append(total)
+    return tuple(archived)
@@ -0,0 +1,6 @@
+# finance/async_urls.py
+from .async_views import async_read_urlpatterns
+from .urls import ASYNC_READ_ROUTES, urlpatterns as sync_urlpatterns
+
+# finance.urls with the hot read routes served by async views (ASGI only, see project_finance/asgi_urls.py)
+urlpatterns = async_read_urlpatterns(sync_urlpatterns, ASYNC_READ_ROUTES)
@@ -0,0 +1,54 @@
+# finance/async_views.py
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.urls import URLPattern
+
+
+def _plain_response(response):
+    """
+    Renders a DRF response into a plain HttpResponse, so Django's async
+    handler does not hand the (already cheap) rendering to a thread.
+    """
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+def async_read_view(sync_view):
+    """
+    Wraps a router view of a viewset with AsyncReadMixin into an async view.
+
+    GET requests the viewset supports (see ``AsyncReadMixin.async_actions``)
+    are served by its async handlers on the event loop; everything else
+    (writes, the browsable API, unsupported filters) runs ``sync_view`` in a
+    thread, exactly as Django runs a sync view under ASGI.
+    """
+    viewset, actions, initkwargs = sync_view.cls, sync_view.actions, sync_view.initkwargs
+    fallback = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == 'GET':
+            self = viewset(**initkwargs)
+            self.action_map = actions
+            response = await self.adispatch(request, *args, **kwargs)
+            if response is not None:
+                return _plain_response(response)
+        return await fallback(request, *args, **kwargs)
+
+    # Attributes DRF and the router tooling read from viewset views
+    view.cls = viewset
+    view.initkwargs = initkwargs
+    view.actions = actions
+    view.csrf_exempt = True
+    return view
+
+
+def async_read_urlpatterns(patterns, names):
+    """Returns ``patterns`` with the routes named in ``names`` served by async_read_view()."""
+    return [
+        URLPattern(pattern.pattern, async_read_view(pattern.callback), pattern.default_args, pattern.name)
+        if pattern.name in names else pattern
+        for pattern in patterns
+    ]
@@ -0,0 +1,161 @@
+# finance/authentication.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+DEFAULT_USER_CACHE_SIZE = 10000
+DEFAULT_USER_CACHE_TTL = 60
+
+
+class UserCache:
+    """
+    Thread-safe LRU of user instances whose entries expire after ``ttl`` seconds.
+
+    Entries are replaced on every User save (see finance/signals.py); other
+    processes pick changes up when their entry expires.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, user_id):
+        """Returns the cached user or None, without loading it."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user):
+        with self._lock:
+            self._entries[user.pk] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.pk)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, user_id):
+        """Returns the user from the cache, loading it from the database on a miss."""
+        user = self.peek(user_id)
+        if user is None:
+            user = get_user_model().objects.filter(pk=user_id).first()
+            if user is not None:
+                self.put(user)
+        return user
+
+    async def aget(self, user_id):
+        """``get()`` for async views."""
+        user = self.peek(user_id)
+        if user is None:
+            user = await get_user_model().objects.filter(pk=user_id).afirst()
+            if user is not None:
+                self.put(user)
+        return user
+
+
+user_cache = UserCache(
+    getattr(settings, 'AUTH_USER_CACHE_SIZE', DEFAULT_USER_CACHE_SIZE),
+    getattr(settings, 'AUTH_USER_CACHE_TTL', DEFAULT_USER_CACHE_TTL),
+)
+
+
+def _resolve_user(user_id):
+    return _check_user(user_cache.get(user_id))
+
+
+async def _aresolve_user(user_id):
+    return _check_user(await user_cache.aget(user_id))
+
+
+def _check_user(user):
+    if user is None:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    # Views may modify request.user; the cached instance is shared between requests
+    return copy.copy(user)
+
+
+class LazyTokenUser(SimpleLazyObject):
+    """
+    The authenticated user of a token, resolved only when a view needs more
+    than its id.
+
+    ``pk``/``id`` come from the token claims; any other attribute (or use as
+    a model instance, e.g. assigning it to a foreign key) resolves the user
+    through ``user_cache``.
+    """
+
+    def __init__(self, user_id):
+        super().__init__(lambda: _resolve_user(user_id))
+        # Stored in __dict__ directly: LazyObject.__setattr__ would resolve the user
+        self.__dict__['pk'] = user_id
+        self.__dict__['id'] = user_id
+
+    async def aresolve(self):
+        """Resolves the user without blocking the event loop (async views)."""
+        if self._wrapped is empty:
+            self._wrapped = await _aresolve_user(self.pk)
+        return self._wrapped
+
+    @property
+    def is_authenticated(self):
+        cached = user_cache.peek(self.pk)
+        return cached is None or cached.is_active or not api_settings.CHECK_USER_IS_ACTIVE
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def __bool__(self):
+        return True
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that never queries the database itself: the token is
+    validated and the owner id taken from its claims (see LazyTokenUser).
+
+    Deactivated users are rejected as soon as the process sees the change
+    (immediately for saves made in this process, otherwise within
+    ``AUTH_USER_CACHE_TTL`` seconds); their tokens stay bounded by the
+    access token lifetime as with any JWT.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        try:
+            user_id = get_user_model()._meta.pk.to_python(user_id)
+        except Exception:
+            raise InvalidToken("Token contained no recognizable user identification")
+        cached = user_cache.peek(user_id)
+        if cached is not None and api_settings.CHECK_USER_IS_ACTIVE and not cached.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return LazyTokenUser(user_id)
@@ -0,0 +1,233 @@
+# finance/balances.py
+import threading
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+
+from .budgets import BudgetChanges
+from .checkpoints import invalidate_checkpoints
+from .models import Account, Category, Transaction
+from .rollups import RollupChanges, rollup_key
+from .watermarks import touch_owners
+
+# Ledger-relevant state of a transaction / transfer row
+TransactionState = namedtuple('TransactionState', ['owner_id', 'account_id', 'category_id', 'amount', 'date'])
+TransferState = namedtuple('TransferState', ['owner_id', 'from_account_id', 'to_account_id', 'amount', 'date'])
+
+_local = threading.local()
+
+
+def effect_amount(amount, category_type):
+    """
+    Determines the signed effect of an amount on an account balance.
+
+    Args:
+        amount (Decimal): Transaction amount
+        category_type (str | None): 'INCOME', 'EXPENSE' or None
+
+    Returns:
+        Decimal: Positive amount for INCOME, negative for EXPENSE, zero if there is no category
+    """
+    if category_type is None:
+        return Decimal('0.00')
+    if category_type == 'INCOME':
+        return +amount
+    return -amount
+
+
+def apply_balance_deltas(deltas):
+    """
+    Applies summed balance deltas to accounts in a single UPDATE statement.
+
+    Args:
+        deltas (dict): Mapping of account id -> Decimal delta
+
+    Note:
+        Uses ``balance = balance + delta`` (a CASE when several accounts are
+        touched) so concurrent writers never overwrite each other's changes.
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if pk and delta}
+    if not deltas:
+        return 0
+    if len(deltas) == 1:
+        pk, delta = deltas.popitem()
+        return Account.objects.filter(pk=pk).update(balance=F('balance') + delta)
+
+    delta_expr = Case(
+        *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+        default=Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    return Account.objects.filter(pk__in=deltas.keys()).update(
+        balance=F('balance') + delta_expr
+    )
+
+
+def transaction_state(instance, values=None):
+    """Builds a TransactionState from an instance or from its loaded values."""
+    if values is None:
+        return TransactionState(instance.owner_id, instance.account_id, instance.category_id,
+                                instance.amount, instance.date)
+    return TransactionState(values['owner_id'], values['account_id'], values['category_id'],
+                            values['amount'], values['date'])
+
+
+def transfer_state(instance, values=None):
+    """Builds a TransferState from an instance or from its loaded values."""
+    if values is None:
+        return TransferState(instance.owner_id, instance.from_account_id, instance.to_account_id,
+                             instance.amount or Decimal('0.00'), instance.date)
+    return TransferState(values['owner_id'], values['from_account_id'], values['to_account_id'],
+                         values['amount'] or Decimal('0.00'), values['date'])
+
+
+def previous_state(instance):
+    """
+    Returns the persisted state of a transaction/transfer about to be saved.
+
+    Uses the values remembered when the instance was loaded (no query);
+    falls back to reading the row only for instances that were built by hand
+    with an existing pk or loaded with deferred fields.
+    """
+    if instance.pk is None:
+        return None
+    is_transaction = isinstance(instance, Transaction)
+    fields = TransactionState._fields if is_transaction else TransferState._fields
+    values = getattr(instance, '_loaded_values', None)
+    if values is None or any(name not in values for name in fields):
+        model = type(instance)
+        values = model.objects.filter(pk=instance.pk).values(*fields).first()
+        if values is None:
+            return None
+    return transaction_state(instance, values) if is_transaction else transfer_state(instance, values)
+
+
+class LedgerChanges:
+    """
+    Net effect of a set of ledger writes.
+
+    Collects balance deltas per account, monthly rollup and budget deltas
+    and stale balance checkpoints, then writes them with one statement each in
+    ``flush()``. The owners' change watermarks are bumped once as well,
+    which covers bulk writes that fire no model signals.
+    """
+
+    def __init__(self):
+        self.balances = defaultdict(Decimal)
+        self.rollup = RollupChanges()
+        self.budgets = BudgetChanges()
+        self.stale_checkpoints = []
+        self.owners = set()
+        self.category_types = {}
+
+    def remember_categories(self, categories):
+        """Seeds the category type cache (e.g. from a lookup map)."""
+        for category in categories:
+            self.category_types[category.pk] = category.type
+
+    def category_type(self, category_id, instance=None):
+        """
+        Resolves a category type, preferring an already loaded related object.
+        """
+        if category_id is None:
+            return None
+        if category_id not in self.category_types:
+            cached = instance._state.fields_cache.get('category') if instance is not None else None
+            if cached is not None and cached.pk == category_id:
+                self.category_types[category_id] = cached.type
+            else:
+                self.category_types[category_id] = (
+                    Category.objects.filter(pk=category_id).values_list('type', flat=True).first()
+                )
+        return self.category_types[category_id]
+
+    def add_transaction(self, state, sign=1, instance=None):
+        effect = effect_amount(state.amount, self.category_type(state.category_id, instance))
+        self.balances[state.account_id] += sign * effect
+        key = rollup_key(state.owner_id, state.account_id, state.category_id, state.date)
+        self.rollup.add(key, sign * state.amount, sign)
+        self.budgets.add(state.category_id, state.date, sign * state.amount, sign)
+        self.stale_checkpoints.append((state.account_id, state.date))
+        self.owners.add(state.owner_id)
+
+    def add_transfer(self, state, sign=1):
+        self.balances[state.from_account_id] -= sign * state.amount
+        self.balances[state.to_account_id] += sign * state.amount
+        self.stale_checkpoints.append((state.from_account_id, state.date))
+        self.stale_checkpoints.append((state.to_account_id, state.date))
+        self.owners.add(state.owner_id)
+
+    def touch(self, owner_id):
+        """Records a change that only moves the owner's change watermark."""
+        self.owners.add(owner_id)
+
+    def flush(self):
+        """Writes the collected changes and resets the collector."""
+        apply_balance_deltas(self.balances)
+        self.rollup.apply()
+        self.budgets.apply()
+        # The watermark first: checkpoint builders compare it before storing (see build_checkpoints)
+        touch_owners(*self.owners)
+        invalidate_checkpoints(self.stale_checkpoints)
+        self.balances.clear()
+        self.stale_checkpoints = []
+        self.owners = set()
+
+
+def current_batch():
+    """Returns the LedgerChanges of the enclosing ``ledger_batch()``, if any."""
+    return getattr(_local, 'batch', None)
+
+
+@contextmanager
+def ledger_batch(savepoint=True):
+    """
+    Coalesces every ledger change made in the block.
+
+    Signals fired inside the block only record their deltas; the net result
+    is written once per account when the block exits, inside the same
+    database transaction as the rows themselves. Nested blocks join the
+    outermost one.
+
+    Args:
+        savepoint (bool): Passed to ``transaction.atomic()``. Views pass
+            False: a failed request rolls back its enclosing transaction
+            anyway, so the savepoint would only cost two queries.
+
+    Usage:
+        with ledger_batch():
+            for tx in transactions:
+                tx.save()
+    """
+    outer = current_batch()
+    if outer is not None:
+        yield outer
+        return
+
+    changes = LedgerChanges()
+    _local.batch = changes
+    try:
+        with transaction.atomic(savepoint=savepoint):
+            yield changes
+            changes.flush()
+    finally:
+        _local.batch = None
+
+
+@contextmanager
+def ledger_changes():
+    """
+    Yields the LedgerChanges to record into: the enclosing batch if there is
+    one, otherwise a collector flushed immediately on exit.
+    """
+    batch = current_batch()
+    if batch is not None:
+        yield batch
+        return
+    changes = LedgerChanges()
+    yield changes
+    with transaction.atomic(savepoint=False):
+        changes.flush()
@@ -0,0 +1,34 @@
+# finance/benchmarks/__init__.py
+"""
+In-process benchmarks executed against a throwaway test database.
+
+Each module in this package registers one or more benchmarks with the
+``@benchmark`` decorator. Run them with::
+
+    python manage.py benchmark [name ...] [--rows N]
+"""
+import importlib
+import pkgutil
+
+REGISTRY = {}
+
+
+def benchmark(name):
+    """
+    Registers a benchmark function under ``name``.
+
+    The function receives ``rows`` (the dataset size) and returns a list of
+    result dicts, one per measured case.
+    """
+    def decorator(func):
+        REGISTRY[name] = func
+        return func
+    return decorator
+
+
+def load_benchmarks():
+    """Imports every benchmark module so that it registers itself."""
+    for module in pkgutil.iter_modules(__path__):
+        if not module.name.startswith('_'):
+            importlib.import_module(f'{__name__}.{module.name}')
+    return REGISTRY
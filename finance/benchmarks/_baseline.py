@@ -0,0 +1,61 @@
+# finance/benchmarks/_baseline.py
+import json
+from pathlib import Path
+
+# Baseline committed with the suite (queries are exact; latencies are from the
+# machine that last saved it, so compare them with a tolerance)
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+
+# Result columns kept in the baseline
+QUERY_COLUMNS = ('queries_per_request',)
+LATENCY_COLUMNS = ('p95_ms',)
+
+# Latency differences below this many milliseconds are noise, whatever the tolerance
+LATENCY_SLACK_MS = 1.0
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def baseline_entries(results):
+    """Returns the gated columns of ``results`` keyed by case."""
+    return {
+        row['case']: {col: row[col] for col in QUERY_COLUMNS + LATENCY_COLUMNS if row.get(col) is not None}
+        for row in results
+    }
+
+
+def save_baseline(path, results_by_name):
+    """Writes (or updates) the baseline of each benchmark in ``results_by_name``."""
+    path = Path(path)
+    baseline = load_baseline(path) if path.exists() else {}
+    for name, results in results_by_name.items():
+        baseline[name] = baseline_entries(results)
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+
+
+def compare(results, baseline, query_tolerance=0, latency_tolerance=0.5):
+    """
+    Returns a message for every gated value of ``results`` that exceeds its
+    baseline: query counts by more than ``query_tolerance`` queries,
+    latencies by more than ``latency_tolerance`` (a fraction of the
+    baseline) plus LATENCY_SLACK_MS. ``latency_tolerance=None`` skips the
+    latency gate. Cases missing from the baseline are not gated.
+    """
+    failures = []
+    for row in results:
+        expected = baseline.get(row['case'])
+        if expected is None:
+            continue
+        for col in QUERY_COLUMNS:
+            if col in expected and row[col] > expected[col] + query_tolerance:
+                failures.append(f"{row['case']}: {col} {row[col]} > baseline {expected[col]}")
+        if latency_tolerance is None:
+            continue
+        for col in LATENCY_COLUMNS:
+            limit = expected.get(col, 0) * (1 + latency_tolerance) + LATENCY_SLACK_MS
+            if col in expected and row[col] > limit:
+                failures.append(f"{row['case']}: {col} {row[col]} > {limit:.3f} (baseline {expected[col]})")
+    return failures
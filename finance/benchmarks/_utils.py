@@ -0,0 +1,49 @@
+# finance/benchmarks/_utils.py
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework.test import APIClient
+
+
+class Measurement:
+    """Holds the query count and wall time of a measured block."""
+    queries = 0
+    seconds = 0.0
+
+
+@contextmanager
+def measure():
+    """
+    Measures database round trips and elapsed time of the enclosed block.
+
+    Queries are counted with an execute wrapper, so the count is exact even
+    for blocks issuing more queries than Django's debug query log retains.
+    """
+    result = Measurement()
+
+    def counter(execute, sql, params, many, context):
+        result.queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        yield result
+        result.seconds = time.perf_counter() - start
+
+
+def make_user(username):
+    """Creates a benchmark user (default categories are created by signals)."""
+    return User.objects.create_user(
+        username=username,
+        password="benchpassword123",
+        email=f"{username}@example.com",
+    )
+
+
+def client_for(user):
+    """Returns an API client authenticated as ``user``."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
@@ -0,0 +1,136 @@
+# finance/benchmarks/api.py
+import random
+import statistics
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from finance.models import Account, Category, Transaction, Transfer
+
+from . import benchmark
+from ._utils import make_user, measure
+
+# Requests measured per case
+REQUESTS = 50
+
+# Fixed seed so that every run works on the same dataset
+SEED = 20250101
+
+
+def _seed(user, rows):
+    rng = random.Random(SEED)
+    accounts = Account.objects.bulk_create(
+        [Account(name=f"Account {i}", balance=Decimal('0.00'), owner=user) for i in range(5)]
+    )
+    categories = list(Category.objects.filter(owner=user))
+    start = date(2020, 1, 1)
+    Transaction.objects.bulk_create(
+        [Transaction(account=rng.choice(accounts), category=rng.choice(categories),
+                     amount=Decimal(rng.randint(1, 50000)) / 100, date=start + timedelta(days=rng.randrange(1500)),
+                     description=f"Seeded {i}", owner=user) for i in range(rows)],
+        batch_size=1000,
+    )
+    Transfer.objects.bulk_create(
+        [Transfer(from_account=accounts[i % 5], to_account=accounts[(i + 1) % 5],
+                  amount=Decimal(rng.randint(1, 50000)) / 100, date=start + timedelta(days=rng.randrange(1500)),
+                  description=f"Seeded transfer {i}", owner=user) for i in range(rows // 10)],
+        batch_size=1000,
+    )
+    return accounts, categories
+
+
+def _percentile(samples, pct):
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1] if len(samples) > 1 else samples[0]
+
+
+def _run_case(name, send, expected, requests):
+    latencies = []
+    queries = 0
+    for i in range(requests):
+        with measure() as measured:
+            response = send(i)
+        assert response.status_code == expected, (name, response.status_code, getattr(response, 'data', None))
+        latencies.append(measured.seconds * 1000)
+        queries += measured.queries
+    return {
+        'case': name,
+        'requests': requests,
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'queries_per_request': round(queries / requests, 2),
+    }
+
+
+@benchmark('api')
+def run(rows, requests=REQUESTS):
+    """
+    Latency percentiles and queries per request of list, create, update and
+    delete on every resource, registration and token obtain, through the
+    real URLconf with JWT authentication.
+
+    Responses are not cached (every list runs its queries) and passwords
+    use the MD5 hasher so hashing does not drown the application's own cost.
+    """
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0,
+                           PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+        user = make_user("api-bench")
+        accounts, categories = _seed(user, rows)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        anonymous = APIClient()
+        expense = next(c for c in categories if c.type == 'EXPENSE')
+        day = date(2024, 6, 1).isoformat()
+        created = {}
+
+        def create(resource, payload):
+            def send(i):
+                response = client.post(f"/api/{resource}/", payload(i), format='json')
+                created.setdefault(resource, []).append(response.data.get('id'))
+                return response
+            return send
+
+        def update(resource, payload):
+            return lambda i: client.patch(f"/api/{resource}/{created[resource][i]}/", payload(i), format='json')
+
+        def delete(resource):
+            return lambda i: client.delete(f"/api/{resource}/{created[resource][i]}/")
+
+        payloads = {
+            'accounts': lambda i: {"name": f"Bench account {i}", "balance": "100.00"},
+            'categories': lambda i: {"name": f"Bench category {i}", "type": "EXPENSE"},
+            'transactions': lambda i: {"account": accounts[i % 5].id, "category": expense.id,
+                                       "amount": "-12.50", "date": day, "description": f"Bench {i}"},
+            'transfers': lambda i: {"from_account": accounts[i % 5].id, "to_account": accounts[(i + 1) % 5].id,
+                                    "amount": "7.25", "date": day, "description": f"Bench {i}"},
+        }
+        changes = {
+            'accounts': lambda i: {"name": f"Renamed account {i}"},
+            'categories': lambda i: {"name": f"Renamed category {i}"},
+            'transactions': lambda i: {"amount": "-13.00"},
+            'transfers': lambda i: {"amount": "8.00"},
+        }
+
+        cases = []
+        for resource in ('accounts', 'categories', 'transactions', 'transfers'):
+            cases += [
+                (f"{resource} list", lambda i, r=resource: client.get(f"/api/{r}/"), 200),
+                (f"{resource} create", create(resource, payloads[resource]), 201),
+                (f"{resource} update", update(resource, changes[resource]), 200),
+                (f"{resource} delete", delete(resource), 204),
+            ]
+        cases += [
+            ("register", lambda i: anonymous.post("/api/register/", {
+                "username": f"bench{i}", "email": f"bench{i}@example.com", "password": "benchpassword123",
+            }, format='json'), 201),
+            ("token obtain", lambda i: anonymous.post("/api/auth/token/", {
+                "username": "api-bench", "password": "benchpassword123",
+            }, format='json'), 200),
+        ]
+
+        # Warm up lazily created rows and caches so the first measured request is representative
+        client.get("/api/accounts/")
+        return [_run_case(name, send, expected, requests) for name, send, expected in cases]
@@ -0,0 +1,145 @@
+# finance/benchmarks/asgi.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import benchmark
+from ._utils import make_user
+from .api import _percentile, _seed
+
+# Requests per case, spread over CONCURRENCY clients that each send one request at a time
+REQUESTS = 400
+CONCURRENCY = 50
+
+# Request threads of the WSGI server (e.g. gunicorn --threads 4)
+WSGI_THREADS = 4
+
+# Time a client takes to read its response: a WSGI thread is busy writing it
+# all along, while an ASGI server only awaits the send
+SLOW_CLIENT_SECONDS = 0.02
+
+PATHS = ["/api/accounts/", "/api/categories/", "/api/transactions/", "/api/users/me/"]
+
+
+def _wsgi_case(authorization):
+    handler = WSGIHandler()
+    factory = RequestFactory()
+
+    def serve(path):
+        environ = factory.get(path, HTTP_AUTHORIZATION=authorization).environ
+        statuses = []
+        response = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        for _chunk in response:
+            time.sleep(SLOW_CLIENT_SECONDS)
+        response.close()
+        return statuses[0]
+
+    latencies = []
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as server:
+        def client(index):
+            for i in range(index, REQUESTS, CONCURRENCY):
+                start = time.perf_counter()
+                status = server.submit(serve, PATHS[i % len(PATHS)]).result()
+                assert status.startswith('200'), status
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+        began = time.perf_counter()
+        clients = [threading.Thread(target=client, args=(index,)) for index in range(CONCURRENCY)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+    return latencies, time.perf_counter() - began
+
+
+async def _asgi_get(app, path, authorization):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'authorization', authorization.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    done = asyncio.Event()
+    requested = False
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif not message.get('more_body'):
+            await asyncio.sleep(SLOW_CLIENT_SECONDS)
+
+    await app(scope, receive, send)
+    done.set()
+    return status
+
+
+def _asgi_case(authorization):
+    app = ASGIHandler()
+    latencies = []
+
+    async def client(index):
+        for i in range(index, REQUESTS, CONCURRENCY):
+            start = time.perf_counter()
+            status = await _asgi_get(app, PATHS[i % len(PATHS)], authorization)
+            assert status == 200, status
+            latencies.append(time.perf_counter() - start)
+
+    async def run_clients():
+        await asyncio.gather(*(client(index) for index in range(CONCURRENCY)))
+
+    began = time.perf_counter()
+    asyncio.run(run_clients())
+    return latencies, time.perf_counter() - began
+
+
+@benchmark('asgi')
+def run(rows):
+    """
+    Throughput of the hot read endpoints (account, category and transaction
+    lists, current user) for CONCURRENCY clients that read their responses
+    slowly: a threaded WSGI server, ASGI with the sync views (run in a
+    thread by Django) and ASGI with the async views.
+    """
+    user = make_user("asgi-bench")
+    _seed(user, rows)
+    authorization = f"Bearer {RefreshToken.for_user(user).access_token}"
+
+    cases = [
+        (f"wsgi ({WSGI_THREADS} threads)", 'project_finance.urls', _wsgi_case),
+        ("asgi, sync views", 'project_finance.urls', _asgi_case),
+        ("asgi, async views", 'project_finance.asgi_urls', _asgi_case),
+    ]
+    results = []
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+        for name, urlconf, run_case in cases:
+            with override_settings(ROOT_URLCONF=urlconf):
+                latencies, seconds = run_case(authorization)
+            latencies = [latency * 1000 for latency in latencies]
+            results.append({
+                'case': name,
+                'requests': REQUESTS,
+                'concurrency': CONCURRENCY,
+                'seconds': round(seconds, 3),
+                'req_per_s': round(REQUESTS / seconds, 1),
+                'p50_ms': round(_percentile(latencies, 50), 3),
+                'p95_ms': round(_percentile(latencies, 95), 3),
+            })
+    return results
@@ -0,0 +1,84 @@
+# finance/benchmarks/bulk_create.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from finance.models import Account, Category
+
+from . import benchmark
+from ._utils import client_for, make_user, measure
+
+
+def _transaction_rows(account, categories, rows):
+    start = date(2024, 1, 1)
+    return [
+        {
+            "account": account.id,
+            "category": categories[i % len(categories)].id,
+            "amount": f"{(i % 97) + 1}.25",
+            "date": (start + timedelta(days=i % 365)).isoformat(),
+            "description": f"Row {i}",
+        }
+        for i in range(rows)
+    ]
+
+
+def _transfer_rows(from_account, to_account, rows):
+    start = date(2024, 1, 1)
+    return [
+        {
+            "from_account": from_account.id,
+            "to_account": to_account.id,
+            "amount": f"{(i % 50) + 1}.00",
+            "date": (start + timedelta(days=i % 365)).isoformat(),
+            "description": f"Row {i}",
+        }
+        for i in range(rows)
+    ]
+
+
+def _result(case, rows, m):
+    return {
+        'case': case,
+        'rows': rows,
+        'queries': m.queries,
+        'queries_per_1000_rows': round(m.queries * 1000 / rows, 1),
+        'seconds': m.seconds,
+    }
+
+
+@benchmark('bulk_create')
+def run(rows):
+    """
+    Compares one POST per row against a single POST to the bulk endpoints.
+    """
+    results = []
+    for label, url_suffix in (('per-row', ''), ('bulk', 'bulk/')):
+        user = make_user(f"bulk-{label}")
+        client = client_for(user)
+        checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+        savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=user)
+        categories = list(Category.objects.filter(owner=user))
+
+        tx_rows = _transaction_rows(checking, categories, rows)
+        tr_rows = _transfer_rows(checking, savings, rows)
+
+        with measure() as m:
+            if url_suffix:
+                response = client.post(f"/api/transactions/{url_suffix}", tx_rows, format='json')
+                assert response.status_code == 201, response.data
+            else:
+                for row in tx_rows:
+                    response = client.post("/api/transactions/", row, format='json')
+                    assert response.status_code == 201, response.data
+        results.append(_result(f"transactions {label}", rows, m))
+
+        with measure() as m:
+            if url_suffix:
+                response = client.post(f"/api/transfers/{url_suffix}", tr_rows, format='json')
+                assert response.status_code == 201, response.data
+            else:
+                for row in tr_rows:
+                    response = client.post("/api/transfers/", row, format='json')
+                    assert response.status_code == 201, response.data
+        results.append(_result(f"transfers {label}", rows, m))
+    return results
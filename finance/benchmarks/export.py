@@ -0,0 +1,55 @@
+# finance/benchmarks/export.py
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from finance.models import Account, Category, Transaction
+
+from . import benchmark
+from ._utils import client_for, make_user
+
+
+@benchmark('export')
+def run(rows):
+    """
+    Peak Python memory and time to first byte of the streaming export
+    at 1x and 10x ``rows``, compared with the paginated JSON list.
+    """
+    results = []
+    for scale in (1, 10):
+        count = rows * scale
+        user = make_user(f"export-{scale}")
+        client = client_for(user)
+        account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+        category = Category.objects.filter(owner=user).first()
+        start = date(2015, 1, 1)
+        Transaction.objects.bulk_create(
+            [
+                Transaction(account=account, category=category, amount=Decimal('12.34'),
+                            date=start + timedelta(days=i % 3650), description=f"Row {i}", owner=user)
+                for i in range(count)
+            ],
+            batch_size=1000,
+        )
+
+        for fmt in ('csv', 'ndjson'):
+            tracemalloc.start()
+            began = time.perf_counter()
+            response = client.get(f"/api/transactions/export/?format={fmt}")
+            chunks = iter(response.streaming_content)
+            first = next(chunks)
+            first_byte = time.perf_counter() - began
+            size = len(first) + sum(len(chunk) for chunk in chunks)
+            total = time.perf_counter() - began
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({
+                'case': f"export {fmt}",
+                'rows': count,
+                'first_byte_ms': round(first_byte * 1000, 2),
+                'total_ms': round(total * 1000, 1),
+                'peak_kib': peak // 1024,
+                'bytes': size,
+            })
+    return results
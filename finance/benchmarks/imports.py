@@ -0,0 +1,47 @@
+# finance/benchmarks/imports.py
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from finance.imports import commit_import, create_import
+from finance.models import Account, Category, Transaction
+
+from . import benchmark
+from ._utils import make_user, measure
+
+
+@benchmark('imports')
+def run(rows):
+    """
+    Parse/stage and commit time of a CSV statement with ``rows`` lines,
+    a tenth of which already exist in the ledger.
+    """
+    user = make_user("imports")
+    account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+    expense = Category.objects.filter(owner=user, type='EXPENSE').first()
+    start = date(2020, 1, 1)
+
+    lines = ["date,amount,description"]
+    existing = []
+    for i in range(rows):
+        day = start + timedelta(days=i % 1000)
+        lines.append(f"{day.isoformat()},-{i % 500 + 1}.25,Purchase {i}")
+        if i % 10 == 0:
+            existing.append(Transaction(account=account, category=expense, amount=Decimal(f"{i % 500 + 1}.25"),
+                                        date=day, description=f"Purchase {i}", owner=user))
+    Transaction.objects.bulk_create(existing, batch_size=1000)
+    payload = "\n".join(lines).encode('utf-8')
+
+    with measure() as parsed:
+        statement = create_import(owner=user, account=account, stream=BytesIO(payload), format='CSV',
+                                  file_name="bench.csv", expense_category=expense)
+    with measure() as committed:
+        commit_import(statement)
+
+    return [
+        {'case': "parse + stage + dedupe", 'rows': rows, 'queries': parsed.queries,
+         'seconds': round(parsed.seconds, 3), 'rows_per_s': int(rows / parsed.seconds),
+         'duplicates': statement.duplicate_rows},
+        {'case': "commit", 'rows': statement.accepted_rows, 'queries': committed.queries,
+         'seconds': round(committed.seconds, 3), 'rows_per_s': int(statement.accepted_rows / committed.seconds)},
+    ]
@@ -0,0 +1,48 @@
+# finance/benchmarks/ledger_writes.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from finance.models import Account, Category
+
+from . import benchmark
+from ._utils import client_for, make_user, measure
+
+
+@benchmark('ledger_writes')
+def run(rows):
+    """
+    Queries per single-row create, update and delete through the API.
+    """
+    user = make_user("ledger-writes")
+    client = client_for(user)
+    checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+    savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=user)
+    category = Category.objects.filter(owner=user, type='EXPENSE').first()
+    start = date(2024, 1, 1)
+
+    results = []
+    for resource, payload in (
+        ('transactions', lambda i: {"account": checking.id, "category": category.id,
+                                    "amount": "10.00", "date": (start + timedelta(days=i % 365)).isoformat()}),
+        ('transfers', lambda i: {"from_account": checking.id, "to_account": savings.id,
+                                 "amount": "10.00", "date": (start + timedelta(days=i % 365)).isoformat()}),
+    ):
+        ids = []
+        with measure() as created:
+            for i in range(rows):
+                ids.append(client.post(f"/api/{resource}/", payload(i), format='json').data['id'])
+        with measure() as updated:
+            for pk in ids:
+                client.patch(f"/api/{resource}/{pk}/", {"amount": "12.00"}, format='json')
+        with measure() as deleted:
+            for pk in ids:
+                client.delete(f"/api/{resource}/{pk}/")
+
+        for op, m in (('create', created), ('update', updated), ('delete', deleted)):
+            results.append({
+                'case': f"{resource} {op}",
+                'requests': rows,
+                'queries_per_request': round(m.queries / rows, 2),
+                'ms_per_request': round(m.seconds * 1000 / rows, 3),
+            })
+    return results
@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from finance.models import Account, Category, Transaction, Transfer
+from finance.pagination import KeysetPagination
+from finance.views import AccountViewSet, CategoryViewSet, TransactionViewSet, TransferViewSet
+
+from . import benchmark
+from ._utils import client_for, make_user, measure
+
+# Requests measured per case
+REPEAT = 5
+
+
+@benchmark('list_serialization')
+def run(rows):
+    """
+    Throughput of full list responses (``rows`` rows each, default 10k with
+    --rows 10000) with model serializers + JSONRenderer versus the values()
+    path + FastJSONRenderer. Responses are not cached.
+    """
+    user = make_user("list-serialization")
+    client = client_for(user)
+    Account.objects.bulk_create(
+        [Account(name=f"Account {i}", balance=Decimal(i) / 4, owner=user) for i in range(rows)], batch_size=1000,
+    )
+    Category.objects.bulk_create(
+        [Category(name=f"Category {i}", type='EXPENSE', owner=user) for i in range(rows)], batch_size=1000,
+    )
+    accounts = list(Account.objects.filter(owner=user)[:2])
+    category = Category.objects.filter(owner=user).first()
+    start = date(2020, 1, 1)
+    Transaction.objects.bulk_create(
+        [Transaction(account=accounts[0], category=category, amount=Decimal('12.34'),
+                     date=start + timedelta(days=i % 1500), description=f"Purchase {i}", owner=user)
+         for i in range(rows)],
+        batch_size=1000,
+    )
+    Transfer.objects.bulk_create(
+        [Transfer(from_account=accounts[0], to_account=accounts[1], amount=Decimal('5.00'),
+                  date=start + timedelta(days=i % 1500), description=f"Transfer {i}", owner=user)
+         for i in range(rows)],
+        batch_size=1000,
+    )
+
+    results = []
+    with override_settings(RESPONSE_CACHE_TIMEOUT=0), \
+            mock.patch.object(KeysetPagination, 'max_page_size', max(rows, KeysetPagination.max_page_size)):
+        for url, view in (
+            ("/api/accounts/", AccountViewSet),
+            ("/api/categories/", CategoryViewSet),
+            (f"/api/transactions/?page_size={rows}", TransactionViewSet),
+            (f"/api/transfers/?page_size={rows}", TransferViewSet),
+        ):
+            timings = {}
+            for label, patches in (
+                ("serializer", [mock.patch.object(view, 'values_serializer_class', None),
+                                mock.patch.object(view, 'renderer_classes', [JSONRenderer])]),
+                ("values", []),
+            ):
+                for patch in patches:
+                    patch.start()
+                try:
+                    client.get(url)
+                    with measure() as measured:
+                        for _ in range(REPEAT):
+                            response = client.get(url)
+                finally:
+                    for patch in patches:
+                        patch.stop()
+                timings[label] = measured.seconds / REPEAT
+                results.append({
+                    'case': f"{url.split('?')[0]} ({label})",
+                    'rows': rows,
+                    'bytes': len(response.content),
+                    'ms_per_response': round(timings[label] * 1000, 1),
+                    'rows_per_second': round(rows / timings[label]),
+                    'speedup': round(timings['serializer'] / timings[label], 2),
+                })
+    return results
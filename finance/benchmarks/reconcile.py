@@ -0,0 +1,47 @@
+# finance/benchmarks/reconcile.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from finance.models import Account, Category, Transaction, Transfer
+from finance.reconcile import owner_batches, reconcile_owners
+
+from . import benchmark
+from ._utils import make_user, measure
+
+
+@benchmark('reconcile')
+def run(rows):
+    """
+    Queries and time to reconcile ``rows`` transactions (plus a tenth as
+    transfers) spread over 20 users, in-process.
+    """
+    start = date(2020, 1, 1)
+    per_user = max(rows // 20, 1)
+    for u in range(20):
+        user = make_user(f"reconcile-{u}")
+        checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+        savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=user)
+        category = Category.objects.filter(owner=user, type='EXPENSE').first()
+        Transaction.objects.bulk_create(
+            [Transaction(account=checking, category=category, amount=Decimal('3.10'),
+                         date=start + timedelta(days=i % 1500), owner=user) for i in range(per_user)],
+            batch_size=1000,
+        )
+        Transfer.objects.bulk_create(
+            [Transfer(from_account=checking, to_account=savings, amount=Decimal('1.00'),
+                      date=start + timedelta(days=i % 1500), owner=user) for i in range(per_user // 10)],
+            batch_size=1000,
+        )
+
+    results = []
+    for batch_size in (5, 500):
+        with measure() as measured:
+            drifted = sum(len(reconcile_owners(batch)) for batch in owner_batches(batch_size=batch_size))
+        results.append({
+            'case': f"batch of {batch_size} users",
+            'rows': per_user * 20,
+            'queries': measured.queries,
+            'seconds': round(measured.seconds, 3),
+            'drifted': drifted,
+        })
+    return results
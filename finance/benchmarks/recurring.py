@@ -0,0 +1,62 @@
+# finance/benchmarks/recurring.py
+import random
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from finance.models import Account, Category, RecurringRule
+from finance.recurring import materialize_due
+
+from . import benchmark
+from ._utils import measure
+
+# Rules per user
+RULES_PER_USER = 5
+
+
+@benchmark('recurring')
+def run(rows):
+    """
+    Queries and time to materialize ``rows`` active rules (five per user,
+    monthly and weekly, each due once or a few times), then to run the
+    scheduler again with nothing due.
+    """
+    rng = random.Random(rows)
+    today = date(2025, 6, 30)
+    users = User.objects.bulk_create(
+        [User(username=f"recurring-{i}", email=f"recurring-{i}@example.com")
+         for i in range(max(rows // RULES_PER_USER, 1))],
+        batch_size=1000,
+    )
+    accounts = Account.objects.bulk_create(
+        [Account(name="Checking", balance=Decimal('0.00'), owner=user) for user in users], batch_size=1000,
+    )
+    categories = Category.objects.bulk_create(
+        [Category(name=name, type=cat_type, owner=user)
+         for user in users for name, cat_type in (("Salary", 'INCOME'), ("Housing", 'EXPENSE'))],
+        batch_size=1000,
+    )
+    rules = [
+        RecurringRule(owner=user, account=account, category=categories[2 * u + (i > 0)],
+                      amount=Decimal(rng.randint(100, 300000)) / 100, description=f"Rule {i}",
+                      frequency='WEEKLY' if i == RULES_PER_USER - 1 else 'MONTHLY',
+                      start_date=date(2025, 6, rng.randint(1, 30)))
+        for u, (user, account) in enumerate(zip(users, accounts)) for i in range(RULES_PER_USER)
+    ]
+    for rule in rules:
+        rule.next_date = rule.start_date
+    RecurringRule.objects.bulk_create(rules, batch_size=1000)
+
+    results = []
+    for case in ("first run", "nothing due"):
+        with measure() as measured:
+            rules, created = materialize_due(today)
+        results.append({
+            'case': case,
+            'rules': rules,
+            'transactions': created,
+            'queries': measured.queries,
+            'seconds': round(measured.seconds, 3),
+        })
+    return results
@@ -0,0 +1,63 @@
+# finance/benchmarks/registration.py
+import time
+
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from finance.models import Category
+
+from . import benchmark
+from ._utils import make_user, measure
+
+
+def _legacy_default_categories(user):
+    # Previous implementation: one get_or_create per default category
+    for name, cat_type in Category.DEFAULT_CATEGORIES:
+        Category.objects.get_or_create(name=name, type=cat_type, owner=user)
+
+
+@benchmark('registration')
+def run(rows):
+    """
+    Registrations per second through POST /api/register/ (with the
+    configured and with a fast password hasher, to separate hashing from
+    database work) and queries spent on the default category set.
+    """
+    count = min(rows, 200)
+    client = APIClient()
+    results = []
+    for label, hashers in (
+        ("register (configured hasher)", None),
+        ("register (MD5 hasher)", ['django.contrib.auth.hashers.MD5PasswordHasher']),
+    ):
+        prefix = 'fast' if hashers else 'slow'
+        overrides = {'PASSWORD_HASHERS': hashers} if hashers else {}
+        with override_settings(**overrides), measure() as measured:
+            for i in range(count):
+                response = client.post("/api/register/", {
+                    "username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "password": "benchpassword123",
+                }, format='json')
+                assert response.status_code == 201, response.data
+        results.append({
+            'case': label,
+            'users': count,
+            'queries_per_user': round(measured.queries / count, 1),
+            'per_second': round(count / measured.seconds, 1),
+        })
+
+    user = make_user("defaults")
+    for label, create in (
+        ("defaults: get_or_create loop", _legacy_default_categories),
+        ("defaults: bulk_create", Category.create_default_categories),
+    ):
+        Category.objects.filter(owner=user).delete()
+        began = time.perf_counter()
+        with measure() as measured:
+            create(user)
+        results.append({
+            'case': label,
+            'users': 1,
+            'queries_per_user': measured.queries,
+            'per_second': round(1 / (time.perf_counter() - began), 1),
+        })
+    return results
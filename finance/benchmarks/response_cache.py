@@ -0,0 +1,47 @@
+# finance/benchmarks/response_cache.py
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import override_settings
+
+from finance.caching import cache_stats, reset_cache_stats
+from finance.models import Account, Category, Transaction
+
+from . import benchmark
+from ._utils import client_for, make_user, measure
+
+
+@benchmark('response_cache')
+def run(rows):
+    """
+    Queries and time of repeated dashboard polls (accounts, categories,
+    first transactions page) with the response cache off and on.
+    """
+    user = make_user("response-cache")
+    client = client_for(user)
+    account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+    category = Category.objects.filter(owner=user, type='EXPENSE').first()
+    start = date(2020, 1, 1)
+    Transaction.objects.bulk_create(
+        [Transaction(account=account, category=category, amount=Decimal('4.20'),
+                     date=start + timedelta(days=i % 1500), owner=user) for i in range(rows)],
+        batch_size=1000,
+    )
+    urls = ["/api/accounts/", "/api/categories/", "/api/transactions/"]
+    polls = 100
+
+    results = []
+    for label, timeout in (("cache off", 0), ("cache on", 300)):
+        reset_cache_stats()
+        with override_settings(RESPONSE_CACHE_TIMEOUT=timeout), measure() as measured:
+            for _ in range(polls):
+                for url in urls:
+                    client.get(url)
+        results.append({
+            'case': label,
+            'requests': polls * len(urls),
+            'queries': measured.queries,
+            'ms_per_request': round(measured.seconds * 1000 / (polls * len(urls)), 3),
+            **cache_stats(),
+        })
+    return results
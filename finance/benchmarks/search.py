@@ -0,0 +1,62 @@
+# finance/benchmarks/search.py
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from finance.models import Account, Category, Transaction
+
+from . import benchmark
+from ._utils import client_for, make_user
+
+WORDS = [
+    "market", "coffee", "rent", "fuel", "pharmacy", "bakery", "cinema", "insurance",
+    "electric", "water", "gym", "books", "hardware", "restaurant", "taxi", "parking",
+]
+
+
+def _timed(client, url, repeat=5):
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return response, best
+
+
+@benchmark('search')
+def run(rows):
+    """
+    Latency of description search through the API: the full-text filter
+    (list page and ranked top 20) versus the previous ``icontains`` scan.
+    """
+    user = make_user("search")
+    client = client_for(user)
+    account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=user)
+    category = Category.objects.filter(owner=user, type='EXPENSE').first()
+    start = date(2015, 1, 1)
+    batch = []
+    for i in range(rows):
+        words = (WORDS[i % 16], WORDS[(i * 7) % 16], f"store{i % 997}")
+        batch.append(Transaction(account=account, category=category, amount=Decimal('9.99'),
+                                 date=start + timedelta(days=i % 3650), description=" ".join(words), owner=user))
+        if len(batch) == 5000:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    Transaction.objects.bulk_create(batch)
+
+    results = []
+    for term in ("store996", "pharm"):
+        baseline = Transaction.objects.filter(owner=user, description__icontains=term).order_by('-date', '-id')
+        began = time.perf_counter()
+        list(baseline[:51])
+        results.append({'case': f"icontains '{term}' (page)", 'rows': rows,
+                        'ms': round((time.perf_counter() - began) * 1000, 2), 'results': None})
+        for label, url in (
+            ("?search=", f"/api/transactions/?search={term}"),
+            ("/search/ ranked", f"/api/transactions/search/?q={term}"),
+        ):
+            response, best = _timed(client, url)
+            results.append({'case': f"{label} '{term}'", 'rows': rows, 'ms': round(best * 1000, 2),
+                            'results': len(response.data['results'])})
+    return results
@@ -0,0 +1,155 @@
+# finance/budgets.py
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, FilteredRelation, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import ArchivedTransaction, Budget, BudgetPeriod, MonthlyCategoryTotal, Transaction
+from .rollups import _as_date, month_start
+
+
+class BudgetChanges:
+    """
+    Collects (spent, count) deltas per (category, month) and applies them to
+    the BudgetPeriod rows of the budgets on those categories.
+    """
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [Decimal('0.00'), 0])
+
+    def add(self, category_id, tx_date, amount, count):
+        if category_id is None:
+            return
+        delta = self.deltas[(category_id, month_start(tx_date))]
+        delta[0] += amount
+        delta[1] += count
+
+    def apply(self):
+        """
+        Upserts every delta with one INSERT ... SELECT ... ON CONFLICT statement.
+
+        The join against the budget table drops categories without a budget,
+        so no separate lookup is needed to find the affected budgets.
+        """
+        deltas = [
+            (category_id, month, amount, count)
+            for (category_id, month), (amount, count) in self.deltas.items() if amount or count
+        ]
+        self.deltas.clear()
+        if not deltas:
+            return
+        quote = connection.ops.quote_name
+        periods, budgets = quote(BudgetPeriod._meta.db_table), quote(Budget._meta.db_table)
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(deltas))
+        # WHERE true: SQLite needs it to tell ON CONFLICT apart from a join constraint
+        sql = (
+            f"INSERT INTO {periods} (budget_id, month, spent, count) "
+            f"SELECT b.id, v.column2, v.column3, v.column4 FROM (VALUES {values}) AS v "
+            f"JOIN {budgets} b ON b.category_id = v.column1 WHERE true "
+            f"ON CONFLICT (budget_id, month) DO UPDATE SET "
+            f"spent = {periods}.spent + excluded.spent, count = {periods}.count + excluded.count"
+        )
+        params = [value for delta in deltas for value in delta]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+def _replace_periods(budgets, totals):
+    """Replaces the periods of ``budgets`` with ``{(category_id, month): (spent, count)}``."""
+    by_category = {budget.category_id: budget for budget in budgets}
+    with transaction.atomic():
+        BudgetPeriod.objects.filter(budget__in=budgets).delete()
+        BudgetPeriod.objects.bulk_create(
+            [
+                BudgetPeriod(budget=by_category[category_id], month=month, spent=spent, count=count)
+                for (category_id, month), (spent, count) in totals.items()
+                if category_id in by_category and count
+            ],
+            batch_size=500,
+        )
+
+
+def backfill_budget(budget):
+    """
+    Fills a new (or re-targeted) budget's periods from the monthly rollup,
+    which already holds the category's totals per account and month.
+    """
+    rows = (
+        MonthlyCategoryTotal.objects.filter(category_id=budget.category_id).exclude(count=0)
+        .order_by().values('month').annotate(spent=Sum('total'), rows=Sum('count'))
+    )
+    _replace_periods([budget], {
+        (budget.category_id, row['month']): (row['spent'], row['rows']) for row in rows
+    })
+
+
+def live_budget_periods(owner_ids=None):
+    """
+    Computes budget consumption straight from the ledger with a GROUP BY,
+    archived rows included.
+
+    Returns:
+        dict: (budget_id, month) -> (spent, count)
+    """
+    budgets = Budget.objects.all()
+    if owner_ids is not None:
+        budgets = budgets.filter(owner_id__in=owner_ids)
+    budget_ids = dict(budgets.values_list('category_id', 'pk'))
+    periods = {}
+    for model in (Transaction, ArchivedTransaction):
+        rows = (
+            model.objects.filter(category_id__in=budget_ids.keys())
+            .annotate(month=TruncMonth('date'))
+            .order_by()
+            .values('category_id', 'month')
+            .annotate(spent=Sum('amount'), rows=Count('id'))
+        )
+        for row in rows:
+            key = (budget_ids[row['category_id']], _as_date(row['month']))
+            spent, count = periods.get(key, (Decimal('0.00'), 0))
+            periods[key] = (spent + row['spent'], count + row['rows'])
+    return periods
+
+
+def stored_budget_periods(owner_ids=None):
+    """Returns the non-empty BudgetPeriod rows keyed like ``live_budget_periods``."""
+    periods = BudgetPeriod.objects.exclude(count=0)
+    if owner_ids is not None:
+        periods = periods.filter(budget__owner_id__in=owner_ids)
+    return {(row.budget_id, row.month): (row.spent, row.count) for row in periods}
+
+
+def rebuild_budget_periods(owner_ids=None):
+    """
+    Replaces the budget periods with consumption recomputed from the ledger.
+
+    Returns:
+        int: Number of period rows written
+    """
+    budgets = Budget.objects.all()
+    if owner_ids is not None:
+        budgets = budgets.filter(owner_id__in=owner_ids)
+    budgets = list(budgets)
+    categories = {budget.pk: budget.category_id for budget in budgets}
+    live = live_budget_periods(owner_ids)
+    _replace_periods(budgets, {
+        (categories[budget_id], month): totals for (budget_id, month), totals in live.items()
+    })
+    return len(live)
+
+
+def budget_status(owner_id, month):
+    """
+    Returns the owner's budgets annotated with their consumption in ``month``.
+
+    Reads one BudgetPeriod row per budget (LEFT JOIN); the ledger is never
+    aggregated.
+    """
+    return (
+        Budget.objects.filter(owner_id=owner_id)
+        .annotate(current=FilteredRelation('periods', condition=Q(periods__month=month)))
+        .values('pk', 'category_id', 'category__name', 'amount', 'current__spent', 'current__count')
+        .order_by('category__name')
+    )
@@ -0,0 +1,107 @@
+# finance/caching.py
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags, parse_http_date_safe, quote_etag
+
+# Cache entries are never served across watermark versions, so the timeout only bounds memory
+DEFAULT_RESPONSE_CACHE_TIMEOUT = 300
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_cached_response(key):
+    """Returns cached response data (or None) and counts the hit/miss."""
+    data = _cache().get(key)
+    with _stats_lock:
+        _stats['hits' if data is not None else 'misses'] += 1
+    return data
+
+
+async def aget_cached_response(key):
+    """``get_cached_response()`` for async views."""
+    data = await _cache().aget(key)
+    with _stats_lock:
+        _stats['hits' if data is not None else 'misses'] += 1
+    return data
+
+
+def set_cached_response(key, data):
+    _cache().set(key, data, response_cache_timeout())
+
+
+async def aset_cached_response(key, data):
+    await _cache().aset(key, data, response_cache_timeout())
+
+
+def response_cache_timeout():
+    """Seconds a cached response is kept; 0 disables the response cache."""
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', DEFAULT_RESPONSE_CACHE_TIMEOUT)
+
+
+def response_cache_key(request, watermark, view):
+    """
+    Keys a response by owner, change watermark, endpoint and full URL
+    (including query params).
+
+    The watermark ``(version, modified_at)`` is read from the database on
+    every request, so a write committed by any worker moves every worker to
+    new keys, whatever the cache backend. ``modified_at`` keeps a re-created
+    watermark row (version 0 again) from matching older entries.
+    """
+    version, modified_at = watermark
+    url = hashlib.sha1(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return (
+        f'finance:response:{request.user.pk}:{version}.{modified_at.timestamp()}:'
+        f'{view.basename}:{view.action}:{url}'
+    )
+
+
+def response_etag(request, view, version):
+    """
+    Strong ETag of a response: the owner's watermark version plus everything
+    else that selects the representation (endpoint, URL, media type).
+    """
+    payload = (
+        f'{request.user.pk}:{version}:{view.basename}:{view.action}:'
+        f'{request.build_absolute_uri()}:{request.accepted_media_type}'
+    )
+    return quote_etag(hashlib.sha1(payload.encode('utf-8')).hexdigest())
+
+
+def is_not_modified(request, etag, modified_at, resolved=True):
+    """
+    Evaluates If-None-Match (preferred) or If-Modified-Since against the
+    current validators, as described in RFC 9110 section 13.2.2.
+
+    Until the requested resource is known to exist (``resolved=False``) only
+    an exact ETag match counts: ``*`` and If-Modified-Since must not turn a
+    missing or foreign detail URL into a 304 instead of a 404. ETags are only
+    sent with 200 responses and change with every write, so a match is safe.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        candidates = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return etag in candidates or (resolved and '*' in candidates)
+    if not resolved:
+        return False
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    return if_modified_since is not None and int(modified_at.timestamp()) <= if_modified_since
+
+
+def cache_stats():
+    """Returns this process's response cache hit/miss counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats['hits'] = _stats['misses'] = 0
@@ -0,0 +1,252 @@
+# finance/checkpoints.py
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import ArchivedTransaction, ArchivedTransfer, BalanceCheckpoint, ChangeWatermark, Transaction, Transfer
+from .rollups import month_start, to_date
+from .watermarks import get_watermark
+
+# Longest daily series served by balance_series()
+MAX_SERIES_DAYS = 3660
+
+_money = DecimalField(max_digits=14, decimal_places=2)
+_zero = Decimal('0.00')
+
+
+def next_month(month):
+    """Returns the first day of the month following ``month``."""
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _transaction_effect():
+    return Case(
+        When(category__type='INCOME', then=F('amount')),
+        When(category__type='EXPENSE', then=-F('amount')),
+        default=Value(_zero),
+        output_field=_money,
+    )
+
+
+def _transfer_effect(account_id):
+    return Case(
+        When(from_account_id=account_id, to_account_id=account_id, then=Value(_zero)),
+        When(to_account_id=account_id, then=F('amount')),
+        default=-F('amount'),
+        output_field=_money,
+    )
+
+
+def archive_cutoff(account):
+    """Day before which the account has archived rows, or None (see CarryForward)."""
+    try:
+        return account.carry_forward.cutoff
+    except ObjectDoesNotExist:
+        return None
+
+
+def _reaches_archive(cutoff, day):
+    """Whether rows dated from ``day`` on may include archived ones."""
+    return cutoff is not None and day < cutoff
+
+
+def ledger_effects(account_id, group=None, archived=False, **date_filter):
+    """
+    Sums the balance effect of an account's transactions and transfers.
+
+    Args:
+        account_id (int): Account to aggregate
+        group (str | None): None for a single total, 'month' or 'date' for a
+            ``{period: effect}`` mapping
+        archived (bool): Include the archive tables (for periods before the
+            account's archive cutoff)
+        **date_filter: Lookups on ``date`` (e.g. ``date__gte=...``)
+
+    Returns:
+        Decimal | dict: Total effect, or effect per period
+    """
+    tables = [(Transaction, Transfer)]
+    if archived:
+        tables.append((ArchivedTransaction, ArchivedTransfer))
+    parts = []
+    for transaction_model, transfer_model in tables:
+        transactions = transaction_model.objects.filter(account_id=account_id, **date_filter).order_by()
+        transfers = transfer_model.objects.filter(
+            Q(from_account_id=account_id) | Q(to_account_id=account_id), **date_filter
+        ).order_by()
+        parts += [
+            (transactions, Sum(_transaction_effect())),
+            (transfers, Sum(_transfer_effect(account_id))),
+        ]
+
+    if group is None:
+        return sum((qs.aggregate(total=expr)['total'] or _zero for qs, expr in parts), _zero)
+
+    period = TruncMonth('date') if group == 'month' else F('date')
+    result = defaultdict(Decimal)
+    for qs, expr in parts:
+        for row in qs.annotate(period=period).values('period').annotate(total=expr):
+            result[to_date(row['period'])] += row['total'] or _zero
+    return result
+
+
+def build_checkpoints(account_id, owner_id, up_to, archived_before=None):
+    """
+    Creates the missing month-boundary checkpoints of an account up to ``up_to``.
+
+    Starts from the latest surviving checkpoint (or the first month with
+    activity) and aggregates only the months after it, reading the archive
+    tables too when those months reach before ``archived_before`` (the
+    account's archive cutoff).
+
+    The checkpoints are only stored if the owner's change watermark did not
+    move while they were computed: a back-dated write committed in between
+    has already run its checkpoint invalidation, so nothing would correct them.
+
+    Returns:
+        dict: month -> ledger total for the checkpoints now known up to ``up_to``
+        (``up_to`` is always included)
+    """
+    up_to = month_start(up_to)
+    # Read before the base checkpoint too, which a racing write may delete
+    version, _ = get_watermark(owner_id)
+    base = (
+        BalanceCheckpoint.objects.filter(account_id=account_id, month__lte=up_to)
+        .order_by('-month').first()
+    )
+    if base is not None and base.month == up_to:
+        return {base.month: base.ledger_total}
+
+    if base is not None:
+        month, running = base.month, base.ledger_total
+        monthly = ledger_effects(account_id, group='month', archived=_reaches_archive(archived_before, month),
+                                 date__gte=month, date__lt=up_to)
+        rows = []
+    else:
+        monthly = ledger_effects(account_id, group='month', archived=archived_before is not None, date__lt=up_to)
+        month, running = (min(monthly) if monthly else up_to), _zero
+        rows = [BalanceCheckpoint(account_id=account_id, month=month, ledger_total=running)]
+
+    while month < up_to:
+        running += monthly.get(month, _zero)
+        month = next_month(month)
+        rows.append(BalanceCheckpoint(account_id=account_id, month=month, ledger_total=running))
+
+    with transaction.atomic():
+        # Writers bump the watermark before invalidating checkpoints (see LedgerChanges.flush), so a
+        # racing write has either moved the version already or waits for this block to commit
+        current = (
+            ChangeWatermark.objects.select_for_update().filter(owner_id=owner_id)
+            .values_list('version', flat=True).first()
+        )
+        if current == version:
+            BalanceCheckpoint.objects.bulk_create(rows, ignore_conflicts=True)
+    return {row.month: row.ledger_total for row in rows}
+
+
+def get_checkpoints(account_id, owner_id, months, archived_before=None):
+    """
+    Returns ``{month: ledger total}`` for the requested month starts,
+    building any missing checkpoints.
+    """
+    months = set(months)
+    known = dict(
+        BalanceCheckpoint.objects.filter(account_id=account_id, month__in=months)
+        .values_list('month', 'ledger_total')
+    )
+    missing = months - known.keys()
+    if missing:
+        built = build_checkpoints(account_id, owner_id, max(missing), archived_before)
+        for month in sorted(missing):
+            if month not in built:
+                # Before the checkpoint (or the first activity) the build started from
+                built.update(build_checkpoints(account_id, owner_id, month, archived_before))
+            known[month] = built[month]
+    return known
+
+
+def balance_at(account, at, today=None):
+    """
+    Returns the balance of ``account`` at the end of day ``at``.
+
+    The balance is anchored on the current ``Account.balance``:
+
+        balance(at) = balance - ledger(after at)
+                    = balance - (cp[this month] + ledger(this month..))
+                              + (cp[month of at] + ledger(month of at..at))
+
+    so only two partial months of ledger rows are aggregated. The archive
+    tables are only read for periods before the account's archive cutoff.
+    """
+    at = to_date(at)
+    current = month_start(today or timezone.localdate())
+    target = month_start(at)
+    cutoff = archive_cutoff(account)
+
+    if target >= current:
+        return account.balance - ledger_effects(account.pk, archived=_reaches_archive(cutoff, at), date__gt=at)
+
+    checkpoints = get_checkpoints(account.pk, account.owner_id, [target, current], archived_before=cutoff)
+    ledger_until_at = checkpoints[target] + ledger_effects(
+        account.pk, archived=_reaches_archive(cutoff, target), date__gte=target, date__lte=at
+    )
+    ledger_total = checkpoints[current] + ledger_effects(
+        account.pk, archived=_reaches_archive(cutoff, current), date__gte=current
+    )
+    return account.balance - ledger_total + ledger_until_at
+
+
+def balance_series(account, start, end, interval='month', today=None):
+    """
+    Returns ``[(date, balance), ...]`` at the end of each day or month
+    between ``start`` and ``end`` (the last point is always ``end``).
+    """
+    start, end = to_date(start), to_date(end)
+    running = balance_at(account, start - timedelta(days=1), today=today)
+    daily = ledger_effects(account.pk, group='date', archived=_reaches_archive(archive_cutoff(account), start),
+                           date__gte=start, date__lte=end)
+
+    points = []
+    day = start
+    while day <= end:
+        running += daily.get(day, _zero)
+        is_month_end = (day + timedelta(days=1)).day == 1
+        if interval == 'day' or is_month_end or day == end:
+            points.append((day, running))
+        day += timedelta(days=1)
+    return points
+
+
+def invalidate_checkpoints(changes):
+    """
+    Deletes checkpoints made stale by ledger changes.
+
+    Args:
+        changes (iterable): ``(account_id, date)`` pairs of changed rows; every
+            checkpoint after the earliest date of each account is removed
+    """
+    earliest = {}
+    for account_id, changed in changes:
+        if account_id is None or changed is None:
+            continue
+        changed = to_date(changed)
+        if account_id not in earliest or changed < earliest[account_id]:
+            earliest[account_id] = changed
+
+    if not earliest:
+        return
+    stale = Q()
+    for account_id, changed in earliest.items():
+        stale |= Q(account_id=account_id, month__gt=changed)
+    BalanceCheckpoint.objects.filter(stale).delete()
+
+
+def invalidate_owner_checkpoints(owner_id):
+    """Deletes every checkpoint of a user's accounts (e.g. after a category type change)."""
+    BalanceCheckpoint.objects.filter(account__owner_id=owner_id).delete()
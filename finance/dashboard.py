@@ -0,0 +1,71 @@
+# finance/dashboard.py
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .models import Account, MonthlyCategoryTotal, Transaction, Transfer
+from .rollups import month_start
+from .serializers import (
+    DASHBOARD_DEFAULT_LIMIT, AccountValuesSerializer, DashboardCategorySerializer, TransactionValuesSerializer,
+    TransferValuesSerializer, UserSerializer,
+)
+
+
+def _month_totals(owner_id, month):
+    """Income and expense per category in ``month``, read from the monthly rollup."""
+    rows = (
+        MonthlyCategoryTotal.objects.filter(owner_id=owner_id, month=month, category__isnull=False)
+        .exclude(count=0)
+        .order_by('category__name')
+        .values('category', 'category__name', 'category__type')
+        .annotate(total=Sum('total'), count=Sum('count'))
+    )
+    totals = {'INCOME': [], 'EXPENSE': []}
+    for row in rows:
+        totals[row['category__type']].append({
+            'category': row['category'],
+            'category_name': row['category__name'],
+            'total': row['total'],
+            'count': row['count'],
+        })
+    return {
+        key.lower(): {
+            'total': format(sum((row['total'] for row in categories), Decimal('0.00')), 'f'),
+            'categories': DashboardCategorySerializer(categories, many=True).data,
+        }
+        for key, categories in totals.items()
+    }
+
+
+def _latest(queryset, serializer, limit):
+    return serializer.serialize(queryset.order_by('-date', '-id').values(*serializer.lookups)[:limit])
+
+
+def build_dashboard(user, today, limit=DASHBOARD_DEFAULT_LIMIT):
+    """
+    Everything the home screen shows, in four queries whatever the amount of
+    data: the accounts, the current month's totals per category (from the
+    MonthlyCategoryTotal rollup, so transactions dated later this month are
+    included), and the latest ``limit`` transactions and transfers (index
+    scans on (owner, date, id)). Net worth is summed from the account rows.
+    """
+    accounts = AccountValuesSerializer()
+    account_rows = list(Account.objects.filter(owner_id=user.pk).values(*accounts.lookups))
+    net_worth = sum((row['balance'] for row in account_rows), Decimal('0.00'))
+    month = month_start(today)
+
+    return {
+        'user': UserSerializer(user).data,
+        'month': month.strftime('%Y-%m'),
+        'net_worth': format(net_worth, 'f'),
+        'accounts': accounts.serialize(account_rows),
+        **_month_totals(user.pk, month),
+        'transactions': _latest(
+            Transaction.objects.filter(owner_id=user.pk),
+            TransactionValuesSerializer(expand=['account', 'category']), limit,
+        ),
+        'transfers': _latest(
+            Transfer.objects.filter(owner_id=user.pk),
+            TransferValuesSerializer(expand=['from_account', 'to_account']), limit,
+        ),
+    }
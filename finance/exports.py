@@ -0,0 +1,81 @@
+# finance/exports.py
+import csv
+import datetime
+import decimal
+import heapq
+import io
+import json
+
+# Rows fetched per database round trip while streaming
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_rows(queryset, columns):
+    """
+    Yields export rows as tuples, reading ``values_list`` tuples in chunks.
+
+    Args:
+        queryset (QuerySet): Rows to export, already filtered and ordered
+        columns (list): ``(header, lookup)`` pairs; lookups may span relations
+            (e.g. ``category__name``), which are joined in SQL
+    """
+    lookups = [lookup for _, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def merge_export_rows(row_iterators, columns):
+    """
+    Merges export rows of several tables (e.g. hot and archived transactions)
+    already sorted by date and id into one chronological stream.
+    """
+    lookups = [lookup for _, lookup in columns]
+    date_index, id_index = lookups.index('date'), lookups.index('id')
+    return heapq.merge(*row_iterators, key=lambda row: (row[date_index], row[id_index]))
+
+
+def stream_csv(rows, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields CSV text: the header line, then one string per chunk of rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in columns])
+    yield buffer.getvalue()
+
+    pending = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending == chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields newline-delimited JSON, one string per chunk of rows.
+    """
+    headers = [header for header, _ in columns]
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(headers, row)), default=_json_default))
+        if len(lines) == chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _json_default(value):
+    # Amounts stay strings ("300.00"), as in the regular API responses
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,251 @@
+# finance/generate.py
+import csv
+import io
+import random
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+
+from .models import Account, Category, MonthlyCategoryTotal, Transaction, Transfer
+from .rollups import month_start
+
+# Rows per INSERT statement (PostgreSQL loads the ledger with one COPY per table)
+GENERATE_BATCH_SIZE = 2000
+
+# Password of every generated user
+GENERATED_PASSWORD = "generatedpassword123"
+
+GeneratorConfig = namedtuple('GeneratorConfig', [
+    'prefix', 'seed', 'start', 'end', 'accounts', 'transactions_per_month', 'transfers_per_month', 'password_hash',
+])
+
+ACCOUNT_NAMES = ["Checking", "Savings", "Credit Card", "Cash", "Brokerage", "Joint Account"]
+
+# Everyday expenses: category -> (relative frequency, lognormal mu, sigma, merchants)
+EXPENSE_PROFILE = {
+    "Food": (45, 3.0, 0.6, ["Grocery Store", "Supermarket", "Bakery", "Restaurant", "Coffee Shop"]),
+    "Transportation": (18, 2.9, 0.7, ["Gas Station", "Metro Card", "Taxi", "Parking"]),
+    "Entertainment": (14, 3.3, 0.8, ["Cinema", "Streaming Service", "Concert Tickets", "Bookstore"]),
+    "Health": (8, 3.7, 0.9, ["Pharmacy", "Dentist", "Clinic"]),
+    "Utilities": (8, 3.9, 0.5, ["Phone Bill", "Internet", "Water"]),
+    "Education": (4, 4.3, 0.8, ["Online Course", "Textbooks"]),
+    "Debt Payments": (3, 5.0, 0.5, ["Loan Payment", "Card Payment"]),
+}
+_EXPENSE_NAMES = list(EXPENSE_PROFILE)
+_EXPENSE_WEIGHTS = [profile[0] for profile in EXPENSE_PROFILE.values()]
+
+# Occasional income: category -> (probability per month, lognormal mu, sigma)
+EXTRA_INCOME = {
+    "Investments": (0.3, 4.5, 1.0),
+    "Gifts": (0.05, 4.0, 0.8),
+    "Deposits": (0.1, 5.0, 0.7),
+}
+
+
+def make_config(prefix, seed, start, end, accounts, transactions_per_month, transfers_per_month):
+    return GeneratorConfig(
+        prefix, seed, start, end, accounts, transactions_per_month, transfers_per_month,
+        # Hashing once keeps the generator fast; every user gets the same password
+        make_password(GENERATED_PASSWORD),
+    )
+
+
+def _months(start, end):
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def _cents(rng, mu, sigma):
+    return max(1, round(rng.lognormvariate(mu, sigma) * 100))
+
+
+def _day_in(rng, month, start, end):
+    last = min((month + timedelta(days=32)).replace(day=1) - timedelta(days=1), end)
+    first = max(month, start)
+    return first + timedelta(days=rng.randrange((last - first).days + 1))
+
+
+class GeneratedUser:
+    """
+    The synthetic data of one user, built in memory.
+
+    Balances and monthly rollups are accumulated (in cents) while the ledger
+    rows are drawn, so no pass over the inserted rows is needed afterwards.
+    """
+
+    def __init__(self, index, config):
+        # Seeded per user: the data does not depend on chunking or worker count
+        rng = random.Random(f"{config.seed}:{index}")
+        self.user = User(
+            username=f"{config.prefix}{index}", email=f"{config.prefix}{index}@example.com",
+            password=config.password_hash,
+        )
+        self.categories = {
+            (name, cat_type): Category(name=name, type=cat_type, owner=self.user)
+            for name, cat_type in Category.DEFAULT_CATEGORIES
+        }
+        count = rng.randint(max(1, config.accounts - 1), config.accounts + 1)
+        self.accounts = [
+            Account(name=name, balance=Decimal('0.00'), owner=self.user)
+            for name in rng.sample(ACCOUNT_NAMES, min(count, len(ACCOUNT_NAMES)))
+        ]
+        # Unsaved instances are unhashable: the ledger refers to accounts by position
+        self.transactions = []
+        self.transfers = []
+        self.balances = [0] * len(self.accounts)
+        self.rollups = defaultdict(lambda: [0, 0])
+        self._draw(rng, config)
+
+    def _transaction(self, account, category_name, category_type, cents, day, description):
+        category = (category_name, category_type)
+        self.transactions.append((account, category, cents, day, description))
+        self.balances[account] += cents if category_type == 'INCOME' else -cents
+        rollup = self.rollups[(account, category, month_start(day))]
+        rollup[0] += cents
+        rollup[1] += 1
+
+    def _transfer(self, source, target, cents, day, description):
+        self.transfers.append((source, target, cents, day, description))
+        self.balances[source] -= cents
+        self.balances[target] += cents
+
+    def _draw(self, rng, config):
+        accounts = range(len(self.accounts))
+        # Most spending goes through the first accounts (checking, card)
+        weights = [1 / (position + 1) for position in accounts]
+        salary = _cents(rng, 8.0, 0.4)
+        rent = _cents(rng, 6.8, 0.3)
+
+        for account in accounts:
+            self._transaction(account, "Initial Balance (+)", 'INCOME', _cents(rng, 6.5, 1.0),
+                              config.start, "Opening balance")
+
+        for month in _months(config.start, config.end):
+            payday = max(month, config.start)
+            self._transaction(accounts[0], "Salary", 'INCOME', salary, payday, "Monthly salary")
+            self._transaction(accounts[0], "Housing", 'EXPENSE', rent, _day_in(rng, month, payday, config.end),
+                              "Rent")
+            for name, (probability, mu, sigma) in EXTRA_INCOME.items():
+                if rng.random() < probability:
+                    self._transaction(rng.choice(accounts), name, 'INCOME', _cents(rng, mu, sigma),
+                                      _day_in(rng, month, config.start, config.end), name)
+
+            spread = config.transactions_per_month
+            for _ in range(rng.randint(spread // 2, spread + spread // 2)):
+                name = rng.choices(_EXPENSE_NAMES, _EXPENSE_WEIGHTS)[0]
+                _weight, mu, sigma, merchants = EXPENSE_PROFILE[name]
+                self._transaction(rng.choices(accounts, weights)[0], name, 'EXPENSE', _cents(rng, mu, sigma),
+                                  _day_in(rng, month, config.start, config.end), rng.choice(merchants))
+
+            if len(accounts) > 1:
+                self._transfer(accounts[0], accounts[1], round(salary * 0.1), payday, "Monthly savings")
+                for _ in range(rng.randint(0, 2 * config.transfers_per_month)):
+                    source, target = rng.sample(accounts, 2)
+                    self._transfer(source, target, _cents(rng, 4.5, 1.0),
+                                   _day_in(rng, month, config.start, config.end), "Transfer")
+
+        for account, cents in zip(self.accounts, self.balances):
+            account.balance = Decimal(cents).scaleb(-2)
+
+
+def _table(model, fields):
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(model._meta.get_field(name).column) for name in fields)
+    return f"{quote(model._meta.db_table)} ({columns})"
+
+
+def _copy_rows(model, fields, rows):
+    """Loads ``rows`` (tuples matching ``fields``) with COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {_table(model, fields)} FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _insert_rows(model, fields, rows):
+    """
+    Inserts ``rows`` (tuples matching ``fields``) with executemany.
+
+    Ledger rows skip model instances altogether: building them costs far
+    more than the INSERTs themselves.
+    """
+    placeholders = ", ".join(["%s"] * len(fields))
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), GENERATE_BATCH_SIZE):
+            cursor.executemany(f"INSERT INTO {_table(model, fields)} VALUES ({placeholders})",
+                               rows[offset:offset + GENERATE_BATCH_SIZE])
+
+
+def _insert_ledger(generated):
+    transactions = [
+        (item.accounts[account].pk, item.categories[category].pk, str(Decimal(cents).scaleb(-2)), day.isoformat(),
+         description, item.user.pk)
+        for item in generated
+        for account, category, cents, day, description in item.transactions
+    ]
+    transfers = [
+        (item.accounts[source].pk, item.accounts[target].pk, str(Decimal(cents).scaleb(-2)), day.isoformat(),
+         description, item.user.pk)
+        for item in generated
+        for source, target, cents, day, description in item.transfers
+    ]
+    load = _copy_rows if connection.vendor == 'postgresql' else _insert_rows
+    load(Transaction, ['account', 'category', 'amount', 'date', 'description', 'owner'], transactions)
+    load(Transfer, ['from_account', 'to_account', 'amount', 'date', 'description', 'owner'], transfers)
+
+
+def generate_users(first, count, config):
+    """
+    Generates and inserts users ``first`` to ``first + count - 1`` in one
+    transaction, bypassing the model signals: default categories, final
+    account balances and the monthly rollup are written directly.
+
+    Returns:
+        tuple: (users, transactions, transfers) inserted
+    """
+    generated = [GeneratedUser(index, config) for index in range(first, first + count)]
+    with transaction.atomic():
+        User.objects.bulk_create([item.user for item in generated], batch_size=GENERATE_BATCH_SIZE)
+        Category.objects.bulk_create(
+            [category for item in generated for category in item.categories.values()],
+            batch_size=GENERATE_BATCH_SIZE,
+        )
+        Account.objects.bulk_create(
+            [account for item in generated for account in item.accounts], batch_size=GENERATE_BATCH_SIZE,
+        )
+        _insert_ledger(generated)
+        MonthlyCategoryTotal.objects.bulk_create(
+            [
+                MonthlyCategoryTotal(owner=item.user, account=item.accounts[account],
+                                     category=item.categories[category], month=month,
+                                     total=Decimal(total).scaleb(-2), count=rows)
+                for item in generated
+                for (account, category, month), (total, rows) in item.rollups.items()
+            ],
+            batch_size=GENERATE_BATCH_SIZE,
+        )
+    return (
+        len(generated),
+        sum(len(item.transactions) for item in generated),
+        sum(len(item.transfers) for item in generated),
+    )
+
+
+def generate_task(first, count, config):
+    """Worker entry point: generates one chunk and releases the connection."""
+    try:
+        return generate_users(first, count, config)
+    finally:
+        connections.close_all()
+
+
+def default_period(years, end=None):
+    end = end or date.today()
+    return end - timedelta(days=round(365.25 * years)) + timedelta(days=1), end
@@ -0,0 +1,384 @@
+# finance/imports.py
+import csv
+import hashlib
+import io
+import re
+from collections import Counter, namedtuple
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+from .balances import ledger_batch, transaction_state
+from .models import Account, ArchivedTransaction, Category, StagedTransaction, StatementImport, Transaction
+
+# Staged rows inserted per INSERT statement while parsing
+STAGE_BATCH_SIZE = 2000
+# Staged rows committed per database transaction (one balance update per account each)
+COMMIT_CHUNK_SIZE = 2000
+# Largest amount a ledger row holds (Transaction.amount: max_digits=10, decimal_places=2)
+MAX_AMOUNT = Decimal('99999999.99')
+
+# Accepted CSV header names per field (compared case-insensitively)
+CSV_COLUMNS = {
+    'date': ('date', 'posted', 'posting date', 'transaction date'),
+    'amount': ('amount', 'value'),
+    'debit': ('debit', 'withdrawal'),
+    'credit': ('credit', 'deposit'),
+    'description': ('description', 'memo', 'payee', 'name', 'details'),
+    'category': ('category',),
+    'account': ('account',),
+}
+
+ParsedRow = namedtuple(
+    'ParsedRow', ['row_number', 'date', 'amount', 'description', 'category_name', 'account_name', 'error']
+)
+
+_OFX_TAG = re.compile(r'<(/?)([A-Z0-9.]+)>([^<\r\n]*)', re.IGNORECASE)
+
+
+class StatementError(Exception):
+    """Raised when a statement cannot be parsed or is in the wrong state."""
+
+
+# ---------- Parsing ----------
+def _parse_date(value, date_format=None):
+    value = value.strip()
+    if date_format:
+        return datetime.strptime(value, date_format).date()
+    if len(value) >= 8 and value[:8].isdigit():
+        # OFX style: YYYYMMDD[HHMMSS[.XXX][TZ]]
+        return datetime.strptime(value[:8], '%Y%m%d').date()
+    return datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def _parse_amount(value):
+    """Parses a signed amount; raises InvalidOperation for text, NaN and infinities."""
+    value = (value or '').strip().replace(',', '').replace('$', '').replace(' ', '')
+    if value.startswith('(') and value.endswith(')'):
+        value = f"-{value[1:-1]}"
+    if not value:
+        return None
+    amount = Decimal(value)
+    if not amount.is_finite():
+        raise InvalidOperation(value)
+    return amount.quantize(Decimal('0.01'))
+
+
+def _parsed(row_number, date_value, amount, description, category_name='', account_name='', date_format=None):
+    try:
+        day = _parse_date(date_value, date_format)
+    except (TypeError, ValueError):
+        return ParsedRow(row_number, None, None, description, category_name, account_name, "Invalid date")
+    if amount is None:
+        return ParsedRow(row_number, day, None, description, category_name, account_name, "Missing amount")
+    return ParsedRow(row_number, day, amount, description, category_name, account_name, '')
+
+
+def parse_csv(stream, date_format=None):
+    """
+    Yields ParsedRow tuples from a CSV statement, one line at a time.
+
+    The header must name a date column, a description column and either an
+    amount column (signed) or debit/credit columns.
+    """
+    reader = csv.reader(stream)
+    try:
+        header = [name.strip().lower() for name in next(reader)]
+    except StopIteration:
+        raise StatementError("The file is empty.")
+
+    index = {}
+    for field, names in CSV_COLUMNS.items():
+        for name in names:
+            if name in header:
+                index[field] = header.index(name)
+                break
+    if 'date' not in index or not ('amount' in index or 'debit' in index or 'credit' in index):
+        raise StatementError("CSV header must contain a date column and an amount (or debit/credit) column.")
+
+    def cell(row, field):
+        position = index.get(field)
+        return row[position].strip() if position is not None and position < len(row) else ''
+
+    for row_number, row in enumerate(reader, start=1):
+        if not any(value.strip() for value in row):
+            continue
+        try:
+            if 'amount' in index:
+                amount = _parse_amount(cell(row, 'amount'))
+            else:
+                credit = _parse_amount(cell(row, 'credit')) or Decimal('0.00')
+                debit = _parse_amount(cell(row, 'debit')) or Decimal('0.00')
+                amount = credit - abs(debit) if (credit or debit) else None
+        except InvalidOperation:
+            yield ParsedRow(row_number, None, None, cell(row, 'description'), '', '', "Invalid amount")
+            continue
+        yield _parsed(row_number, cell(row, 'date'), amount, cell(row, 'description'),
+                      cell(row, 'category'), cell(row, 'account'), date_format)
+
+
+def parse_ofx(stream):
+    """
+    Yields ParsedRow tuples from the <STMTTRN> records of an OFX statement.
+
+    Handles both SGML (OFX 1.x, unclosed tags) and XML (OFX 2.x) files
+    without loading the whole document.
+    """
+    record = None
+    row_number = 0
+    for line in stream:
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                if closing and record is not None:
+                    row_number += 1
+                    yield _ofx_row(row_number, record)
+                    record = None
+                elif not closing:
+                    record = {}
+            elif record is not None and not closing and value.strip():
+                record[tag] = value.strip()
+
+
+def _ofx_row(row_number, record):
+    description = record.get('NAME', '')
+    memo = record.get('MEMO', '')
+    if memo and memo != description:
+        description = f"{description} - {memo}" if description else memo
+    try:
+        amount = _parse_amount(record.get('TRNAMT'))
+    except InvalidOperation:
+        return ParsedRow(row_number, None, None, description, '', '', "Invalid amount")
+    return _parsed(row_number, record.get('DTPOSTED', ''), amount, description)
+
+
+# ---------- Matching and de-duplication ----------
+def content_hash(account_id, day, signed_amount, description):
+    """
+    Hashes the identifying content of a ledger row: (account, date, signed amount, description).
+    """
+    normalized = ' '.join((description or '').lower().split())
+    payload = f"{account_id}|{day.isoformat()}|{signed_amount:.2f}|{normalized}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _signed(amount, category_type):
+    return -amount if category_type == 'EXPENSE' else amount
+
+
+class RowMatcher:
+    """
+    Resolves accounts and categories of parsed rows from in-memory maps of
+    the user's accounts and categories (no query per row).
+    """
+
+    def __init__(self, statement):
+        self.statement = statement
+        owner = statement.owner_id
+        self.accounts = {account.name.lower(): account.pk for account in Account.objects.filter(owner_id=owner)}
+        self.categories = {
+            (category.name.lower(), category.type): category.pk
+            for category in Category.objects.filter(owner_id=owner)
+        }
+        self.fallback = {
+            'INCOME': statement.income_category_id,
+            'EXPENSE': statement.expense_category_id,
+        }
+
+    def stage(self, row):
+        staged = StagedTransaction(
+            statement_id=self.statement.pk, row_number=row.row_number, date=row.date,
+            amount=row.amount, description=row.description[:10000],
+        )
+        if row.error:
+            return self._error(staged, row.error)
+        if not row.amount:
+            return self._error(staged, "Zero amount")
+        if abs(row.amount) > MAX_AMOUNT:
+            # Kept out of the staged row: the column cannot hold it either
+            staged.amount = None
+            return self._error(staged, "Amount out of range")
+
+        if row.account_name:
+            staged.account_id = self.accounts.get(row.account_name.lower())
+            if staged.account_id is None:
+                return self._error(staged, f"Unknown account '{row.account_name[:100]}'")
+        else:
+            staged.account_id = self.statement.account_id
+
+        category_type = 'INCOME' if row.amount > 0 else 'EXPENSE'
+        staged.category_id = self.categories.get((row.category_name.lower(), category_type)) \
+            if row.category_name else None
+        if staged.category_id is None:
+            staged.category_id = self.fallback[category_type]
+        if staged.category_id is None:
+            return self._error(staged, f"No {category_type.lower()} category for this row")
+
+        staged.content_hash = content_hash(staged.account_id, row.date, row.amount, row.description)
+        return staged
+
+    @staticmethod
+    def _error(staged, message):
+        staged.status = 'ERROR'
+        staged.error = message
+        return staged
+
+
+def stage_rows(statement, rows):
+    """
+    Matches parsed rows in memory and inserts them into staging in batches.
+
+    Returns:
+        int: Number of staged rows
+    """
+    matcher = RowMatcher(statement)
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(matcher.stage(row))
+        if len(batch) == STAGE_BATCH_SIZE:
+            StagedTransaction.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        StagedTransaction.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def mark_duplicates(statement):
+    """
+    Flags staged rows whose content hash already exists in the ledger.
+
+    Hashes are compared as multisets: two identical rows in the file match
+    two identical transactions, so legitimate repeats are not dropped.
+
+    Returns:
+        int: Number of duplicate rows
+    """
+    staged = list(
+        statement.rows.filter(status='NEW').order_by('id')
+        .values_list('id', 'account_id', 'date', 'content_hash')
+    )
+    if not staged:
+        return 0
+
+    # Archived rows count too: re-importing an old statement must not duplicate them
+    known = Counter()
+    for model in (Transaction, ArchivedTransaction):
+        existing = model.objects.filter(
+            owner_id=statement.owner_id,
+            account_id__in={account_id for _, account_id, _, _ in staged},
+            date__range=(min(row[2] for row in staged), max(row[2] for row in staged)),
+        ).order_by().values_list('account_id', 'date', 'amount', 'description', 'category__type')
+        known.update(
+            content_hash(account_id, day, _signed(amount, category_type), description)
+            for account_id, day, amount, description, category_type in existing.iterator(chunk_size=STAGE_BATCH_SIZE)
+        )
+
+    duplicates = []
+    for pk, _, _, row_hash in staged:
+        if known[row_hash] > 0:
+            known[row_hash] -= 1
+            duplicates.append(pk)
+
+    for start in range(0, len(duplicates), STAGE_BATCH_SIZE):
+        StagedTransaction.objects.filter(pk__in=duplicates[start:start + STAGE_BATCH_SIZE]).update(status='DUPLICATE')
+    return len(duplicates)
+
+
+def create_import(owner, account, stream, format, file_name='', date_format=None,
+                  income_category=None, expense_category=None):
+    """
+    Parses a statement file into staging, matches and de-duplicates it.
+
+    Args:
+        stream: Binary file-like object with the statement
+        format (str): 'CSV' or 'OFX'
+
+    Returns:
+        StatementImport: The import, PARSED (or FAILED with an error message)
+    """
+    statement = StatementImport.objects.create(
+        owner=owner, account=account, file_name=file_name, format=format,
+        income_category=income_category, expense_category=expense_category,
+    )
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+    rows = parse_csv(text, date_format) if format == 'CSV' else parse_ofx(text)
+
+    try:
+        with transaction.atomic():
+            statement.total_rows = stage_rows(statement, rows)
+            statement.duplicate_rows = mark_duplicates(statement)
+            statement.error_rows = statement.rows.filter(status='ERROR').count()
+            statement.accepted_rows = statement.total_rows - statement.duplicate_rows - statement.error_rows
+            statement.save()
+    except (StatementError, UnicodeError, csv.Error) as exc:
+        statement.status = 'FAILED'
+        statement.error = str(exc)
+        statement.save(update_fields=['status', 'error'])
+    except DatabaseError:
+        # e.g. a value the staging columns cannot hold; the staged rows were rolled back
+        statement.status = 'FAILED'
+        statement.error = "The statement rows could not be stored."
+        statement.save(update_fields=['status', 'error'])
+    finally:
+        text.detach()
+    return statement
+
+
+# ---------- Commit ----------
+def commit_import(statement, chunk_size=COMMIT_CHUNK_SIZE, progress=None):
+    """
+    Commits the accepted staged rows to the ledger in chunks.
+
+    Each chunk is one database transaction: one bulk INSERT, one balance
+    UPDATE for all affected accounts, rollup/checkpoint maintenance, and the
+    staged rows marked COMMITTED, so an interrupted import can be resumed.
+
+    Args:
+        progress (callable): Optional ``progress(committed, accepted)`` callback
+
+    Raises:
+        StatementError: If the import is not in the PARSED state
+    """
+    claimed = StatementImport.objects.filter(pk=statement.pk, status='PARSED').update(status='COMMITTING')
+    if not claimed:
+        raise StatementError("Only parsed imports can be committed.")
+
+    categories = list(Category.objects.filter(owner_id=statement.owner_id))
+    committed = statement.committed_rows
+    try:
+        while True:
+            chunk = list(
+                statement.rows.filter(status='NEW').order_by('id')
+                .values_list('id', 'account_id', 'category_id', 'amount', 'date', 'description')[:chunk_size]
+            )
+            if not chunk:
+                break
+            with ledger_batch() as changes:
+                changes.remember_categories(categories)
+                created = Transaction.objects.bulk_create([
+                    Transaction(owner_id=statement.owner_id, account_id=account_id, category_id=category_id,
+                                amount=abs(amount), date=day, description=description)
+                    for _, account_id, category_id, amount, day, description in chunk
+                ])
+                for tx in created:
+                    changes.add_transaction(transaction_state(tx))
+                statement.rows.filter(status='NEW', id__lte=chunk[-1][0]).update(status='COMMITTED')
+                StatementImport.objects.filter(pk=statement.pk).update(
+                    committed_rows=F('committed_rows') + len(chunk)
+                )
+            committed += len(chunk)
+            if progress is not None:
+                progress(committed, statement.accepted_rows)
+    except Exception as exc:
+        # Committed chunks stay committed; the rest can be retried
+        StatementImport.objects.filter(pk=statement.pk).update(status='PARSED', error=str(exc)[:1000])
+        raise
+
+    StatementImport.objects.filter(pk=statement.pk).update(status='COMMITTED', error='')
+    statement.refresh_from_db()
+    return statement
@@ -0,0 +1,43 @@
+# finance/lookups.py
+from collections.abc import Mapping
+
+
+class OwnerLookup(Mapping):
+    """
+    ``{pk: instance}`` map of the rows of ``model`` owned by one user.
+
+    Loaded with a single query on first access, so building a serializer
+    context that is never used for validation (e.g. a list) costs nothing.
+    """
+
+    def __init__(self, model, owner_id):
+        self.model = model
+        self.owner_id = owner_id
+        self._objects = None
+
+    @property
+    def objects(self):
+        if self._objects is None:
+            self._objects = {obj.pk: obj for obj in self.model.objects.filter(owner_id=self.owner_id)}
+        return self._objects
+
+    def __getitem__(self, pk):
+        return self.objects[pk]
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __len__(self):
+        return len(self.objects)
+
+
+def request_lookups(request, lookups):
+    """
+    Returns ``{context key: OwnerLookup}`` for ``lookups`` (``{key: model}``),
+    shared by every serializer of the request.
+    """
+    cache = request.__dict__.setdefault('_owner_lookups', {})
+    for key, model in lookups.items():
+        if key not in cache:
+            cache[key] = OwnerLookup(model, request.user.pk)
+    return {key: cache[key] for key in lookups}
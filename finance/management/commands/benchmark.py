@@ -0,0 +1,80 @@
+# finance/management/commands/benchmark.py
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from finance.benchmarks import load_benchmarks
+from finance.benchmarks._baseline import DEFAULT_BASELINE, compare, load_baseline, save_baseline
+
+
+class Command(BaseCommand):
+    help = "Runs in-process benchmarks against a temporary test database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Benchmarks to run (default: all)")
+        parser.add_argument('--rows', type=int, default=1000, help="Dataset size per benchmark")
+        parser.add_argument('--list', action='store_true', help="List available benchmarks and exit")
+        parser.add_argument('--check', action='store_true',
+                            help="Fail when a result regresses past the baseline")
+        parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline")
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline file")
+        parser.add_argument('--query-tolerance', type=float, default=0,
+                            help="Extra queries per request allowed over the baseline")
+        parser.add_argument('--latency-tolerance', type=float, default=0.5,
+                            help="Allowed p95 latency increase as a fraction of the baseline (negative: skip)")
+
+    def handle(self, *args, **options):
+        registry = load_benchmarks()
+        if options['list']:
+            for name in sorted(registry):
+                self.stdout.write(name)
+            return
+
+        names = options['names'] or sorted(registry)
+        unknown = [name for name in names if name not in registry]
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+        baseline = load_baseline(options['baseline']) if options['check'] else {}
+        latency_tolerance = options['latency_tolerance'] if options['latency_tolerance'] >= 0 else None
+
+        results_by_name = {}
+        failures = []
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            for name in names:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{name} (rows={options['rows']})"))
+                results = results_by_name[name] = registry[name](rows=options['rows'])
+                self.write_results(results)
+                if name in baseline:
+                    failures += [f"{name}: {message}" for message in compare(
+                        results, baseline[name], options['query_tolerance'], latency_tolerance)]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['save_baseline']:
+            save_baseline(options['baseline'], results_by_name)
+            self.stdout.write(f"Baseline saved to {options['baseline']}")
+        if failures:
+            raise CommandError("Regressions against the baseline:\n" + "\n".join(failures))
+
+    def write_results(self, results):
+        if not results:
+            return
+        columns = list(results[0])
+        widths = {
+            col: max(len(col), *(len(self.format_value(row.get(col))) for row in results))
+            for col in columns
+        }
+        self.stdout.write("  ".join(col.ljust(widths[col]) for col in columns))
+        for row in results:
+            self.stdout.write("  ".join(self.format_value(row.get(col)).ljust(widths[col]) for col in columns))
+
+    @staticmethod
+    def format_value(value):
+        if isinstance(value, float):
+            return f"{value:.4g}"
+        return str(value)
@@ -0,0 +1,27 @@
+# finance/management/commands/build_balance_checkpoints.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from finance.checkpoints import build_checkpoints
+from finance.models import Account
+
+
+class Command(BaseCommand):
+    help = "Builds missing month-boundary balance checkpoints up to the current month."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Limit to a user id (repeatable)")
+
+    def handle(self, *args, **options):
+        accounts = Account.objects.order_by('pk')
+        if options['users']:
+            accounts = accounts.filter(owner_id__in=options['users'])
+
+        current = timezone.localdate()
+        built = 0
+        rows = accounts.values_list('pk', 'owner_id', 'carry_forward__cutoff')
+        for account_id, owner_id, archived_before in rows.iterator():
+            build_checkpoints(account_id, owner_id, current, archived_before)
+            built += 1
+        self.stdout.write(self.style.SUCCESS(f"Checkpoints up to date for {built} accounts."))
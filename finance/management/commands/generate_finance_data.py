@@ -0,0 +1,81 @@
+# finance/management/commands/generate_finance_data.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from finance.generate import GENERATED_PASSWORD, default_period, generate_task, generate_users, make_config
+from finance.reconcile import init_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic users with accounts, default categories and years of "
+        "transactions and transfers, written in bulk without the per-row signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Users to generate")
+        parser.add_argument('--years', type=int, default=3, help="Years of history per user")
+        parser.add_argument('--end', type=date.fromisoformat, help="Last day of the history (default: today)")
+        parser.add_argument('--accounts', type=int, default=3, help="Average accounts per user")
+        parser.add_argument('--transactions-per-month', type=int, default=30,
+                            help="Average expense transactions per user and month")
+        parser.add_argument('--transfers-per-month', type=int, default=2,
+                            help="Average transfers per user and month (besides the monthly savings transfer)")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed")
+        parser.add_argument('--prefix', default='synthetic', help="Username prefix of the generated users")
+        parser.add_argument('--chunk-size', type=int, default=100, help="Users per transaction (and worker task)")
+        parser.add_argument('--workers', type=int, default=min(os.cpu_count() or 1, 8),
+                            help="Worker processes (1 runs in-process)")
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("The database must return primary keys from bulk inserts (PostgreSQL, SQLite 3.35+).")
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Users named '{prefix}...' already exist; pick another --prefix.")
+
+        start, end = default_period(options['years'], options['end'])
+        config = make_config(prefix, options['seed'], start, end, options['accounts'],
+                             options['transactions_per_month'], options['transfers_per_month'])
+        total, chunk = options['users'], options['chunk_size']
+        chunks = [(first, min(chunk, total - first)) for first in range(0, total, chunk)]
+
+        workers = options['workers']
+        if workers > 1 and connection.vendor == 'sqlite':
+            # SQLite has a single writer: parallel chunks would only wait on each other's locks
+            self.stderr.write("SQLite allows one writer at a time; generating in-process.")
+            workers = 1
+
+        users = transactions = transfers = 0
+        began = time.perf_counter()
+        if workers <= 1:
+            results = (generate_users(first, count, config) for first, count in chunks)
+            for result in results:
+                users, transactions, transfers = self.report(result, users, transactions, transfers, total)
+        else:
+            # Workers must not share the parent's database connection
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+                firsts, counts = zip(*chunks) if chunks else ((), ())
+                for result in pool.map(generate_task, firsts, counts, repeat(config)):
+                    users, transactions, transfers = self.report(result, users, transactions, transfers, total)
+
+        elapsed = time.perf_counter() - began
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {users} users, {transactions} transactions and {transfers} transfers "
+            f"({start} to {end}) in {elapsed:.1f}s. Password: {GENERATED_PASSWORD}"
+        ))
+
+    def report(self, result, users, transactions, transfers, total):
+        users, transactions, transfers = users + result[0], transactions + result[1], transfers + result[2]
+        if self.verbosity > 1:
+            self.stdout.write(f"  {users}/{total} users, {transactions + transfers} ledger rows")
+        return users, transactions, transfers
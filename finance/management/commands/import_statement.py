@@ -0,0 +1,60 @@
+# finance/management/commands/import_statement.py
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.imports import StatementError, commit_import, create_import
+from finance.models import Account, Category
+
+
+class Command(BaseCommand):
+    help = "Imports a CSV or OFX bank statement into an account, reporting duplicates, errors and progress."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Statement file")
+        parser.add_argument('--user', type=int, required=True, help="Owner user id")
+        parser.add_argument('--account', type=int, required=True, help="Default account id")
+        parser.add_argument('--format', choices=['CSV', 'OFX'], help="Defaults to the file extension")
+        parser.add_argument('--income-category', type=int, help="Category for unmatched credits")
+        parser.add_argument('--expense-category', type=int, help="Category for unmatched debits")
+        parser.add_argument('--date-format', help="strptime format of CSV dates")
+        parser.add_argument('--dry-run', action='store_true', help="Parse and match only, do not commit")
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(pk=options['user'])
+            account = Account.objects.get(pk=options['account'], owner=owner)
+        except (User.DoesNotExist, Account.DoesNotExist):
+            raise CommandError("Unknown user or account.")
+        categories = Category.objects.filter(owner=owner)
+        income = categories.filter(pk=options['income_category'], type='INCOME').first() \
+            if options['income_category'] else None
+        expense = categories.filter(pk=options['expense_category'], type='EXPENSE').first() \
+            if options['expense_category'] else None
+
+        path = options['path']
+        fmt = options['format'] or ('OFX' if path.upper().endswith(('.OFX', '.QFX')) else 'CSV')
+        with open(path, 'rb') as stream:
+            statement = create_import(
+                owner=owner, account=account, stream=stream, format=fmt,
+                file_name=os.path.basename(path)[:255], date_format=options['date_format'],
+                income_category=income, expense_category=expense,
+            )
+        if statement.status == 'FAILED':
+            raise CommandError(f"Import {statement.pk} failed: {statement.error}")
+        self.stdout.write(
+            f"Import {statement.pk}: {statement.total_rows} rows, {statement.accepted_rows} new, "
+            f"{statement.duplicate_rows} duplicates, {statement.error_rows} errors."
+        )
+        if options['dry_run']:
+            return
+
+        def progress(done, total):
+            self.stdout.write(f"  committed {done}/{total}")
+
+        try:
+            statement = commit_import(statement, progress=progress)
+        except StatementError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Committed {statement.committed_rows} transactions."))
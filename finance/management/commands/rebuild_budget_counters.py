@@ -0,0 +1,36 @@
+# finance/management/commands/rebuild_budget_counters.py
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.budgets import live_budget_periods, rebuild_budget_periods, stored_budget_periods
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the BudgetPeriod counters from the ledger and verifies them against a live GROUP BY."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Limit to a user id (repeatable)")
+        parser.add_argument('--check', action='store_true',
+                            help="Only compare the counters with the ledger, do not rebuild")
+
+    def handle(self, *args, **options):
+        owner_ids = options['users']
+
+        if not options['check']:
+            written = rebuild_budget_periods(owner_ids)
+            self.stdout.write(f"Rebuilt {written} budget periods.")
+
+        mismatches = self.compare(live_budget_periods(owner_ids), stored_budget_periods(owner_ids))
+        if mismatches:
+            for key, live, stored in mismatches[:20]:
+                self.stderr.write(f"  {key}: ledger={live} counters={stored}")
+            raise CommandError(f"{len(mismatches)} budget periods differ from the ledger.")
+        self.stdout.write(self.style.SUCCESS("Budget counters match the ledger."))
+
+    @staticmethod
+    def compare(live, stored):
+        mismatches = []
+        for key in live.keys() | stored.keys():
+            if live.get(key) != stored.get(key):
+                mismatches.append((key, live.get(key), stored.get(key)))
+        return sorted(mismatches, key=lambda item: str(item[0]))
@@ -0,0 +1,36 @@
+# finance/management/commands/rebuild_monthly_totals.py
+from django.core.management.base import BaseCommand, CommandError
+
+from finance.rollups import live_monthly_totals, rebuild_monthly_totals, stored_monthly_totals
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the MonthlyCategoryTotal rollup from the ledger and verifies it against a live GROUP BY."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Limit to a user id (repeatable)")
+        parser.add_argument('--check', action='store_true',
+                            help="Only compare the rollup with the ledger, do not rebuild")
+
+    def handle(self, *args, **options):
+        owner_ids = options['users']
+
+        if not options['check']:
+            written = rebuild_monthly_totals(owner_ids)
+            self.stdout.write(f"Rebuilt {written} rollup rows.")
+
+        mismatches = self.compare(live_monthly_totals(owner_ids), stored_monthly_totals(owner_ids))
+        if mismatches:
+            for key, live, stored in mismatches[:20]:
+                self.stderr.write(f"  {key}: ledger={live} rollup={stored}")
+            raise CommandError(f"{len(mismatches)} rollup rows differ from the ledger.")
+        self.stdout.write(self.style.SUCCESS("Rollup matches the ledger."))
+
+    @staticmethod
+    def compare(live, stored):
+        mismatches = []
+        for key in live.keys() | stored.keys():
+            if live.get(key) != stored.get(key):
+                mismatches.append((key, live.get(key), stored.get(key)))
+        return sorted(mismatches, key=lambda item: str(item[0]))
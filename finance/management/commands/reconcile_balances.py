@@ -0,0 +1,56 @@
+# finance/management/commands/reconcile_balances.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from finance.reconcile import RECONCILE_BATCH_SIZE, init_worker, reconcile_task, owner_batches, reconcile_owners
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares every account balance with its ledger (transactions and transfers) "
+        "and reports or fixes the drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Limit to a user id (repeatable)")
+        parser.add_argument('--fix', action='store_true',
+                            help="Correct drifted balances instead of only reporting them")
+        parser.add_argument('--workers', type=int, default=min(os.cpu_count() or 1, 8),
+                            help="Worker processes (1 runs in-process)")
+        parser.add_argument('--batch-size', type=int, default=RECONCILE_BATCH_SIZE,
+                            help="Users per aggregate query")
+
+    def handle(self, *args, **options):
+        batches = owner_batches(options['users'], options['batch_size'])
+        fix = options['fix']
+
+        drifted = []
+        if options['workers'] <= 1:
+            for batch in batches:
+                drifted.extend(reconcile_owners(batch, fix=fix))
+        else:
+            # Workers must not share the parent's database connection
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=init_worker) as pool:
+                for result in pool.map(reconcile_task, batches, repeat(fix)):
+                    drifted.extend(result)
+
+        for drift in drifted[:50]:
+            self.stderr.write(
+                f"  account {drift.account_id} (user {drift.owner_id}): "
+                f"balance={drift.stored} ledger={drift.expected} drift={drift.expected - drift.stored}"
+            )
+        if len(drifted) > 50:
+            self.stderr.write(f"  ... and {len(drifted) - 50} more")
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All balances match the ledger."))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drifted)} account balances."))
+        else:
+            raise CommandError(f"{len(drifted)} account balances differ from the ledger.")
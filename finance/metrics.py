@@ -0,0 +1,356 @@
+# finance/metrics.py
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import sync_and_async_middleware
+
+from .caching import cache_stats
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Layout of the per-route counters; the latency bucket counts follow
+COUNT, LATENCY, QUERIES, DB_TIME, SERIALIZE_TIME, RENDER_TIME, RENDERED, RESPONSE_BYTES = range(8)
+BUCKETS_START = 8
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_FLUSH_INTERVAL = 5
+
+
+def metrics_enabled():
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', '')
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics.
+
+    Recording a request takes one short lock around a few additions. With
+    ``METRICS_DIR`` set, each process also writes its totals to
+    ``<METRICS_DIR>/metrics-<pid>.json`` (atomically, at most every
+    ``METRICS_FLUSH_INTERVAL`` seconds and at exit) and the endpoint sums
+    the files of all gunicorn workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.routes = {}
+        self.responses = {}
+        self._next_flush = 0.0
+
+    def record(self, route, method, status, latency, queries, db_time, serialize_time, render_time,
+               response_bytes):
+        key = f'{route}\t{method}'
+        with self._lock:
+            if self.pid != os.getpid():
+                # Forked after recording (e.g. gunicorn --preload): start from zero
+                self._reset()
+            counters = self.routes.get(key)
+            if counters is None:
+                counters = self.routes[key] = [0] * (BUCKETS_START + len(LATENCY_BUCKETS))
+            counters[COUNT] += 1
+            counters[LATENCY] += latency
+            counters[QUERIES] += queries
+            counters[DB_TIME] += db_time
+            counters[SERIALIZE_TIME] += serialize_time
+            if render_time is not None:
+                counters[RENDER_TIME] += render_time
+                counters[RENDERED] += 1
+            if response_bytes is not None:
+                counters[RESPONSE_BYTES] += response_bytes
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    counters[BUCKETS_START + i] += 1
+                    break
+            status_key = f'{key}\t{status}'
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+            flush = bool(metrics_dir()) and time.monotonic() >= self._next_flush
+            if flush:
+                self._next_flush = time.monotonic() + getattr(
+                    settings, 'METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        if flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'routes': {key: list(counters) for key, counters in self.routes.items()},
+                'responses': dict(self.responses),
+                'cache': cache_stats(),
+            }
+
+    def flush(self):
+        """Writes this process's totals to METRICS_DIR."""
+        directory = metrics_dir()
+        if not directory or self.pid != os.getpid():
+            return
+        data = self.snapshot()
+        path = os.path.join(directory, f'metrics-{self.pid}.json')
+        tmp = f'{path}.{threading.get_ident()}.tmp'
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def merge_snapshots(snapshots):
+    merged = {'routes': {}, 'responses': {}, 'cache': {}}
+    for data in snapshots:
+        for key, counters in data['routes'].items():
+            total = merged['routes'].get(key)
+            if total is None:
+                merged['routes'][key] = list(counters)
+            else:
+                merged['routes'][key] = [a + b for a, b in zip(total, counters)]
+        for key, count in data['responses'].items():
+            merged['responses'][key] = merged['responses'].get(key, 0) + count
+        for key, count in data['cache'].items():
+            merged['cache'][key] = merged['cache'].get(key, 0) + count
+    return merged
+
+
+def collect():
+    """Returns the totals of all processes (or of this one without METRICS_DIR)."""
+    directory = metrics_dir()
+    if not directory:
+        return registry.snapshot()
+    registry.flush()
+    snapshots = []
+    for name in os.listdir(directory):
+        if not (name.startswith('metrics-') and name.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            # Removed or replaced while listing
+            continue
+    return merge_snapshots(snapshots)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(data):
+    """Renders collected totals in the Prometheus text exposition format."""
+    lines = []
+
+    def family(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+            lines.append(f'{name}{suffix}{{{label_text}}} {_number(value)}' if label_text
+                         else f'{name}{suffix} {_number(value)}')
+
+    routes = sorted((key.split('\t'), counters) for key, counters in data['routes'].items())
+
+    samples = []
+    for (route, method), counters in routes:
+        labels = (('route', route), ('method', method))
+        cumulative = 0
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            cumulative += counters[BUCKETS_START + i]
+            samples.append(('_bucket', labels + (('le', repr(bound)),), cumulative))
+        samples.append(('_bucket', labels + (('le', '+Inf'),), counters[COUNT]))
+        samples.append(('_sum', labels, counters[LATENCY]))
+        samples.append(('_count', labels, counters[COUNT]))
+    family('finance_http_request_duration_seconds', 'histogram',
+           'Request latency by route and method.', samples)
+
+    family('finance_http_responses_total', 'counter', 'Responses by route, method and status code.', [
+        ('', tuple(zip(('route', 'method', 'status'), key.split('\t'))), count)
+        for key, count in sorted(data['responses'].items())
+    ])
+
+    for name, index, help_text in (
+        ('finance_db_queries_total', QUERIES, 'Database queries executed.'),
+        ('finance_db_query_duration_seconds_total', DB_TIME, 'Time spent executing database queries.'),
+        ('finance_response_serialize_seconds_total', SERIALIZE_TIME,
+         'Time spent serializing list and detail response data in the view.'),
+        ('finance_response_render_seconds_total', RENDER_TIME, 'Time spent rendering (encoding) response bodies, after the view.'),
+        ('finance_response_size_bytes_total', RESPONSE_BYTES, 'Bytes of non-streaming response bodies.'),
+    ):
+        family(name, 'counter', help_text, [
+            ('', (('route', route), ('method', method)), counters[index]) for (route, method), counters in routes
+        ])
+
+    family('finance_response_cache_requests_total', 'counter', 'Response cache lookups by result.', [
+        ('', (('result', 'hit'),), data['cache'].get('hits', 0)),
+        ('', (('result', 'miss'),), data['cache'].get('misses', 0)),
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+# QueryTimer of the request being recorded; copied into sync_to_async threads with the context
+_request_timer = contextvars.ContextVar('finance_metrics_timer', default=None)
+
+
+class QueryTimer:
+    """
+    ``execute_wrapper`` that counts the queries of a request and their
+    duration; also sums the request's serialization time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.serialize_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.queries += 1
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _request_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    ``connection_created`` handler adding the query timer to every connection.
+
+    Connections are per thread and the ORM calls of async views run in a
+    worker thread, so the timer is installed once per connection and finds
+    the current request's QueryTimer through a context variable.
+    """
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Counts the block as serialization time of the current request (building
+    response data from rows or instances). Queries run inside the block are
+    counted as database time as well.
+    """
+    timer = _request_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.serialize_time += time.perf_counter() - start
+
+
+@sync_and_async_middleware
+class RequestMetricsMiddleware:
+    """
+    Records latency, query count/time, serialization and render time and
+    response size per route (URL name, e.g. ``transaction-list``) and method.
+
+    Enabled by ``METRICS_ENABLED``; it should come first in MIDDLEWARE so
+    the latency covers the whole middleware stack. It runs in both modes,
+    so under ASGI the async views are not pushed to a thread.
+    """
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        return self._record(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _request_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_timer.reset(token)
+        return self._record(request, response, timer, time.perf_counter() - start)
+
+    def _record(self, request, response, timer, latency):
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unmatched'
+        if route == 'metrics':
+            return response
+        render_time = getattr(request, '_metrics_render_time', None)
+        response_bytes = None if response.streaming else len(response.content)
+        registry.record(route, request.method, response.status_code, latency,
+                        timer.queries, timer.duration, timer.serialize_time, render_time, response_bytes)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered (encoded) right after this hook; serializer
+        # fields are evaluated earlier, in the view (see timed_serialization)
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render_time = time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint (``/api/_metrics``).
+
+    Scrapers send ``Authorization: Bearer <METRICS_TOKEN>``; without a
+    configured token the endpoint refuses every request.
+    """
+    if not metrics_enabled():
+        raise Http404
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return HttpResponse(status=403)
+    if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(render_prometheus(collect()), content_type=CONTENT_TYPE)
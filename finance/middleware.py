@@ -0,0 +1,27 @@
+# finance/middleware.py
+from django.contrib.sessions.middleware import SessionMiddleware
+
+# URL prefix of the token-authenticated API
+API_PREFIX = '/api/'
+
+
+class NonApiSessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware that leaves the API alone.
+
+    API requests get an empty session that is never loaded, saved or sent
+    as a cookie, so code that expects ``request.session`` keeps working
+    without touching the session store. The API authenticates by JWT only:
+    a logged-in session (e.g. from the admin) does not authenticate it.
+    """
+
+    def process_request(self, request):
+        if request.path_info.startswith(API_PREFIX):
+            request.session = self.SessionStore()
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        if request.path_info.startswith(API_PREFIX):
+            return response
+        return super().process_response(request, response)
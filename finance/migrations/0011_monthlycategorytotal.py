@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_monthly_totals(apps, schema_editor):
+    Transaction = apps.get_model('finance', 'Transaction')
+    MonthlyCategoryTotal = apps.get_model('finance', 'MonthlyCategoryTotal')
+    rows = (
+        Transaction.objects.annotate(month=TruncMonth('date'))
+        .order_by()
+        .values('owner_id', 'account_id', 'category_id', 'month')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    MonthlyCategoryTotal.objects.bulk_create(
+        [MonthlyCategoryTotal(**row) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0010_transaction_transfer_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategoryTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='finance.account')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='finance.category')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['owner', 'month'], name='monthly_total_owner_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('account', 'category', 'month'), name='monthly_total_unique_key'), models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('account', 'month'), name='monthly_total_unique_uncategorized')],
+            },
+        ),
+        migrations.RunPython(populate_monthly_totals, migrations.RunPython.noop),
+    ]
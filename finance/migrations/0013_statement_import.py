@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0012_balancecheckpoint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatementImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('format', models.CharField(choices=[('CSV', 'CSV'), ('OFX', 'OFX')], max_length=3)),
+                ('status', models.CharField(choices=[('PARSED', 'Parsed'), ('COMMITTING', 'Committing'), ('COMMITTED', 'Committed'), ('FAILED', 'Failed')], default='PARSED', max_length=10)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('accepted_rows', models.PositiveIntegerField(default=0)),
+                ('duplicate_rows', models.PositiveIntegerField(default=0)),
+                ('error_rows', models.PositiveIntegerField(default=0)),
+                ('committed_rows', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statement_imports', to='finance.account')),
+                ('expense_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finance.category')),
+                ('income_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finance.category')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statement_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StagedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_number', models.PositiveIntegerField()),
+                ('date', models.DateField(null=True)),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Signed amount as in the file', max_digits=10, null=True)),
+                ('description', models.TextField(blank=True)),
+                ('content_hash', models.CharField(blank=True, max_length=40)),
+                ('status', models.CharField(choices=[('NEW', 'New'), ('DUPLICATE', 'Duplicate'), ('ERROR', 'Error'), ('COMMITTED', 'Committed')], default='NEW', max_length=9)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('account', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='finance.account')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='finance.category')),
+                ('statement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='finance.statementimport')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['statement', 'status', 'id'], name='staged_statement_status_idx')],
+            },
+        ),
+    ]
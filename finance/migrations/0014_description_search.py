@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:32
+
+from django.db import migrations
+
+# Frozen copy of the index definition at this migration; finance/search.py may change later
+SEARCH_TABLES = ('finance_transaction', 'finance_transfer')
+
+SQLITE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5("
+    "description, content='{table}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {table}_fts(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF description ON {table} BEGIN "
+    "INSERT INTO {table}_fts({table}_fts, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO {table}_fts(rowid, description) VALUES (new.id, new.description); END",
+    "INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS {table}_fts_ai",
+    "DROP TRIGGER IF EXISTS {table}_fts_ad",
+    "DROP TRIGGER IF EXISTS {table}_fts_au",
+    "DROP TABLE IF EXISTS {table}_fts",
+]
+
+POSTGRES_INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS {table}_description_fts ON {table} "
+    "USING gin (to_tsvector('simple', coalesce(description, '')))",
+]
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS {table}_description_fts",
+]
+
+
+def _run(schema_editor, statements):
+    for table in SEARCH_TABLES:
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement.format(table=table))
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_INDEX_SQL, 'postgresql': POSTGRES_INDEX_SQL})
+
+
+def remove_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP_SQL, 'postgresql': POSTGRES_DROP_SQL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0013_statement_import'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-17 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def rename_duplicate_categories(apps, schema_editor):
+    """Renames repeated (owner, name, type) categories to "<name> (2)", "<name> (3)", ..."""
+    Category = apps.get_model('finance', 'Category')
+    duplicates = (
+        Category.objects.order_by().values('owner_id', 'name', 'type')
+        .annotate(count=Count('id')).filter(count__gt=1)
+    )
+    for group in duplicates:
+        taken = set(Category.objects.filter(owner_id=group['owner_id'], type=group['type'])
+                    .values_list('name', flat=True))
+        repeated = Category.objects.filter(owner_id=group['owner_id'],
+                                           name=group['name'], type=group['type']).order_by('id')[1:]
+        suffix = 2
+        for category in repeated:
+            while True:
+                name = f"{group['name'][:90]} ({suffix})"
+                suffix += 1
+                if name not in taken:
+                    break
+            taken.add(name)
+            category.name = name
+            category.save(update_fields=['name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0015_changewatermark'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_categories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('owner', 'name', 'type'), name='category_unique_owner_name_type'),
+        ),
+        # auth.User has no index on email; registration checks it on every signup
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS finance_auth_user_email_idx ON auth_user (email)',
+            'DROP INDEX IF EXISTS finance_auth_user_email_idx',
+        ),
+    ]
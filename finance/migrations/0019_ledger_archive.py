@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0018_recurring_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarryForward',
+            fields=[
+                ('account', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='carry_forward', serialize=False, to='finance.account')),
+                ('cutoff', models.DateField(help_text='Archived rows are dated before this day')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0, help_text='Archived transactions and transfers')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTransaction',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('date', models.DateField()),
+                ('description', models.TextField(blank=True)),
+                ('occurrence_date', models.DateField(blank=True, null=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='finance.account')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='finance.category')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('recurring_rule', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_transactions', to='finance.recurringrule')),
+            ],
+            options={
+                'ordering': ['-date', '-id'],
+                'indexes': [models.Index(fields=['owner', 'date', 'id'], name='archived_tx_owner_date_idx'), models.Index(fields=['account', 'date'], name='archived_tx_account_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTransfer',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('date', models.DateField()),
+                ('description', models.CharField(blank=True, max_length=255, null=True)),
+                ('from_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transfers_from', to='finance.account')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transfers', to=settings.AUTH_USER_MODEL)),
+                ('to_account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transfers_to', to='finance.account')),
+            ],
+            options={
+                'ordering': ['-date', '-id'],
+                'indexes': [models.Index(fields=['owner', 'date', 'id'], name='archived_tr_owner_date_idx'), models.Index(fields=['from_account', 'date'], name='archived_tr_from_date_idx'), models.Index(fields=['to_account', 'date'], name='archived_tr_to_date_idx')],
+            },
+        ),
+    ]
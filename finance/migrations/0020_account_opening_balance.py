@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+_money = DecimalField(max_digits=14, decimal_places=2)
+_zero = Value(Decimal('0.00'), output_field=_money)
+
+
+def _account_sum(queryset, account_field, expression):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{account_field: OuterRef('pk')}).order_by()
+            .values(account_field).annotate(total=Sum(expression)).values('total'),
+            output_field=_money,
+        ),
+        _zero,
+        output_field=_money,
+    )
+
+
+def populate_opening_balances(apps, schema_editor):
+    """
+    Balances have always been writable through the API, so the part of each
+    balance the ledger does not explain becomes its opening balance.
+    """
+    Account = apps.get_model('finance', 'Account')
+    Transaction = apps.get_model('finance', 'Transaction')
+    Transfer = apps.get_model('finance', 'Transfer')
+    effect = Case(
+        When(category__type='INCOME', then=F('amount')),
+        When(category__type='EXPENSE', then=-F('amount')),
+        default=_zero,
+        output_field=_money,
+    )
+    accounts = Account.objects.order_by('pk').annotate(
+        transactions_total=_account_sum(Transaction.objects.all(), 'account', effect),
+        transfers_in=_account_sum(Transfer.objects.all(), 'to_account', 'amount'),
+        transfers_out=_account_sum(Transfer.objects.all(), 'from_account', 'amount'),
+        carried=Coalesce('carry_forward__amount', _zero, output_field=_money),
+    )
+    changed = []
+    for account in accounts.iterator(chunk_size=500):
+        ledger = account.carried + account.transactions_total + account.transfers_in - account.transfers_out
+        account.opening_balance = (account.balance - ledger).quantize(Decimal('0.01'))
+        if account.opening_balance:
+            changed.append(account)
+    Account.objects.bulk_update(changed, ['opening_balance'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0019_ledger_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='opening_balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(populate_opening_balances, migrations.RunPython.noop),
+    ]
@@ -2,11 +2,36 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
-class Account(models.Model):
+class LoadedStateMixin:
+    """
+    Remembers the field values an instance was loaded with.
+
+    Lets the ledger signals compute the previous effect of an edited
+    transaction/transfer (or the previous balance of an account) without
+    re-reading the row before saving.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if value is not models.DEFERRED
+        }
+        return instance
+
+    def remember_loaded_state(self):
+        """Marks the current field values as the persisted state (after a save)."""
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+
+class Account(LoadedStateMixin, models.Model):
     """Represents a financial account owned by a user."""
     
     name = models.CharField(max_length=100)
     balance = models.DecimalField(max_digits=10, decimal_places=2)
+    # Part of the balance the ledger does not explain: the initial balance plus direct edits (see finance/signals.py)
+    opening_balance = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -34,46 +59,49 @@ class Category(models.Model):
     class Meta:
         ordering = ['name']
         verbose_name_plural = "categories"
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'name', 'type'], name='category_unique_owner_name_type'),
+        ]
+
+    DEFAULT_CATEGORIES = [
+        # Income
+        ("Salary", "INCOME"),
+        ("Investments", "INCOME"),
+        ("Gifts", "INCOME"),
+        ("Deposits", "INCOME"),
+
+        # Expense
+        ("Food", "EXPENSE"),
+        ("Housing", "EXPENSE"),
+        ("Utilities", "EXPENSE"),
+        ("Transportation", "EXPENSE"),
+        ("Health", "EXPENSE"),
+        ("Entertainment", "EXPENSE"),
+        ("Education", "EXPENSE"),
+        ("Debt Payments", "EXPENSE"),
+
+        # Special
+        ("Initial Balance (+)", "INCOME"),
+        ("Initial Balance (-)", "EXPENSE"),
+        ("Balance Adjustment (+)", "INCOME"),
+        ("Balance Adjustment (-)", "EXPENSE"),
+    ]
 
     @classmethod
     def create_default_categories(cls, user):
         """
         Creates default categories for a specific user.
-        """
-        default_categories = [
-            # Income
-            ("Salary", "INCOME"),
-            ("Investments", "INCOME"),
-            ("Gifts", "INCOME"),
-            ("Deposits", "INCOME"),
-
-            # Expense
-            ("Food", "EXPENSE"),
-            ("Housing", "EXPENSE"),
-            ("Utilities", "EXPENSE"),
-            ("Transportation", "EXPENSE"),
-            ("Health", "EXPENSE"),
-            ("Entertainment", "EXPENSE"),
-            ("Education", "EXPENSE"),
-            ("Debt Payments", "EXPENSE"),
-
-            # Special
-            ("Initial Balance (+)", "INCOME"),
-            ("Initial Balance (-)", "EXPENSE"),
-            ("Balance Adjustment (+)", "INCOME"),
-            ("Balance Adjustment (-)", "EXPENSE"),
-        ]
-
-        for name, cat_type in default_categories:
-            cls.objects.get_or_create(
-                name=name,
-                type=cat_type,
-                owner=user
-            )
 
+        Uses a single INSERT; categories the user already has are skipped
+        through the (owner, name, type) unique constraint.
+        """
+        cls.objects.bulk_create(
+            [cls(name=name, type=cat_type, owner=user) for name, cat_type in cls.DEFAULT_CATEGORIES],
+            ignore_conflicts=True,
+        )
 
 
-class Transaction(models.Model):
+class Transaction(LoadedStateMixin, models.Model):
     """Represents a financial transaction linked to an account and category."""
     
     account = models.ForeignKey(Account, on_delete=models.CASCADE)
@@ -82,15 +110,36 @@ class Transaction(models.Model):
     date = models.DateField()
     description = models.TextField(blank=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Set on rows materialized from a recurring rule (see finance/recurring.py); indexed by
+    # the transaction_unique_occurrence constraint, which leaves the other rows out
+    recurring_rule = models.ForeignKey(
+        'RecurringRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions',
+        db_index=False,
+    )
+    occurrence_date = models.DateField(null=True, blank=True, help_text="Scheduled date of the occurrence")
 
     def __str__(self):
         return f"{self.date}: {self.amount} ({self.category})"
 
     class Meta:
-        ordering = ['-date']
+        ordering = ['-date', '-id']
+        indexes = [
+            # Keyset pagination: bounded range scans over a user's ledger
+            models.Index(fields=['owner', 'date', 'id'], name='transaction_owner_date_idx'),
+            # Balance history: partial-month aggregation per account
+            models.Index(fields=['account', 'date'], name='transaction_account_date_idx'),
+        ]
+        constraints = [
+            # Materializing a rule twice must not duplicate an occurrence
+            models.UniqueConstraint(
+                fields=['recurring_rule', 'occurrence_date'],
+                condition=models.Q(recurring_rule__isnull=False),
+                name='transaction_unique_occurrence',
+            ),
+        ]
 
 
-class Transfer(models.Model):
+class Transfer(LoadedStateMixin, models.Model):
     """Represents a money transfer between two accounts."""
     
     amount = models.DecimalField(max_digits=12, decimal_places=2)
@@ -117,4 +166,321 @@ class Transfer(models.Model):
         return f"{self.from_account} -> {self.to_account}: {self.amount}"
 
     class Meta:
-        ordering = ['-date']
\ No newline at end of file
+        ordering = ['-date', '-id']
+        indexes = [
+            # Keyset pagination: bounded range scans over a user's transfers
+            models.Index(fields=['owner', 'date', 'id'], name='transfer_owner_date_idx'),
+            # Balance history: partial-month aggregation per account
+            models.Index(fields=['from_account', 'date'], name='transfer_from_date_idx'),
+            models.Index(fields=['to_account', 'date'], name='transfer_to_date_idx'),
+        ]
+
+
+class ArchivedTransaction(models.Model):
+    """
+    A transaction moved out of ``Transaction`` by the archiver (see
+    finance/archive.py), with the same columns and primary key.
+
+    Archived rows are read-only: their balance effect is recorded in the
+    account's CarryForward and they stay counted in the monthly rollup and
+    budget counters, so moving them changes no balance or report.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    date = models.DateField()
+    description = models.TextField(blank=True)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    recurring_rule = models.ForeignKey(
+        'RecurringRule', on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_transactions',
+        db_index=False,
+    )
+    occurrence_date = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.date}: {self.amount} ({self.category}, archived)"
+
+    class Meta:
+        ordering = ['-date', '-id']
+        indexes = [
+            # ?include_archived=1: same keyset scans as the hot table
+            models.Index(fields=['owner', 'date', 'id'], name='archived_tx_owner_date_idx'),
+            # Balance history before the cutoff
+            models.Index(fields=['account', 'date'], name='archived_tx_account_date_idx'),
+        ]
+
+
+class ArchivedTransfer(models.Model):
+    """A transfer moved out of ``Transfer`` by the archiver, see ArchivedTransaction."""
+
+    id = models.BigIntegerField(primary_key=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    date = models.DateField()
+    description = models.CharField(max_length=255, blank=True, null=True)
+    from_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='archived_transfers_from')
+    to_account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='archived_transfers_to')
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_transfers')
+
+    def __str__(self):
+        return f"{self.from_account} -> {self.to_account}: {self.amount} (archived)"
+
+    class Meta:
+        ordering = ['-date', '-id']
+        indexes = [
+            models.Index(fields=['owner', 'date', 'id'], name='archived_tr_owner_date_idx'),
+            models.Index(fields=['from_account', 'date'], name='archived_tr_from_date_idx'),
+            models.Index(fields=['to_account', 'date'], name='archived_tr_to_date_idx'),
+        ]
+
+
+class CarryForward(models.Model):
+    """
+    Balance effect of an account's archived transactions and transfers.
+
+    Every archived row is dated before ``cutoff``, so the account's ledger
+    is ``amount`` plus its hot rows: balance checks and history after the
+    cutoff never read the archive tables.
+    """
+
+    account = models.OneToOneField(Account, on_delete=models.CASCADE, primary_key=True, related_name='carry_forward')
+    cutoff = models.DateField(help_text="Archived rows are dated before this day")
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0, help_text="Archived transactions and transfers")
+
+    def __str__(self):
+        return f"{self.account_id} before {self.cutoff}: {self.amount}"
+
+
+
+class MonthlyCategoryTotal(models.Model):
+    """
+    Pre-aggregated transaction totals per account, category and month.
+
+    Maintained incrementally by the Transaction signals (see finance/rollups.py)
+    so monthly reports never scan the ledger.
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True)
+    month = models.DateField(help_text="First day of the month")
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.category}: {self.total}"
+
+    class Meta:
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['account', 'category', 'month'],
+                name='monthly_total_unique_key',
+            ),
+            # NULLs are distinct in unique constraints, so uncategorized rows need their own
+            models.UniqueConstraint(
+                fields=['account', 'month'],
+                condition=models.Q(category__isnull=True),
+                name='monthly_total_unique_uncategorized',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'month'], name='monthly_total_owner_month_idx'),
+        ]
+
+
+
+class BalanceCheckpoint(models.Model):
+    """
+    Sum of an account's ledger effects dated before ``month``.
+
+    Checkpoints exist at month boundaries so that a historical balance only
+    needs the ledger rows of a partial month (see finance/checkpoints.py).
+    They are deleted when back-dated changes make them stale and rebuilt on
+    demand or by the ``build_balance_checkpoints`` command.
+    """
+
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='checkpoints')
+    month = models.DateField(help_text="First day of the month")
+    ledger_total = models.DecimalField(max_digits=14, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.account_id} @ {self.month}: {self.ledger_total}"
+
+    class Meta:
+        ordering = ['account', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'month'], name='checkpoint_unique_account_month'),
+        ]
+
+
+class Budget(models.Model):
+    """
+    Monthly spending limit for a category.
+
+    Consumption is tracked per month in BudgetPeriod, kept current by the
+    Transaction signals (see finance/budgets.py).
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='budgets')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='budgets')
+    amount = models.DecimalField(max_digits=12, decimal_places=2, help_text="Monthly limit")
+
+    def __str__(self):
+        return f"{self.category}: {self.amount}/month"
+
+    class Meta:
+        ordering = ['category__name']
+        constraints = [
+            models.UniqueConstraint(fields=['category'], name='budget_unique_category'),
+        ]
+
+
+class BudgetPeriod(models.Model):
+    """
+    Amount spent (and number of transactions) against a budget in one month.
+    """
+
+    budget = models.ForeignKey(Budget, on_delete=models.CASCADE, related_name='periods')
+    month = models.DateField(help_text="First day of the month")
+    spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.budget_id} @ {self.month:%Y-%m}: {self.spent}"
+
+    class Meta:
+        ordering = ['budget', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['budget', 'month'], name='budget_period_unique_month'),
+        ]
+
+
+class RecurringRule(models.Model):
+    """
+    A transaction repeated on a schedule (rent, salary, subscriptions).
+
+    Occurrences are written to the ledger in bulk by the
+    ``materialize_recurring`` command; ``next_date`` is the first occurrence
+    not materialized yet and is null once the rule has ended.
+    """
+
+    FREQUENCY_CHOICES = [
+        ('DAILY', 'Daily'),
+        ('WEEKLY', 'Weekly'),
+        ('MONTHLY', 'Monthly'),
+        ('YEARLY', 'Yearly'),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recurring_rules')
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='recurring_rules')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='recurring_rules')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    description = models.TextField(blank=True)
+    frequency = models.CharField(max_length=7, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1, help_text="Repeat every N periods")
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True, help_text="Last day an occurrence may fall on")
+    next_date = models.DateField(null=True, blank=True, help_text="First occurrence not materialized yet")
+    active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.description or self.category}: {self.amount} every {self.interval} {self.frequency.lower()}"
+
+    class Meta:
+        ordering = ['next_date', 'id']
+        indexes = [
+            # Scheduler scan: active rules that are due
+            models.Index(fields=['next_date', 'id'], condition=models.Q(active=True), name='recurring_rule_due_idx'),
+        ]
+
+
+class StatementImport(models.Model):
+    """
+    A bank statement file being imported (see finance/imports.py).
+
+    Rows are parsed into StagedTransaction, matched and de-duplicated, then
+    committed to the ledger in chunks; the counters report progress.
+    """
+
+    FORMAT_CHOICES = [
+        ('CSV', 'CSV'),
+        ('OFX', 'OFX'),
+    ]
+    STATUS_CHOICES = [
+        ('PARSED', 'Parsed'),
+        ('COMMITTING', 'Committing'),
+        ('COMMITTED', 'Committed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='statement_imports')
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='statement_imports')
+    income_category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    expense_category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    file_name = models.CharField(max_length=255, blank=True)
+    format = models.CharField(max_length=3, choices=FORMAT_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PARSED')
+    total_rows = models.PositiveIntegerField(default=0)
+    accepted_rows = models.PositiveIntegerField(default=0)
+    duplicate_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    committed_rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+
+
+class StagedTransaction(models.Model):
+    """A parsed statement row waiting to be committed as a Transaction."""
+
+    STATUS_CHOICES = [
+        ('NEW', 'New'),
+        ('DUPLICATE', 'Duplicate'),
+        ('ERROR', 'Error'),
+        ('COMMITTED', 'Committed'),
+    ]
+
+    statement = models.ForeignKey(StatementImport, on_delete=models.CASCADE, related_name='rows')
+    row_number = models.PositiveIntegerField()
+    date = models.DateField(null=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, help_text="Signed amount as in the file")
+    description = models.TextField(blank=True)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, null=True, related_name='+')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='+')
+    content_hash = models.CharField(max_length=40, blank=True)
+    status = models.CharField(max_length=9, choices=STATUS_CHOICES, default='NEW')
+    error = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return f"#{self.row_number} {self.date}: {self.amount} ({self.status})"
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['statement', 'status', 'id'], name='staged_statement_status_idx'),
+        ]
+
+
+class ChangeWatermark(models.Model):
+    """
+    Per-user change counter bumped by every write to the user's accounts,
+    categories, transactions and transfers (see finance/watermarks.py).
+
+    Backs the ETag/Last-Modified headers of the API so conditional GETs are
+    answered from this single row.
+    """
+
+    owner = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='change_watermark')
+    version = models.BigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.owner_id} v{self.version} ({self.modified_at})"
@@ -0,0 +1,197 @@
+# finance/pagination.py
+import heapq
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from itertools import islice
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+KeysetCursor = namedtuple('KeysetCursor', ['value', 'pk', 'reverse'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over ``(<ordering field>, id)``.
+
+    Unlike DRF's ``CursorPagination``, which stores one field plus an offset,
+    the cursor holds the full composite key of the boundary row, so each page
+    is a bounded range scan on an ``(owner, date, id)`` index:
+
+        WHERE owner_id = %s AND (date < %s OR (date = %s AND id < %s))
+        ORDER BY date DESC, id DESC LIMIT page_size + 1
+
+    No ``COUNT(*)`` is issued and pages stay stable when rows are inserted
+    concurrently.
+    """
+
+    ordering = ('-date', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset()`` for async views: the page is read with ``aiterator()``."""
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset.aiterator()])
+
+    def paginate_union(self, querysets, request, view=None):
+        """
+        Paginates the union of ``querysets`` (same fields, disjoint ids): each
+        one is read up to the page size plus one row and the sorted results
+        are merged, so every table still gets a bounded range scan.
+        """
+        pages = [self.page_queryset(queryset, request, view) for queryset in querysets]
+        if pages[0] is None:
+            return None
+        ordering = self.keyset_ordering
+        if self.reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        fields = [field.lstrip('-') for field in ordering]
+
+        def key(row):
+            if isinstance(row, dict):
+                return tuple(row[field] for field in fields)
+            return tuple(getattr(row, field) for field in fields)
+
+        rows = heapq.merge(*pages, key=key, reverse=ordering[0].startswith('-'))
+        return self.set_page(list(islice(rows, self.page_size + 1)))
+
+    def page_queryset(self, queryset, request, view=None):
+        """Returns the (unevaluated) query of the requested page plus one row, or None."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.keyset_ordering = self.get_keyset_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor.reverse if self.cursor else False
+        if self.cursor is not None:
+            self.cursor = self._clean_cursor(queryset.model, self.cursor)
+
+        ordering = self.keyset_ordering
+        if self.reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, self.cursor))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        """Builds the page and its links from the rows of ``page_queryset()``."""
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        if self.reverse:
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """
+        Returns ``(<field>, <id tie-breaker>)`` with both keys sorted in the
+        same direction, honoring an ``OrderingFilter`` on the view.
+        """
+        primary = self.get_ordering(request, queryset, view)[0]
+        if primary.lstrip('-') in ('id', 'pk'):
+            return (primary,)
+        tie_breaker = '-id' if primary.startswith('-') else 'id'
+        return (primary, tie_breaker)
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def _clean_cursor(self, model, cursor):
+        """Converts the cursor value to the ordering field's Python type."""
+        if len(self.keyset_ordering) == 1:
+            return cursor
+        field = model._meta.get_field(self.keyset_ordering[0].lstrip('-'))
+        try:
+            return cursor._replace(value=field.to_python(cursor.value))
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _seek_lookup(field):
+        return 'lt' if field.startswith('-') else 'gt'
+
+    def _seek_filter(self, ordering, cursor):
+        """Builds the row-value comparison ``(field, id) < (value, pk)``."""
+        if len(ordering) == 1:
+            return Q(**{f'id__{self._seek_lookup(ordering[0])}': cursor.pk})
+        field = ordering[0].lstrip('-')
+        return (
+            Q(**{f'{field}__{self._seek_lookup(ordering[0])}': cursor.value})
+            | Q(**{field: cursor.value, f'id__{self._seek_lookup(ordering[1])}': cursor.pk})
+        )
+
+    def _cursor_for(self, instance, reverse):
+        field = self.keyset_ordering[0].lstrip('-')
+        value = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+        pk = instance['id'] if isinstance(instance, dict) else instance.pk
+        return KeysetCursor(value=str(value), pk=pk, reverse=reverse)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._cursor_for(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._cursor_for(self.page[0], reverse=True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            value = tokens['v'][0]
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(value=value, pk=pk, reverse=reverse)
+
+    def encode_cursor(self, cursor):
+        tokens = {'v': cursor.value, 'i': str(cursor.pk)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class StagedRowPagination(KeysetPagination):
+    """Keyset pagination of staged import rows in file order."""
+
+    ordering = ('id',)
+    page_size = 100
+    max_page_size = 1000
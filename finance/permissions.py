@@ -4,7 +4,10 @@ from rest_framework import permissions
 class IsOwner(permissions.BasePermission):
     """
     Allows access only to the owner of the object.
+
+    Compares ``owner_id`` so the owner row is never loaded.
     """
 
     def has_object_permission(self, request, view, obj):
-        return hasattr(obj, 'owner') and obj.owner == request.user
+        owner_id = getattr(obj, 'owner_id', None)
+        return owner_id is not None and owner_id == request.user.pk
@@ -0,0 +1,116 @@
+# finance/reconcile.py
+from collections import namedtuple
+from decimal import Decimal
+
+import django
+from django.db import connections
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .balances import apply_balance_deltas
+from .checkpoints import _transaction_effect
+from .models import Account, Transaction, Transfer
+from .watermarks import touch_owners
+
+# Users reconciled per aggregate query (and per worker task)
+RECONCILE_BATCH_SIZE = 500
+
+Drift = namedtuple('Drift', ['account_id', 'owner_id', 'stored', 'expected'])
+
+_money = DecimalField(max_digits=14, decimal_places=2)
+_zero = Value(Decimal('0.00'), output_field=_money)
+_cent = Decimal('0.01')
+
+
+def _account_sum(queryset, account_field, expression):
+    """Correlated ``SUM(expression)`` of ``queryset`` rows pointing at the outer account."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{account_field: OuterRef('pk')}).order_by()
+            .values(account_field).annotate(total=Sum(expression)).values('total'),
+            output_field=_money,
+        ),
+        _zero,
+        output_field=_money,
+    )
+
+
+def ledger_balances(owner_ids):
+    """
+    Returns ``[(account_id, owner_id, stored balance, ledger total), ...]``
+    for the accounts of ``owner_ids``, computed in a single query.
+
+    The ledger total is what the balance signals should have produced: the
+    opening balance, plus income minus expenses (uncategorized transactions
+    have no effect), plus incoming minus outgoing transfers, plus the
+    carry-forward of archived rows (the archive tables are not read). The stored balance is read in
+    the same statement, so both sides come from one snapshot.
+    """
+    accounts = Account.objects.filter(owner_id__in=owner_ids).order_by('pk').annotate(
+        transactions_total=_account_sum(Transaction.objects.all(), 'account', _transaction_effect()),
+        transfers_in=_account_sum(Transfer.objects.all(), 'to_account', 'amount'),
+        transfers_out=_account_sum(Transfer.objects.all(), 'from_account', 'amount'),
+        carried=Coalesce('carry_forward__amount', _zero, output_field=_money),
+    )
+    rows = accounts.values_list(
+        'pk', 'owner_id', 'balance', 'opening_balance', 'carried', 'transactions_total', 'transfers_in',
+        'transfers_out',
+    )
+    return [
+        (pk, owner_id, balance, (opening + carried + transactions_total + transfers_in - transfers_out).quantize(_cent))
+        for pk, owner_id, balance, opening, carried, transactions_total, transfers_in, transfers_out in rows
+    ]
+
+
+def reconcile_owners(owner_ids, fix=False):
+    """
+    Finds (and optionally corrects) accounts of ``owner_ids`` whose balance
+    differs from their ledger.
+
+    Corrections are applied as ``balance = balance + drift`` so writes that
+    landed after the aggregate was read are preserved.
+
+    Returns:
+        list: Drift tuples of the mismatched accounts
+    """
+    drifted = [
+        Drift(pk, owner_id, stored, expected)
+        for pk, owner_id, stored, expected in ledger_balances(owner_ids)
+        if stored != expected
+    ]
+    if fix and drifted:
+        apply_balance_deltas({drift.account_id: drift.expected - drift.stored for drift in drifted})
+        touch_owners(*(drift.owner_id for drift in drifted))
+    return drifted
+
+
+def owner_batches(owner_ids=None, batch_size=RECONCILE_BATCH_SIZE):
+    """Yields lists of user ids owning accounts, ``batch_size`` at a time."""
+    owners = Account.objects.order_by('owner_id').values_list('owner_id', flat=True).distinct()
+    if owner_ids:
+        owners = owners.filter(owner_id__in=owner_ids)
+    batch = []
+    for owner_id in owners.iterator():
+        batch.append(owner_id)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def init_worker():
+    """
+    Process pool initializer: sets Django up in spawned workers and drops
+    connections inherited from the parent, so each worker opens its own.
+    """
+    django.setup()
+    connections.close_all()
+
+
+def reconcile_task(owner_ids, fix):
+    """Worker entry point: reconciles one batch and releases the connection."""
+    try:
+        return reconcile_owners(owner_ids, fix=fix)
+    finally:
+        connections.close_all()
@@ -0,0 +1,184 @@
+# finance/recurring.py
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import Max
+
+from .balances import ledger_batch, transaction_state
+from .models import ArchivedTransaction, RecurringRule, Transaction
+
+# Rules per database transaction. Each chunk writes one balance UPDATE and one
+# checkpoint DELETE with a term per account, so it stays well below SQLite's
+# expression depth limit (1000)
+MATERIALIZE_CHUNK_SIZE = 500
+
+# Ledger rows per INSERT statement
+MATERIALIZE_BATCH_SIZE = 500
+
+
+def _add_months(day, months):
+    """Adds ``months`` to ``day``, clamping the day to the end of shorter months."""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def occurrence(rule, index):
+    """
+    Returns the ``index``-th occurrence (0-based) of the rule's schedule.
+
+    Occurrences are always computed from ``start_date``, so a rule starting
+    on the 31st falls on the last day of shorter months without drifting.
+    """
+    step = index * rule.interval
+    if rule.frequency == 'DAILY':
+        return rule.start_date + timedelta(days=step)
+    if rule.frequency == 'WEEKLY':
+        return rule.start_date + timedelta(weeks=step)
+    if rule.frequency == 'MONTHLY':
+        return _add_months(rule.start_date, step)
+    return _add_months(rule.start_date, 12 * step)
+
+
+def occurrence_index(rule, day):
+    """Returns the index of the first occurrence on or after ``day``."""
+    if day <= rule.start_date:
+        return 0
+    if rule.frequency in ('DAILY', 'WEEKLY'):
+        period = rule.interval * (7 if rule.frequency == 'WEEKLY' else 1)
+        return -(-(day - rule.start_date).days // period)
+    months = (day.year - rule.start_date.year) * 12 + day.month - rule.start_date.month
+    period = rule.interval * (12 if rule.frequency == 'YEARLY' else 1)
+    index = months // period
+    while occurrence(rule, index) < day:
+        index += 1
+    return index
+
+
+def _within(rule, day):
+    return day if rule.end_date is None or day <= rule.end_date else None
+
+
+def reschedule(rule):
+    """
+    Sets ``next_date`` after the rule was created or its schedule changed:
+    the first occurrence after the last materialized one (or from the start).
+    """
+    first = rule.start_date
+    if rule.pk is not None:
+        # Archived occurrences count too, so they are never materialized again
+        last = max(
+            (day for day in (
+                rule.transactions.aggregate(last=Max('occurrence_date'))['last'],
+                rule.archived_transactions.aggregate(last=Max('occurrence_date'))['last'],
+            ) if day is not None),
+            default=None,
+        )
+        if last is not None:
+            first = max(first, last + timedelta(days=1))
+    rule.next_date = _within(rule, occurrence(rule, occurrence_index(rule, first)))
+
+
+def due_occurrences(rule, today):
+    """
+    Returns the occurrences of ``rule`` due by ``today`` (from ``next_date``)
+    and the rule's next date afterwards.
+
+    Returns:
+        tuple: ([dates], next_date or None once the rule has ended)
+    """
+    dates = []
+    index = occurrence_index(rule, rule.next_date)
+    day = _within(rule, occurrence(rule, index))
+    while day is not None and day <= today:
+        dates.append(day)
+        index += 1
+        day = _within(rule, occurrence(rule, index))
+    return dates, day
+
+
+def _due_rules(today, after_id, chunk_size):
+    rules = (
+        RecurringRule.objects.filter(active=True, next_date__lte=today, pk__gt=after_id)
+        .select_related('category')
+        .order_by('pk')
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        # Concurrent schedulers split the rules instead of waiting on each other
+        rules = rules.select_for_update(skip_locked=True, of=('self',))
+    return list(rules[:chunk_size])
+
+
+def materialize_chunk(today, after_id=0, chunk_size=MATERIALIZE_CHUNK_SIZE):
+    """
+    Materializes the due occurrences of the next ``chunk_size`` rules with an
+    id above ``after_id`` in one database transaction.
+
+    The ledger rows are written with bulk INSERTs and their balance, rollup
+    and budget effects with one statement each (see ``ledger_batch``); the
+    rules' ``next_date`` is advanced in the same transaction. Occurrences
+    already in the ledger or its archive (e.g. after a schedule change) are
+    skipped, and the (rule, occurrence date) unique constraint rejects any
+    other duplicate.
+
+    Returns:
+        tuple: (last rule id or None when no rule is due, rules processed, transactions created)
+    """
+    with ledger_batch() as changes:
+        rules = _due_rules(today, after_id, chunk_size)
+        if not rules:
+            return None, 0, 0
+        # Archived occurrences count too: a rewound next_date must not re-create them
+        existing = set()
+        for model in (Transaction, ArchivedTransaction):
+            existing.update(
+                model.objects.filter(
+                    recurring_rule_id__in=[rule.pk for rule in rules],
+                    occurrence_date__gte=min(rule.next_date for rule in rules),
+                ).values_list('recurring_rule_id', 'occurrence_date')
+            )
+        changes.remember_categories(rule.category for rule in rules if rule.category is not None)
+
+        objs = []
+        for rule in rules:
+            dates, rule.next_date = due_occurrences(rule, today)
+            objs += [
+                Transaction(account_id=rule.account_id, category_id=rule.category_id, amount=rule.amount,
+                            date=day, description=rule.description, owner_id=rule.owner_id,
+                            recurring_rule=rule, occurrence_date=day)
+                for day in dates if (rule.pk, day) not in existing
+            ]
+
+        created = Transaction.objects.bulk_create(objs, batch_size=MATERIALIZE_BATCH_SIZE)
+        for tx in created:
+            changes.add_transaction(transaction_state(tx))
+
+        # Rules of a chunk share few next dates: one plain UPDATE per date is far
+        # cheaper than bulk_update()'s CASE over every rule
+        advanced = defaultdict(list)
+        for rule in rules:
+            advanced[rule.next_date].append(rule.pk)
+        for next_date, pks in advanced.items():
+            RecurringRule.objects.filter(pk__in=pks).update(next_date=next_date)
+    return rules[-1].pk, len(rules), len(created)
+
+
+def materialize_due(today, chunk_size=MATERIALIZE_CHUNK_SIZE):
+    """
+    Materializes every due occurrence of every active rule, chunk by chunk.
+
+    Running it again (or after an interruption) only picks up what is still
+    due, so it is safe to schedule as often as needed.
+
+    Returns:
+        tuple: (rules processed, transactions created)
+    """
+    after_id = rules = created = 0
+    while True:
+        after_id, chunk_rules, chunk_created = materialize_chunk(today, after_id, chunk_size)
+        if after_id is None:
+            return rules, created
+        rules += chunk_rules
+        created += chunk_created
@@ -0,0 +1,98 @@
+# finance/renderers.py
+import csv
+import datetime
+import decimal
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders a list of row sequences as CSV.
+
+    Export endpoints stream their rows with StreamingHttpResponse; the
+    renderer is still needed so that ``?format=csv`` is negotiated, and it
+    renders error payloads (dicts) as JSON.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            return json.dumps(data, cls=JSONEncoder).encode(self.charset)
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(data)
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders a list of objects as newline-delimited JSON (one object per line).
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            return json.dumps(data, cls=JSONEncoder).encode(self.charset)
+        return ''.join(json.dumps(row, cls=JSONEncoder) + '\n' for row in data).encode(self.charset)
+
+
+# Types the list endpoints produce, converted exactly like DRF's JSONEncoder.default would
+_FAST_DEFAULTS = {
+    datetime.date: datetime.date.isoformat,
+    decimal.Decimal: float,
+}
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer with byte-identical output that reuses one encoder per
+    settings combination.
+
+    ``json.dumps(cls=...)`` builds a new encoder for every response and
+    sends every non-JSON value through the ``isinstance`` chain of DRF's
+    ``JSONEncoder.default``; here dates and decimals are converted by an
+    exact type lookup and anything else falls back to DRF's encoder.
+    Indented output (e.g. for the browsable API) is left to JSONRenderer.
+    """
+    _encoders = {}
+    _fallback = JSONEncoder()
+
+    @classmethod
+    def _default(cls, obj):
+        convert = _FAST_DEFAULTS.get(type(obj))
+        if convert is not None:
+            return convert(obj)
+        return cls._fallback.default(obj)
+
+    def get_encoder(self):
+        key = (self.ensure_ascii, self.compact, self.strict)
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = self._encoders[key] = json.JSONEncoder(
+                ensure_ascii=self.ensure_ascii,
+                allow_nan=not self.strict,
+                separators=(',', ':') if self.compact else (', ', ': '),
+                default=self._default,
+            )
+        return encoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = self.get_encoder().encode(data)
+        # Same escaping as JSONRenderer: keep the output a strict JavaScript subset
+        ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return ret.encode()
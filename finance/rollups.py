@@ -0,0 +1,220 @@
+# finance/rollups.py
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import TruncMonth
+
+from .models import ArchivedTransaction, MonthlyCategoryTotal, Transaction
+
+_date_field = models.DateField()
+
+
+def to_date(value):
+    """Converts a date, datetime or ISO string (as found on unsaved instances) to a date."""
+    return _date_field.to_python(value)
+
+
+def month_start(value):
+    """
+    Returns the first day of the month of a date, datetime or ISO string.
+    """
+    return to_date(value).replace(day=1)
+
+
+def rollup_key(owner_id, account_id, category_id, tx_date):
+    """Builds the (owner, account, category, month) key of a rollup row."""
+    return (owner_id, account_id, category_id, month_start(tx_date))
+
+
+class RollupChanges:
+    """
+    Collects (total, count) deltas per rollup key so that several changes to
+    the same month/category are written with a single UPDATE.
+    """
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [Decimal('0.00'), 0])
+
+    def add(self, key, amount, count):
+        delta = self.deltas[key]
+        delta[0] += amount
+        delta[1] += count
+
+    def add_transaction(self, tx, sign=1):
+        key = rollup_key(tx.owner_id, tx.account_id, tx.category_id, tx.date)
+        self.add(key, sign * tx.amount, sign)
+
+    def __bool__(self):
+        return any(amount or count for amount, count in self.deltas.values())
+
+    def apply(self):
+        """Writes every collected delta with F() updates, creating missing rows."""
+        deltas = {key: delta for key, delta in self.deltas.items() if delta[0] or delta[1]}
+        self.deltas.clear()
+        if len(deltas) == 1:
+            key, (amount, count) = deltas.popitem()
+            _apply_delta(key, amount, count)
+        elif deltas:
+            _apply_many(deltas)
+
+
+def _apply_delta(key, amount, count):
+    """
+    Applies one delta: a plain F() update for removals, otherwise a single
+    INSERT ... ON CONFLICT upsert (see ``BudgetChanges.apply``).
+    """
+    owner_id, account_id, category_id, month = key
+    if count <= 0:
+        # Removals only ever touch existing rows (e.g. during cascade deletes)
+        MonthlyCategoryTotal.objects.filter(
+            account_id=account_id, category_id=category_id, month=month
+        ).update(total=F('total') + amount, count=F('count') + count)
+        return
+    table = connection.ops.quote_name(MonthlyCategoryTotal._meta.db_table)
+    # Uncategorized rows are unique through the partial constraint
+    if category_id is None:
+        target = "(account_id, month) WHERE category_id IS NULL"
+    else:
+        target = "(account_id, category_id, month)"
+    sql = (
+        f"INSERT INTO {table} (owner_id, account_id, category_id, month, total, count) "
+        f"VALUES (%s, %s, %s, %s, %s, %s) "
+        f"ON CONFLICT {target} DO UPDATE SET "
+        f"total = {table}.total + excluded.total, count = {table}.count + excluded.count"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [owner_id, account_id, category_id, month, amount, count])
+
+
+def _apply_many(deltas):
+    """
+    Applies many deltas with one SELECT, one CASE UPDATE and one INSERT.
+    """
+    existing = MonthlyCategoryTotal.objects.filter(
+        account_id__in={key[1] for key in deltas},
+        month__in={key[3] for key in deltas},
+    ).values_list('pk', 'account_id', 'category_id', 'month')
+    pks = {(account_id, category_id, month): pk for pk, account_id, category_id, month in existing}
+
+    updates = {}
+    missing = []
+    for key, (amount, count) in deltas.items():
+        pk = pks.get(key[1:])
+        if pk is not None:
+            updates[pk] = (amount, count)
+        elif count > 0:
+            missing.append((key, amount, count))
+
+    if updates:
+        MonthlyCategoryTotal.objects.filter(pk__in=updates.keys()).update(
+            total=F('total') + Case(
+                *[When(pk=pk, then=Value(amount)) for pk, (amount, _) in updates.items()],
+                default=Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2),
+            ),
+            count=F('count') + Case(
+                *[When(pk=pk, then=Value(count)) for pk, (_, count) in updates.items()],
+                default=Value(0),
+                output_field=models.IntegerField(),
+            ),
+        )
+    if missing:
+        try:
+            with transaction.atomic():
+                MonthlyCategoryTotal.objects.bulk_create([
+                    MonthlyCategoryTotal(
+                        owner_id=owner_id, account_id=account_id, category_id=category_id,
+                        month=month, total=amount, count=count,
+                    )
+                    for (owner_id, account_id, category_id, month), amount, count in missing
+                ])
+        except IntegrityError:
+            # Lost a race with a concurrent writer: fall back to per-row upserts
+            for key, amount, count in missing:
+                _apply_delta(key, amount, count)
+
+
+def fold_category(category):
+    """
+    Moves a category's rollup rows into the uncategorized bucket before the
+    category is deleted (its transactions are kept with ``category=NULL``).
+    """
+    rows = list(MonthlyCategoryTotal.objects.filter(category=category))
+    if not rows:
+        return
+    changes = RollupChanges()
+    for row in rows:
+        changes.add((row.owner_id, row.account_id, None, row.month), row.total, row.count)
+    MonthlyCategoryTotal.objects.filter(pk__in=[row.pk for row in rows]).delete()
+    changes.apply()
+
+
+def live_monthly_totals(owner_ids=None):
+    """
+    Computes the rollup straight from the ledger with a GROUP BY, archived
+    rows included (the rollup keeps counting them).
+
+    Returns:
+        dict: (owner_id, account_id, category_id, month) -> (total, count)
+    """
+    totals = {}
+    for model in (Transaction, ArchivedTransaction):
+        queryset = model.objects.all()
+        if owner_ids is not None:
+            queryset = queryset.filter(owner_id__in=owner_ids)
+        rows = (
+            queryset.annotate(month=TruncMonth('date'))
+            .order_by()
+            .values('owner_id', 'account_id', 'category_id', 'month')
+            .annotate(total=Sum('amount'), count=Count('id'))
+        )
+        for row in rows:
+            key = (row['owner_id'], row['account_id'], row['category_id'], _as_date(row['month']))
+            total, count = totals.get(key, (Decimal('0.00'), 0))
+            totals[key] = (total + row['total'], count + row['count'])
+    return totals
+
+
+def stored_monthly_totals(owner_ids=None):
+    """Returns the non-empty rollup rows keyed like ``live_monthly_totals``."""
+    queryset = MonthlyCategoryTotal.objects.exclude(count=0)
+    if owner_ids is not None:
+        queryset = queryset.filter(owner_id__in=owner_ids)
+    return {
+        (row.owner_id, row.account_id, row.category_id, row.month): (row.total, row.count)
+        for row in queryset
+    }
+
+
+def rebuild_monthly_totals(owner_ids=None):
+    """
+    Replaces the rollup with totals recomputed from the ledger.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    live = live_monthly_totals(owner_ids)
+    with transaction.atomic():
+        stale = MonthlyCategoryTotal.objects.all()
+        if owner_ids is not None:
+            stale = stale.filter(owner_id__in=owner_ids)
+        stale.delete()
+        MonthlyCategoryTotal.objects.bulk_create(
+            [
+                MonthlyCategoryTotal(
+                    owner_id=owner_id, account_id=account_id, category_id=category_id,
+                    month=month, total=total, count=count,
+                )
+                for (owner_id, account_id, category_id, month), (total, count) in live.items()
+            ],
+            batch_size=500,
+        )
+    return len(live)
+
+
+def _as_date(value):
+    # TruncMonth on a DateField returns a date, but some backends hand back datetimes
+    return value.date() if isinstance(value, datetime) else value
@@ -0,0 +1,108 @@
+# finance/routers.py
+import contextvars
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+DEFAULT_REPLICA_STICKY_SECONDS = 5
+
+# Database the finance models are read from in the current request (None: the primary)
+_read_database = contextvars.ContextVar('finance_read_database', default=None)
+
+
+def replica_database():
+    """Alias of the read replica, or None when there is none."""
+    return getattr(settings, 'REPLICA_DATABASE', None)
+
+
+def replica_sticky_seconds():
+    """Seconds an owner's reads stay on the primary after one of their writes."""
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', DEFAULT_REPLICA_STICKY_SECONDS)
+
+
+def _is_sticky(modified_at):
+    """
+    Whether reads must stay on the primary, given the owner's change
+    watermark on the primary (None: the owner has no watermark yet).
+
+    The watermark is a database row, so a write made by any worker moves
+    every worker's reads to the primary.
+    """
+    if modified_at is None:
+        # Not tracked yet (e.g. a user who just signed up): nothing tells how recent their writes are
+        return True
+    return modified_at > timezone.now() - timedelta(seconds=replica_sticky_seconds())
+
+
+def _watermark_time(owner_id):
+    # Imported here: DATABASE_ROUTERS may load this module before the app registry is ready
+    from .models import ChangeWatermark
+    return (
+        ChangeWatermark.objects.using(DEFAULT_DB_ALIAS).filter(owner_id=owner_id)
+        .values_list('modified_at', flat=True)
+    )
+
+
+def read_database(owner_id):
+    """
+    Returns the alias the owner's reads can go to: the replica, or None (the
+    primary) within ``REPLICA_STICKY_SECONDS`` of their last write.
+    """
+    replica = replica_database()
+    if replica is None or _is_sticky(_watermark_time(owner_id).first()):
+        return None
+    return replica
+
+
+async def aread_database(owner_id):
+    """``read_database()`` for async views."""
+    replica = replica_database()
+    if replica is None or _is_sticky(await _watermark_time(owner_id).afirst()):
+        return None
+    return replica
+
+
+@contextmanager
+def reads_from(alias):
+    """Reads the finance models from ``alias`` (None: the primary) inside the block."""
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def use_database(alias):
+    """Reads the finance models from ``alias`` until the enclosing ``reads_from()`` block ends."""
+    _read_database.set(alias)
+
+
+class ReplicaRouter:
+    """
+    Sends the finance models' reads to the database chosen for the current
+    request (see ReplicaReadMixin) and every write to the primary.
+
+    Other apps (users, sessions, tokens) always use the primary, so a user
+    registered a moment ago can authenticate before the replica has them.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'finance':
+            return _read_database.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Instances read from the replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_database():
+            return False
+        return None
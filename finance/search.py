@@ -0,0 +1,160 @@
+# finance/search.py
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+# Tables whose ``description`` column has a full-text index
+SEARCH_TABLES = ('finance_transaction', 'finance_transfer')
+# Words of a search string that are used (each one as a prefix)
+MAX_SEARCH_TERMS = 8
+
+# SQLite: external-content FTS5 table over the description, kept in sync by triggers
+SQLITE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+    "description, content='{table}', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+    "INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+    "INSERT INTO {fts}({fts}, rowid, description) VALUES ('delete', old.id, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF description ON {table} BEGIN "
+    "INSERT INTO {fts}({fts}, rowid, description) VALUES ('delete', old.id, old.description); "
+    "INSERT INTO {fts}(rowid, description) VALUES (new.id, new.description); END",
+]
+SQLITE_TRIGGERS = ('ai', 'ad', 'au')
+
+# PostgreSQL: GIN expression index matched by the queries below
+POSTGRES_VECTOR = "to_tsvector('simple', coalesce({column}, ''))"
+POSTGRES_INDEX_SQL = "CREATE INDEX IF NOT EXISTS {table}_description_fts ON {table} USING gin ({vector})"
+
+
+def _fts(table):
+    return f'{table}_fts'
+
+
+def search_tokens(text):
+    """Splits a search string into lowercase word tokens."""
+    return re.findall(r'\w+', text.lower())[:MAX_SEARCH_TERMS]
+
+
+def supports_full_text(connection):
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def install_search_index(connection, rebuild=True):
+    """
+    Creates the full-text index of every search table (idempotent).
+
+    Args:
+        rebuild (bool): Re-populate the SQLite FTS5 tables from their content tables
+    """
+    with connection.cursor() as cursor:
+        for table in SEARCH_TABLES:
+            if connection.vendor == 'sqlite':
+                for statement in SQLITE_INDEX_SQL:
+                    cursor.execute(statement.format(table=table, fts=_fts(table)))
+                if rebuild:
+                    cursor.execute(f"INSERT INTO {_fts(table)}({_fts(table)}) VALUES ('rebuild')")
+            elif connection.vendor == 'postgresql':
+                vector = POSTGRES_VECTOR.format(column='description')
+                cursor.execute(POSTGRES_INDEX_SQL.format(table=table, vector=vector))
+
+
+def ensure_search_index(using='default', **kwargs):
+    """
+    post_migrate handler restoring the SQLite sync triggers.
+
+    SQLite migrations that alter a table rebuild it, which silently drops
+    its triggers; when that happened the index is re-created and re-populated.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+    if not all(_fts(table) in existing for table in SEARCH_TABLES):
+        # Search migration not applied (yet)
+        return
+    expected = {f'{_fts(table)}_{suffix}' for table in SEARCH_TABLES for suffix in SQLITE_TRIGGERS}
+    if not expected <= existing:
+        install_search_index(connection)
+
+
+def _match_expression(connection, table, tokens):
+    """Returns ``(sql, params)`` of a boolean full-text match on ``table``."""
+    if connection.vendor == 'sqlite':
+        query = ' '.join(f'"{token}"*' for token in tokens)
+        return f'"{table}"."id" IN (SELECT rowid FROM {_fts(table)} WHERE {_fts(table)} MATCH %s)', [query]
+    vector = POSTGRES_VECTOR.format(column=f'"{table}"."description"')
+    query = ' & '.join(f'{token}:*' for token in tokens)
+    return f"{vector} @@ to_tsquery('simple', %s)", [query]
+
+
+def full_text_filter(queryset, tokens):
+    """
+    Restricts ``queryset`` to rows whose description contains every token
+    as a word prefix, using the full-text index.
+    """
+    sql, params = _match_expression(connections[queryset.db], queryset.model._meta.db_table, tokens)
+    return queryset.filter(RawSQL(sql, params, output_field=BooleanField()))
+
+
+def ranked_search(queryset, tokens, limit):
+    """
+    Returns up to ``limit`` rows of ``queryset`` matching ``tokens``, best match first.
+
+    SQLite ranks inside FTS5 (bm25) over the ids of the filtered queryset;
+    PostgreSQL ranks with ``ts_rank``. Other databases fall back to a
+    case-insensitive substring match ordered by date.
+    """
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if not supports_full_text(connection):
+        for token in tokens:
+            queryset = queryset.filter(description__icontains=token)
+        return list(queryset.order_by('-date', '-id')[:limit])
+
+    if connection.vendor == 'sqlite':
+        inner_sql, inner_params = queryset.order_by().values('pk').query.sql_with_params()
+        query = ' '.join(f'"{token}"*' for token in tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {_fts(table)} WHERE {_fts(table)} MATCH %s "
+                f"AND +rowid IN ({inner_sql}) ORDER BY rank LIMIT %s",
+                [query, *inner_params, limit],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        found = queryset.in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found]
+
+    vector = POSTGRES_VECTOR.format(column=f'"{table}"."description"')
+    rank = RawSQL(
+        f"ts_rank({vector}, to_tsquery('simple', %s))",
+        [' & '.join(f'{token}:*' for token in tokens)],
+        output_field=FloatField(),
+    )
+    matches = full_text_filter(queryset, tokens).annotate(search_rank=rank)
+    return list(matches.order_by('-search_rank', '-date', '-id')[:limit])
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ``?search=`` backed by the description full-text index.
+
+    Every word is matched as a prefix ("gro mar" finds "Groceries at the
+    market"). Falls back to DRF's ``icontains`` search on databases without
+    a full-text index and on tables it does not cover (the archive).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if (queryset.model._meta.db_table not in SEARCH_TABLES
+                or not supports_full_text(connections[queryset.db])):
+            return super().filter_queryset(request, queryset, view)
+        tokens = search_tokens(' '.join(self.get_search_terms(request)))
+        if not tokens:
+            return queryset
+        return full_text_filter(queryset, tokens)
@@ -1,8 +1,16 @@
 # finance/serializers.py
 from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import Account, Category, Transaction, Transfer
+from .models import Account, Budget, Category, RecurringRule, Transaction, Transfer, StatementImport, StagedTransaction
+from .balances import ledger_batch, transaction_state, transfer_state
+from .checkpoints import MAX_SERIES_DAYS
+
+# Maximum number of rows accepted by a single bulk request
+BULK_MAX_ITEMS = 5000
+# Rows per INSERT statement when bulk creating
+BULK_BATCH_SIZE = 500
 
 # ---------- User ----------
 class UserSerializer(serializers.ModelSerializer):
@@ -65,24 +73,424 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'type', 'owner']
 
 
+# ---------- Related fields ----------
+class LookupPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves ids from a preloaded ``{id: instance}`` map
+    stored in the serializer context under ``lookup_key``.
+
+    The owner viewsets load the user's accounts/categories once per request
+    (see finance/lookups.py), so every row and every related field is
+    validated against that map and foreign ids are rejected; without it the
+    field falls back to a queryset lookup limited to the requesting user.
+    """
+
+    def __init__(self, lookup_key, **kwargs):
+        self.lookup_key = lookup_key
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            queryset = queryset.filter(owner=request.user)
+        return queryset
+
+    def to_internal_value(self, data):
+        lookup = self.context.get(self.lookup_key)
+        if lookup is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            obj = lookup.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
 # ---------- Transaction ----------
+class TransactionListSerializer(serializers.ListSerializer):
+    """
+    Creates many transactions with one INSERT per batch and a single
+    balance UPDATE for all affected accounts.
+    """
+
+    def create(self, validated_data):
+        objs = [Transaction(**item) for item in validated_data]
+        with ledger_batch() as changes:
+            created = Transaction.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+            for tx in created:
+                changes.add_transaction(transaction_state(tx), instance=tx)
+        return created
+
+
 class TransactionSerializer(serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    account = serializers.PrimaryKeyRelatedField(queryset=Account.objects.all())
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True)
+    account = LookupPrimaryKeyRelatedField('accounts_by_id', queryset=Account.objects.all())
+    category = LookupPrimaryKeyRelatedField('categories_by_id', queryset=Category.objects.all(), allow_null=True)
 
     class Meta:
         model = Transaction
         fields = ['id', 'account', 'category', 'amount', 'date', 'description', 'owner']
+        list_serializer_class = TransactionListSerializer
         # read_only_fields = ['date']
 
 # ---------- Transfer ----------
+class TransferListSerializer(serializers.ListSerializer):
+    """
+    Creates many transfers with one INSERT per batch and a single
+    balance UPDATE for all affected accounts.
+    """
+
+    def create(self, validated_data):
+        objs = [Transfer(**item) for item in validated_data]
+        with ledger_batch() as changes:
+            created = Transfer.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+            for tr in created:
+                changes.add_transfer(transfer_state(tr))
+        return created
+
+
 class TransferSerializer(serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    from_account = serializers.PrimaryKeyRelatedField(queryset=Account.objects.all())
-    to_account = serializers.PrimaryKeyRelatedField(queryset=Account.objects.all())
+    from_account = LookupPrimaryKeyRelatedField('accounts_by_id', queryset=Account.objects.all())
+    to_account = LookupPrimaryKeyRelatedField('accounts_by_id', queryset=Account.objects.all())
 
     class Meta:
         model = Transfer
         fields = ['id', 'from_account', 'to_account', 'amount', 'date', 'description', 'owner']
-        # read_only_fields = ['date']
\ No newline at end of file
+        list_serializer_class = TransferListSerializer
+        # read_only_fields = ['date']
+
+
+# ---------- Fast list path ----------
+def split_field_list(value):
+    """Parses a comma separated query parameter (``?fields=id,amount``)."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer for list responses built from ``values()`` rows.
+
+    Produces the same output as the model serializer of the resource (same
+    keys in the same order) without model instances or serializer fields:
+    foreign keys come out of ``values()`` as ids, dates are rendered as ISO
+    8601 and decimals as fixed-point strings. Decimal columns are already
+    quantized to their ``decimal_places`` by the database adapters, so no
+    re-quantizing is needed.
+
+    ``fields`` restricts the output (and the SQL projection) to a subset of
+    ``fields``; ``expand`` replaces relation ids by ``{"id": ..., <expandable
+    fields>}`` objects read through JOINs in the same query; ``extra`` names
+    columns fetched for the caller (e.g. pagination keys) but not output.
+    """
+    fields = ()
+    decimal_fields = ()
+    date_fields = ()
+    # Relation -> fields of the related object included by ?expand=
+    expandable = {}
+
+    def __init__(self, fields=None, expand=(), extra=()):
+        errors = {}
+        if fields is not None:
+            unknown = [name for name in fields if name not in self.fields]
+            if unknown or not fields:
+                errors['fields'] = [f"Choose from: {', '.join(self.fields)}."]
+        unknown = [name for name in expand if name not in self.expandable]
+        if unknown:
+            errors['expand'] = [f"Cannot expand {', '.join(unknown)}."
+                                + (f" Choose from: {', '.join(self.expandable)}." if self.expandable else "")]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        # Expanded relations are part of the output even when not listed in ?fields=
+        self.output_fields = [
+            name for name in self.fields if fields is None or name in fields or name in expand
+        ]
+        self.expanded = [
+            (name, [(sub, f'{name}__{sub}') for sub in self.expandable[name]])
+            for name in self.output_fields if name in expand
+        ]
+        self.hidden = [name for name in dict.fromkeys(extra) if name not in self.output_fields]
+        self.lookups = self.output_fields + self.hidden + [
+            lookup for _, subfields in self.expanded for _, lookup in subfields
+        ]
+
+    def serialize(self, rows):
+        """
+        Returns the output of ``values(*self.lookups)`` rows. Rows are fresh
+        dicts, so they are converted in place unless columns must be dropped.
+        """
+        rows = list(rows)
+        decimal_fields = [name for name in self.decimal_fields if name in self.output_fields]
+        date_fields = [name for name in self.date_fields if name in self.output_fields]
+        for row in rows:
+            for name in decimal_fields:
+                row[name] = format(row[name], 'f')
+            for name in date_fields:
+                row[name] = row[name].isoformat()
+            for name, subfields in self.expanded:
+                related = {'id': row[name]}
+                for sub, lookup in subfields:
+                    related[sub] = row.pop(lookup)
+                row[name] = related if related['id'] is not None else None
+        if self.hidden:
+            # The caller still reads the hidden columns from the original rows
+            output = self.output_fields
+            return [{name: row[name] for name in output} for row in rows]
+        return rows
+
+
+class AccountValuesSerializer(ValuesSerializer):
+    fields = ('id', 'name', 'balance')
+    decimal_fields = ('balance',)
+
+
+class CategoryValuesSerializer(ValuesSerializer):
+    fields = ('id', 'name', 'type')
+
+
+class TransactionValuesSerializer(ValuesSerializer):
+    fields = ('id', 'account', 'category', 'amount', 'date', 'description')
+    decimal_fields = ('amount',)
+    date_fields = ('date',)
+    expandable = {'account': ('name',), 'category': ('name', 'type')}
+
+
+class TransferValuesSerializer(ValuesSerializer):
+    fields = ('id', 'from_account', 'to_account', 'amount', 'date', 'description')
+    decimal_fields = ('amount',)
+    date_fields = ('date',)
+    expandable = {'from_account': ('name',), 'to_account': ('name',)}
+
+
+# ---------- Search ----------
+class SearchQuerySerializer(serializers.Serializer):
+    """Validates a ranked search request (``?q=&limit=``)."""
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+# ---------- Export ----------
+class ExportQuerySerializer(serializers.Serializer):
+    """Validates the optional ``from``/``to`` date range of a ledger export."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField(required=False)
+        fields['to'] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        if attrs.get('from') and attrs.get('to') and attrs['from'] > attrs['to']:
+            raise serializers.ValidationError("'from' must not be after 'to'.")
+        return attrs
+
+
+# ---------- Balance history ----------
+class BalanceHistoryQuerySerializer(serializers.Serializer):
+    """
+    Validates either a single ``at`` date or a ``from``/``to`` series request.
+    """
+    at = serializers.DateField(required=False)
+    to = serializers.DateField(required=False)
+    interval = serializers.ChoiceField(choices=['day', 'month'], default='month')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        if attrs.get('from'):
+            attrs.setdefault('to', timezone.localdate())
+            if attrs['from'] > attrs['to']:
+                raise serializers.ValidationError("'from' must not be after 'to'.")
+            if (attrs['to'] - attrs['from']).days >= MAX_SERIES_DAYS:
+                raise serializers.ValidationError(f"Series are limited to {MAX_SERIES_DAYS} days.")
+        elif attrs.get('to'):
+            raise serializers.ValidationError("'to' requires 'from'.")
+        return attrs
+
+
+class BalancePointSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    balance = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+# ---------- Reports ----------
+class MonthField(serializers.DateField):
+    """Accepts ``YYYY-MM`` (or a full date) and normalizes it to the first day of the month."""
+
+    def to_internal_value(self, value):
+        if isinstance(value, str) and len(value) == 7:
+            value = f"{value}-01"
+        return super().to_internal_value(value).replace(day=1)
+
+    def to_representation(self, value):
+        return value.strftime('%Y-%m') if value else None
+
+
+class MonthlyReportQuerySerializer(serializers.Serializer):
+    """Validates the ``from``/``to`` month range of the monthly report."""
+    account = serializers.IntegerField(required=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # 'from' is a Python keyword, so the fields are declared here
+        fields['from'] = MonthField(required=False)
+        fields['to'] = MonthField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        if attrs.get('from') and attrs.get('to') and attrs['from'] > attrs['to']:
+            raise serializers.ValidationError("'from' must not be after 'to'.")
+        return attrs
+
+
+class MonthlyReportRowSerializer(serializers.Serializer):
+    month = MonthField()
+    category = serializers.IntegerField(allow_null=True)
+    category_name = serializers.CharField(allow_null=True)
+    type = serializers.CharField(allow_null=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    count = serializers.IntegerField()
+
+
+# ---------- Budgets ----------
+class BudgetSerializer(serializers.ModelSerializer):
+    owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    category = LookupPrimaryKeyRelatedField('categories_by_id', queryset=Category.objects.all())
+
+    class Meta:
+        model = Budget
+        fields = ['id', 'category', 'amount', 'owner']
+
+    def validate_category(self, category):
+        if category.type != 'EXPENSE':
+            raise serializers.ValidationError("Budgets can only be set on expense categories.")
+        others = Budget.objects.filter(category=category)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        if others.exists():
+            raise serializers.ValidationError("This category already has a budget.")
+        return category
+
+    def validate_amount(self, amount):
+        if amount <= 0:
+            raise serializers.ValidationError("The budget must be greater than zero.")
+        return amount
+
+
+class BudgetStatusQuerySerializer(serializers.Serializer):
+    month = MonthField(required=False)
+
+
+class BudgetStatusRowSerializer(serializers.Serializer):
+    budget = serializers.IntegerField()
+    category = serializers.IntegerField()
+    category_name = serializers.CharField()
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2)
+    spent = serializers.DecimalField(max_digits=14, decimal_places=2)
+    remaining = serializers.DecimalField(max_digits=14, decimal_places=2)
+    count = serializers.IntegerField()
+    percent = serializers.DecimalField(max_digits=8, decimal_places=1)
+
+
+# ---------- Dashboard ----------
+# Latest transactions and transfers on the dashboard (?limit=)
+DASHBOARD_DEFAULT_LIMIT = 10
+DASHBOARD_MAX_LIMIT = 50
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, default=DASHBOARD_DEFAULT_LIMIT, min_value=1,
+                                     max_value=DASHBOARD_MAX_LIMIT)
+
+
+class DashboardCategorySerializer(serializers.Serializer):
+    category = serializers.IntegerField()
+    category_name = serializers.CharField()
+    total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    count = serializers.IntegerField()
+
+
+# ---------- Recurring rules ----------
+class RecurringRuleSerializer(serializers.ModelSerializer):
+    owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    account = LookupPrimaryKeyRelatedField('accounts_by_id', queryset=Account.objects.all())
+    category = LookupPrimaryKeyRelatedField('categories_by_id', queryset=Category.objects.all(), allow_null=True)
+
+    class Meta:
+        model = RecurringRule
+        fields = ['id', 'account', 'category', 'amount', 'description', 'frequency', 'interval',
+                  'start_date', 'end_date', 'next_date', 'active', 'owner']
+        read_only_fields = ['next_date']
+
+    def validate_interval(self, interval):
+        if interval < 1:
+            raise serializers.ValidationError("The interval must be at least 1.")
+        return interval
+
+    def validate(self, attrs):
+        start = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start and end and end < start:
+            raise serializers.ValidationError({'end_date': "The end date must not be before the start date."})
+        return attrs
+
+
+# ---------- Statement imports ----------
+class OwnedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field limited to the requesting user's objects."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(owner=self.context['request'].user)
+
+
+class StatementUploadSerializer(serializers.Serializer):
+    """
+    Validates a statement upload. The format defaults to the file extension.
+    """
+    file = serializers.FileField()
+    account = OwnedPrimaryKeyRelatedField(queryset=Account.objects.all())
+    format = serializers.ChoiceField(choices=StatementImport.FORMAT_CHOICES, required=False)
+    income_category = OwnedPrimaryKeyRelatedField(queryset=Category.objects.filter(type='INCOME'),
+                                                  required=False, allow_null=True)
+    expense_category = OwnedPrimaryKeyRelatedField(queryset=Category.objects.filter(type='EXPENSE'),
+                                                   required=False, allow_null=True)
+    date_format = serializers.CharField(required=False, max_length=32,
+                                        help_text="strptime format of CSV dates (default ISO YYYY-MM-DD)")
+
+    def validate(self, attrs):
+        if not attrs.get('format'):
+            extension = attrs['file'].name.rsplit('.', 1)[-1].upper()
+            if extension in ('OFX', 'QFX'):
+                attrs['format'] = 'OFX'
+            elif extension == 'CSV':
+                attrs['format'] = 'CSV'
+            else:
+                raise serializers.ValidationError({'format': "Could not infer the format; pass CSV or OFX."})
+        return attrs
+
+
+class StatementImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatementImport
+        fields = [
+            'id', 'account', 'file_name', 'format', 'status', 'income_category', 'expense_category',
+            'total_rows', 'accepted_rows', 'duplicate_rows', 'error_rows', 'committed_rows',
+            'error', 'created_at',
+        ]
+        read_only_fields = fields
+
+
+class StagedTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StagedTransaction
+        fields = ['id', 'row_number', 'date', 'amount', 'description', 'account', 'category', 'status', 'error']
+        read_only_fields = fields
@@ -1,197 +1,183 @@
 # finance/signals.py
-from django.db.models.signals import pre_save, post_save, post_delete
-from django.dispatch import receiver
-from django.db import transaction
 from django.db.models import F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Transaction, Account, Category, Transfer
-from decimal import Decimal
-
-def _effect_amount(amount: Decimal, category: Category):
-    """
-    Determines the effect (positive/negative) on the account based on category type.
-    
-    Args:
-        amount (Decimal): Transaction amount
-        category (Category): Transaction category
-        
-    Returns:
-        Decimal: Positive amount for INCOME, negative for EXPENSE, zero if category is None
-    """
-    if category is None:
-        return Decimal('0.00')
-    if category.type == 'INCOME':
-        return +amount
-    else:  # 'EXPENSE'
-        return -amount
+from .models import Account, Transaction, Category, Transfer
+from .balances import ledger_changes, previous_state, transaction_state, transfer_state
+from .rollups import fold_category
+from .checkpoints import invalidate_owner_checkpoints
+from .watermarks import touch_owners
+from .authentication import user_cache
 
 @receiver(pre_save, sender=Transaction)
 def transaction_pre_save(sender, instance, **kwargs):
     """
     Stores the previous state of a transaction before saving to calculate balance differences.
-    
-    Saves:
-        - Previous account ID
-        - Previous effect on balance
+
+    The state comes from the values the instance was loaded with, so no
+    extra SELECT is issued for edits made through the API.
     """
-    if instance.pk:
-        try:
-            old = Transaction.objects.get(pk=instance.pk)
-            instance._old_account_id = old.account_id
-            instance._old_effect = _effect_amount(old.amount, old.category)
-        except Transaction.DoesNotExist:
-            instance._old_account_id = None
-            instance._old_effect = Decimal('0.00')
-    else:
-        instance._old_account_id = None
-        instance._old_effect = Decimal('0.00')
+    instance._old_state = previous_state(instance)
 
 @receiver(post_save, sender=Transaction)
 def transaction_post_save(sender, instance, created, **kwargs):
     """
-    Updates account balances after a transaction is saved.
-    
+    Records the transaction's effect on balances, monthly rollups and checkpoints.
+
     Behavior:
         - For new transactions: Apply effect to account
         - For updates: Reverse old effect (on old account) and apply new effect (possibly on different account)
-    """
-    new_effect = _effect_amount(instance.amount, instance.category)
-
-    # For new transactions
-    if created:
-        if instance.account:
-            acct = instance.account
-            acct.balance = acct.balance + new_effect
-            acct.save(update_fields=['balance'])
-        return
-
-    # For updates
-    old_effect = getattr(instance, '_old_effect', Decimal('0.00'))
-    old_account_id = getattr(instance, '_old_account_id', None)
-    
-    # Handle account changes
-    if old_account_id and old_account_id != instance.account_id:
-        try:
-            old_acct = Account.objects.get(pk=old_account_id)
-            old_acct.balance = old_acct.balance - old_effect
-            old_acct.save(update_fields=['balance'])
-        except Account.DoesNotExist:
-            pass
-
-    # Apply balance difference to current account
-    delta = new_effect - old_effect
-    if instance.account and delta != Decimal('0.00'):
-        acct = instance.account
-        acct.balance = acct.balance + delta
-        acct.save(update_fields=['balance'])
+        - Deltas are written with F() updates, once per account (see finance/balances.py)
+    """
+    old_state = getattr(instance, '_old_state', None)
+    new_state = transaction_state(instance)
+    if old_state != new_state:
+        with ledger_changes() as changes:
+            if old_state is not None:
+                changes.add_transaction(old_state, sign=-1, instance=instance)
+            changes.add_transaction(new_state, instance=instance)
+    else:
+        # e.g. a description-only edit
+        with ledger_changes() as changes:
+            changes.touch(instance.owner_id)
+    instance.remember_loaded_state()
 
 @receiver(post_delete, sender=Transaction)
 def transaction_post_delete(sender, instance, **kwargs):
     """
-    Reverses the transaction's effect on account balance when deleted.
+    Reverses the transaction's effect on account balance and monthly rollup when deleted.
     """
-    effect = _effect_amount(instance.amount, instance.category)
-    if instance.account:
-        acct = instance.account
-        acct.balance = acct.balance - effect
-        acct.save(update_fields=['balance'])
+    with ledger_changes() as changes:
+        changes.add_transaction(transaction_state(instance), sign=-1, instance=instance)
 
 @receiver(pre_save, sender=Transfer)
 def transfer_pre_save(sender, instance, **kwargs):
     """
     Stores the previous state of a transfer before saving to calculate balance differences.
-    
+
     Saves:
         - Previous from_account ID
         - Previous to_account ID
-        - Previous transfer amount
+        - Previous transfer amount and date
     """
-    if instance.pk:
-        try:
-            old = Transfer.objects.get(pk=instance.pk)
-            instance._old_from_account_id = old.from_account_id
-            instance._old_to_account_id = old.to_account_id
-            instance._old_amount = old.amount or Decimal('0.00')
-        except Transfer.DoesNotExist:
-            instance._old_from_account_id = None
-            instance._old_to_account_id = None
-            instance._old_amount = Decimal('0.00')
-    else:
-        instance._old_from_account_id = None
-        instance._old_to_account_id = None
-        instance._old_amount = Decimal('0.00')
+    instance._old_state = previous_state(instance)
 
 @receiver(post_save, sender=Transfer)
 def transfer_post_save(sender, instance, created, **kwargs):
     """
     Updates account balances after a transfer is saved.
-    
+
     Behavior:
         - For new transfers: Apply transfer effects to both accounts
         - For updates: Reverse old effects and apply new effects (accounts may have changed)
     """
-    current_amount = instance.amount or Decimal('0.00')
-
-    # For new transfers
-    if created:
-        with transaction.atomic():
-            if instance.from_account_id:
-                Account.objects.filter(pk=instance.from_account_id).update(
-                    balance=F('balance') - current_amount
-                )
-            if instance.to_account_id:
-                Account.objects.filter(pk=instance.to_account_id).update(
-                    balance=F('balance') + current_amount
-                )
-        return
-
-    # For updates - get previous state
-    old_from_account_id = getattr(instance, '_old_from_account_id', None)
-    old_to_account_id = getattr(instance, '_old_to_account_id', None)
-    old_amount = getattr(instance, '_old_amount', Decimal('0.00'))
-
-    with transaction.atomic():
-        # Reverse old transfer effects
-        if old_from_account_id:
-            Account.objects.filter(pk=old_from_account_id).update(
-                balance=F('balance') + old_amount  # Restore what was subtracted
-            )
-        if old_to_account_id:
-            Account.objects.filter(pk=old_to_account_id).update(
-                balance=F('balance') - old_amount  # Remove what was added
-            )
-
-        # Apply new transfer effects
-        if instance.from_account_id:
-            Account.objects.filter(pk=instance.from_account_id).update(
-                balance=F('balance') - current_amount
-            )
-        if instance.to_account_id:
-            Account.objects.filter(pk=instance.to_account_id).update(
-                balance=F('balance') + current_amount
-            )
+    old_state = getattr(instance, '_old_state', None)
+    new_state = transfer_state(instance)
+    if old_state != new_state:
+        with ledger_changes() as changes:
+            if old_state is not None:
+                changes.add_transfer(old_state, sign=-1)
+            changes.add_transfer(new_state)
+    else:
+        with ledger_changes() as changes:
+            changes.touch(instance.owner_id)
+    instance.remember_loaded_state()
 
 @receiver(post_delete, sender=Transfer)
 def transfer_post_delete(sender, instance, **kwargs):
     """
     Reverses transfer effects when deleted.
-    
+
     Actions:
         - Increases source account balance
         - Decreases destination account balance
-        
-    Note:
-        Uses F() expressions in atomic transaction for thread-safety
     """
-    amount = instance.amount or Decimal('0.00')
-    from_id = instance.from_account_id
-    to_id = instance.to_account_id
+    with ledger_changes() as changes:
+        changes.add_transfer(transfer_state(instance), sign=-1)
+
+@receiver(pre_save, sender=Category)
+def category_pre_save(sender, instance, **kwargs):
+    """
+    Invalidates the owner's balance checkpoints when a category changes type,
+    since the sign of all its transactions changes. The change watermark is
+    bumped first, so checkpoints being built concurrently are not stored.
+    """
+    if instance.pk:
+        old_type = Category.objects.filter(pk=instance.pk).values_list('type', flat=True).first()
+        if old_type is not None and old_type != instance.type:
+            touch_owners(instance.owner_id)
+            invalidate_owner_checkpoints(instance.owner_id)
+
+@receiver(pre_delete, sender=Category)
+def category_pre_delete(sender, instance, **kwargs):
+    """
+    Moves the category's monthly rollup rows to the uncategorized bucket,
+    mirroring ``on_delete=SET_NULL`` on its transactions, and invalidates the
+    owner's balance checkpoints (after bumping the change watermark, as above).
+    """
+    fold_category(instance)
+    touch_owners(instance.owner_id)
+    invalidate_owner_checkpoints(instance.owner_id)
+
+@receiver(pre_save, sender=Account)
+def account_pre_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Moves direct balance edits into the opening balance: the initial balance
+    of a new account, or a balance corrected later. Reconciliation compares
+    the balance with the opening balance plus the ledger, so these edits are
+    not reported (nor undone) as drift.
+    """
+    if update_fields is not None and 'balance' not in update_fields:
+        return
+    if instance._state.adding:
+        instance.opening_balance = instance.balance
+        return
+    previous = getattr(instance, '_loaded_values', {}).get('balance')
+    if previous is None:
+        previous = Account.objects.filter(pk=instance.pk).values_list('balance', flat=True).first()
+    if previous is None or instance.balance == previous:
+        return
+    edit = instance.balance - previous
+    if update_fields is None:
+        instance.opening_balance += edit
+    else:
+        Account.objects.filter(pk=instance.pk).update(opening_balance=F('opening_balance') + edit)
+
+@receiver(post_save, sender=Account)
+def account_post_save(sender, instance, **kwargs):
+    instance.remember_loaded_state()
+
+@receiver([post_save, post_delete], sender=Account)
+@receiver([post_save, post_delete], sender=Category)
+def touch_owner(sender, instance, **kwargs):
+    """
+    Bumps the owner's change watermark, so ETags and response cache keys
+    change.
+
+    Inside a ``ledger_batch()`` (API writes and their cascades) the bump joins
+    the batch's flush, so deleting many rows moves the watermark once.
+    Transactions and transfers are covered by the ledger flush, or above
+    when an edit does not affect the ledger.
+    """
+    with ledger_changes() as changes:
+        changes.touch(instance.owner_id)
+
+@receiver(post_save, sender=User)
+def refresh_cached_user(sender, instance, created, **kwargs):
+    """
+    Replaces the authentication cache entry of a saved user, so profile
+    changes and deactivations apply to this process immediately.
+    """
+    if created:
+        # A reused primary key must not pick up a stale entry
+        user_cache.evict(instance.pk)
+    else:
+        user_cache.put(instance)
 
-    with transaction.atomic():
-        if from_id:
-            Account.objects.filter(pk=from_id).update(balance=F('balance') + amount)
-        if to_id:
-            Account.objects.filter(pk=to_id).update(balance=F('balance') - amount)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    user_cache.evict(instance.pk)
 
 @receiver(post_save, sender=User)
 def create_user_categories(sender, instance, created, **kwargs):
@@ -202,4 +188,5 @@ def create_user_categories(sender, instance, created, **kwargs):
         Only on user creation, not on updates
     """
     if created:
+        # A new user has no change watermark or cached responses to invalidate yet
         Category.create_default_categories(instance)
\ No newline at end of file
@@ -0,0 +1,31 @@
+from django.test import TestCase
+from finance.benchmarks.api import run
+from finance.benchmarks._baseline import DEFAULT_BASELINE, compare, load_baseline
+
+
+class APIBenchmarkTest(TestCase):
+    def test_queries_within_baseline(self):
+        """
+        No endpoint issues more queries per request than the committed baseline
+        """
+        results = run(rows=200)
+        baseline = load_baseline(DEFAULT_BASELINE)['api']
+        self.assertEqual({row['case'] for row in results}, set(baseline))
+        # Latency depends on the machine; it is gated by `benchmark --check`
+        self.assertEqual(compare(results, baseline, latency_tolerance=None), [])
+
+    def test_compare(self):
+        """
+        Regressions past the tolerances are reported, cases without a baseline are not gated
+        """
+        baseline = {"accounts list": {"p95_ms": 10.0, "queries_per_request": 2}}
+        results = [
+            {"case": "accounts list", "p95_ms": 15.5, "queries_per_request": 3},
+            {"case": "new case", "p95_ms": 99.0, "queries_per_request": 50},
+        ]
+        failures = compare(results, baseline, latency_tolerance=0.5)
+        self.assertEqual(len(failures), 1)
+        self.assertIn("queries_per_request 3 > baseline 2", failures[0])
+
+        results[0]["p95_ms"] = 16.5
+        self.assertEqual(len(compare(results, baseline, query_tolerance=1, latency_tolerance=0.5)), 1)
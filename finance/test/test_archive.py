@@ -0,0 +1,122 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from finance.models import (
+    Account, ArchivedTransaction, ArchivedTransfer, CarryForward, Category, MonthlyCategoryTotal, Transaction,
+    Transfer,
+)
+from finance.archive import archive_ledger
+from finance.checkpoints import balance_at
+from finance.reconcile import reconcile_owners
+from finance.rollups import live_monthly_totals
+from decimal import Decimal
+from datetime import date
+from io import StringIO
+import json
+
+
+class LedgerArchiveTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="archiveuser",
+            password="testpassword123",
+            email="archiveuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.salary = Category.objects.get(name="Salary", owner=self.user)
+        self.food = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+        # Two old months (archived below) and one recent one
+        for month in (1, 2):
+            self._tx(self.salary, "1000.00", date(2023, month, 1))
+            self._tx(self.food, "40.00", date(2023, month, 15))
+            Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('100.00'),
+                                    date=date(2023, month, 20), owner=self.user)
+        self._tx(self.salary, "1000.00", date(2025, 1, 1))
+        self._tx(self.food, "25.00", date(2025, 1, 5))
+        Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('50.00'),
+                                date=date(2025, 1, 6), owner=self.user)
+        self.cutoff = date(2024, 1, 1)
+
+    def _tx(self, category, amount, day):
+        return Transaction.objects.create(account=self.checking, category=category, amount=Decimal(amount),
+                                          date=day, owner=self.user)
+
+    def _balances(self):
+        return list(Account.objects.filter(owner=self.user).order_by('pk').values_list('balance', flat=True))
+
+    def test_archiving_keeps_balances_and_reports(self):
+        """
+        Old rows move to the archive in chunks; balances, reconcile and the rollup are unchanged
+        """
+        balances = self._balances()
+        rollup = live_monthly_totals([self.user.id])
+
+        out = StringIO()
+        call_command('archive_ledger', before=self.cutoff, chunk_size=2, stdout=out)
+        self.assertIn("Archived 4 transactions and 2 transfers", out.getvalue())
+
+        self.assertEqual(Transaction.objects.filter(owner=self.user).count(), 2)
+        self.assertEqual(ArchivedTransaction.objects.filter(owner=self.user).count(), 4)
+        self.assertEqual(ArchivedTransfer.objects.filter(owner=self.user).count(), 2)
+        self.assertEqual(self._balances(), balances)
+
+        carry = CarryForward.objects.get(account=self.checking)
+        self.assertEqual((carry.cutoff, carry.amount, carry.count), (self.cutoff, Decimal('1720.00'), 6))
+        self.assertEqual(CarryForward.objects.get(account=self.savings).amount, Decimal('200.00'))
+        self.assertEqual(reconcile_owners([self.user.id]), [])
+
+        # The live rebuild of the rollup still counts the archived rows
+        self.assertEqual(live_monthly_totals([self.user.id]), rollup)
+        self.assertTrue(MonthlyCategoryTotal.objects.filter(owner=self.user, month=date(2023, 1, 1)).exists())
+
+        # Nothing is left to move
+        self.assertEqual(archive_ledger(self.cutoff), (0, 0))
+
+    def test_balance_history_across_the_cutoff(self):
+        """
+        Past balances are the same before and after archiving
+        """
+        days = [date(2023, 1, 10), date(2023, 2, 28), date(2024, 6, 1), date(2025, 1, 5)]
+        today = date(2025, 2, 1)
+        checking = Account.objects.get(pk=self.checking.pk)
+        before = [balance_at(checking, day, today=today) for day in days]
+        self.assertEqual(before[0], Decimal('1000.00'))
+
+        archive_ledger(self.cutoff)
+        checking = Account.objects.get(pk=self.checking.pk)
+        self.assertEqual([balance_at(checking, day, today=today) for day in days], before)
+
+    def test_lists_serve_hot_rows_unless_archived_are_requested(self):
+        """
+        Lists and exports only include archived rows with ?include_archived=1, paginated across both tables
+        """
+        archive_ledger(self.cutoff)
+
+        response = self.client.get("/api/transactions/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tx["date"] for tx in response.data["results"]], ["2025-01-05", "2025-01-01"])
+
+        dates = []
+        url = "/api/transactions/?include_archived=1&page_size=4"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            dates += [tx["date"] for tx in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(dates, ["2025-01-05", "2025-01-01", "2023-02-15", "2023-02-01",
+                                 "2023-01-15", "2023-01-01"])
+
+        response = self.client.get("/api/transactions/?include_archived=1&category=%d" % self.food.id)
+        self.assertEqual([tx["amount"] for tx in response.data["results"]], ["25.00", "40.00", "40.00"])
+
+        response = self.client.get("/api/transfers/?include_archived=true&search=")
+        self.assertEqual(len(response.data["results"]), 3)
+
+        response = self.client.get("/api/transfers/export/?format=ndjson&include_archived=1")
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row["date"] for row in rows], ["2023-01-20", "2023-02-20", "2025-01-06"])
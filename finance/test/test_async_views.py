@@ -0,0 +1,112 @@
+from rest_framework.test import APIClient
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import resolve
+from finance.models import Account, Category, Transaction
+from decimal import Decimal
+from datetime import date
+import inspect
+
+@override_settings(ROOT_URLCONF='project_finance.asgi_urls')
+class AsyncReadViewTest(TestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="asyncuser",
+            password="testpassword123",
+            email="asyncuser@example.com"
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.async_client = AsyncClient()
+        self.authorization = f"Bearer {token}"
+        self.sync_client = APIClient()
+        self.sync_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        category = Category.objects.get(owner=self.user, name="Food")
+        self.transactions = Transaction.objects.bulk_create([
+            Transaction(account=self.account, category=category, amount=Decimal(f"{i}.25"),
+                        date=date(2025, 1, 1 + i % 28), description=f"Row {i}", owner=self.user)
+            for i in range(30)
+        ])
+
+    async def test_async_responses_match_sync(self):
+        """
+        The async views return the same body and validators as the sync views
+        """
+        self.assertTrue(inspect.iscoroutinefunction(resolve("/api/accounts/").func))
+        urls = [
+            "/api/accounts/",
+            "/api/categories/?fields=id,name",
+            "/api/transactions/?page_size=10&expand=account",
+            f"/api/transactions/{self.transactions[0].pk}/",
+            "/api/users/me/",
+        ]
+        for url in urls:
+            with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+                expected = await self._sync_get(url)
+                response = await self._get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            # Served by the async handler (the sync view returns a DRF Response)
+            self.assertIs(type(response), HttpResponse, url)
+            self.assertEqual(response.content, expected.content, url)
+            self.assertEqual(response['Content-Type'], expected['Content-Type'], url)
+            self.assertEqual(response.get('ETag'), expected.get('ETag'), url)
+
+        # Cursor links of the async page lead to the same next page
+        first = (await self._get("/api/transactions/?page_size=10")).json()
+        second = await self._get(first["next"])
+        self.assertEqual(second.content, (await self._sync_get(first["next"])).content)
+
+    async def test_conditional_and_cached_responses(self):
+        """
+        The response cache and conditional requests work the same way on the async path
+        """
+        response = await self._get("/api/accounts/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = await self._get("/api/accounts/")
+        self.assertEqual(response['X-Cache'], 'HIT')
+        response = await self._get("/api/accounts/", if_none_match=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_errors_and_fallback(self):
+        """
+        Errors are reported as by the sync views, and other requests still go through them
+        """
+        other = await User.objects.acreate(username="otherasync")
+        account = await Account.objects.acreate(name="Other", balance=Decimal('0.00'), owner=other)
+        foreign = await Transaction.objects.acreate(account=account, amount=Decimal('1.00'),
+                                                    date=date(2025, 1, 1), owner=other)
+        response = await self._get(f"/api/transactions/{foreign.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self._get(f"/api/transactions/{foreign.pk}/", if_none_match='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await self._get("/api/accounts/", authorization="Bearer invalid")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self._get("/api/accounts/", authorization=None)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Parameters without async support and writes run the sync view
+        response = await self._get("/api/accounts/?search=check")
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.json()[0]["name"], "Checking")
+        response = await self.async_client.post("/api/accounts/", {"name": "Savings", "balance": "1.00"},
+                                                content_type="application/json",
+                                                headers={"Authorization": self.authorization})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    async def _get(self, url, authorization='', if_none_match=None):
+        headers = {"Authorization": authorization or self.authorization} if authorization is not None else {}
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match
+        return await self.async_client.get(url, headers=headers)
+
+    async def _sync_get(self, url):
+        from asgiref.sync import sync_to_async
+        with override_settings(ROOT_URLCONF='project_finance.urls'):
+            return await sync_to_async(self.sync_client.get)(url)
@@ -0,0 +1,211 @@
+import threading
+import time
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction, OperationalError
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from finance.balances import ledger_batch
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+from datetime import date
+
+class BalanceEngineTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="engineuser",
+            password="testpassword123",
+            email="engineuser@example.com"
+        )
+        self.account = Account.objects.create(name="Checking", balance=Decimal('100.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.income = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+        self.expense = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+    def test_stale_account_instances_do_not_lose_updates(self):
+        """
+        Two writers holding stale copies of the same account both get applied
+        """
+        first = Account.objects.get(pk=self.account.pk)
+        second = Account.objects.get(pk=self.account.pk)
+        Transaction.objects.create(account=first, category=self.income, amount=Decimal('10.00'),
+                                   date=date(2025, 1, 1), owner=self.user)
+        Transaction.objects.create(account=second, category=self.income, amount=Decimal('5.00'),
+                                   date=date(2025, 1, 1), owner=self.user)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('115.00'))
+
+    def test_update_does_not_reread_the_row(self):
+        """
+        Editing a loaded transaction uses its loaded state instead of a SELECT
+        """
+        tx = Transaction.objects.create(account=self.account, category=self.expense, amount=Decimal('20.00'),
+                                        date=date(2025, 1, 1), owner=self.user)
+        tx = Transaction.objects.select_related('category').get(pk=tx.pk)
+        tx.amount = Decimal('30.00')
+
+        with CaptureQueriesContext(connection) as ctx:
+            tx.save()
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(selects, [])
+        # transaction UPDATE + balance UPDATE + rollup UPDATE + budget upsert + checkpoint DELETE
+        # + watermark UPDATE
+        self.assertEqual(len(ctx.captured_queries), 6)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('70.00'))
+
+    def test_moving_between_accounts_is_one_balance_update(self):
+        """
+        Moving a transaction to another account writes both deltas in one statement
+        """
+        tx = Transaction.objects.create(account=self.account, category=self.income, amount=Decimal('40.00'),
+                                        date=date(2025, 1, 1), owner=self.user)
+        tx.account = self.savings
+        with CaptureQueriesContext(connection) as ctx:
+            tx.save()
+        balance_updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "finance_account"')]
+        self.assertEqual(len(balance_updates), 1)
+
+        self.account.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('100.00'))
+        self.assertEqual(self.savings.balance, Decimal('40.00'))
+
+    def test_ledger_batch_coalesces_writes(self):
+        """
+        Saves inside ledger_batch() produce a single balance UPDATE on exit
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            with ledger_batch():
+                for _ in range(25):
+                    Transaction.objects.create(account=self.account, category=self.expense,
+                                               amount=Decimal('2.00'), date=date(2025, 1, 1), owner=self.user)
+                Transfer.objects.create(from_account=self.account, to_account=self.savings,
+                                        amount=Decimal('10.00'), date=date(2025, 1, 1), owner=self.user)
+        balance_updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "finance_account"')]
+        self.assertEqual(len(balance_updates), 1)
+
+        self.account.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('40.00'))
+        self.assertEqual(self.savings.balance, Decimal('10.00'))
+
+    def test_api_writes_flush_once(self):
+        """
+        A transaction created through the API writes each ledger table once, with a plain F() balance update
+        """
+        self.client.force_authenticate(user=self.user)
+        payload = {"account": self.account.id, "category": self.income.id, "amount": "10.00", "date": "2025-01-01"}
+        # accounts + categories maps + INSERT + balance UPDATE + rollup upsert + budget upsert
+        # + checkpoint DELETE + watermark UPDATE
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/api/transactions/", payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(ctx.captured_queries), 8)
+        balance_updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "finance_account"')]
+        self.assertEqual(len(balance_updates), 1)
+        self.assertNotIn("CASE", balance_updates[0])
+
+        # A description-only edit only moves the watermark: SELECT + UPDATE + watermark UPDATE
+        with self.assertNumQueries(3):
+            response = self.client.patch(f"/api/transactions/{response.data['id']}/", {"description": "Pay"},
+                                         format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _fill(self, account, rows):
+        for day in range(rows):
+            Transaction.objects.create(account=account, category=self.income, amount=Decimal('1.00'),
+                                       date=date(2025, 1, 1 + day % 28), owner=self.user)
+            Transfer.objects.create(from_account=account, to_account=self.savings, amount=Decimal('1.00'),
+                                    date=date(2025, 1, 1 + day % 28), owner=self.user)
+
+    def test_account_delete_query_count_is_constant(self):
+        """
+        Deleting an account through the API flushes its cascaded rows once, touching the watermark once
+        """
+        self.client.force_authenticate(user=self.user)
+        small = Account.objects.create(name="Small", balance=Decimal('0.00'), owner=self.user)
+        large = Account.objects.create(name="Large", balance=Decimal('0.00'), owner=self.user)
+        self._fill(small, 5)
+        self._fill(large, 50)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.delete(f"/api/accounts/{small.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        with CaptureQueriesContext(connection) as large_ctx:
+            response = self.client.delete(f"/api/accounts/{large.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(len(large_ctx.captured_queries), len(ctx.captured_queries))
+        touches = [q for q in large_ctx.captured_queries if q["sql"].startswith('UPDATE "finance_changewatermark"')]
+        self.assertEqual(len(touches), 1)
+
+        # The cascaded transfers are reversed on the surviving account
+        self.savings.refresh_from_db()
+        self.assertEqual(self.savings.balance, Decimal('0.00'))
+
+
+class ConcurrentBalanceTest(TransactionTestCase):
+    """
+    Threaded stress test: concurrent writers against one account.
+    """
+    threads = 4
+    writes_per_thread = 25
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="stressuser",
+            password="testpassword123",
+            email="stressuser@example.com"
+        )
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.income = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+
+    # Attempts per unit of work before a lock error fails the test
+    max_attempts = 50
+
+    @classmethod
+    def _retry(cls, func):
+        for attempt in range(1, cls.max_attempts + 1):
+            try:
+                with transaction.atomic():
+                    return func()
+            except OperationalError:
+                # SQLite's shared in-memory test database reports lock contention
+                # instead of waiting; the whole unit of work is rolled back and retried
+                if attempt == cls.max_attempts:
+                    raise
+                time.sleep(0.01)
+
+    def _writer(self, errors):
+        try:
+            # Every thread starts from its own (soon stale) copy of the account
+            account = self._retry(lambda: Account.objects.get(pk=self.account.pk))
+            for _ in range(self.writes_per_thread):
+                self._retry(lambda: Transaction.objects.create(
+                    account=account, category=self.income, amount=Decimal('1.00'),
+                    date=date(2025, 1, 1), owner=self.user,
+                ))
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    def test_no_lost_updates(self):
+        errors = []
+        workers = [threading.Thread(target=self._writer, args=(errors,)) for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        total = self.threads * self.writes_per_thread
+        self.assertEqual(Transaction.objects.filter(account=self.account).count(), total)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal(total))
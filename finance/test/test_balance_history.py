@@ -0,0 +1,135 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.utils import timezone
+from unittest.mock import patch
+from finance.models import Account, Category, Transaction, Transfer, BalanceCheckpoint
+from finance import checkpoints
+from finance.checkpoints import balance_at
+from decimal import Decimal
+from datetime import timedelta
+
+class BalanceHistoryTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="historyuser",
+            password="testpassword123",
+            email="historyuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('100.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.income = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+        self.expense = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+        # Ledger spread over the last months; balances are maintained by signals
+        today = timezone.localdate()
+        self.this_month = today.replace(day=1)
+        self.last_month = (self.this_month - timedelta(days=1)).replace(day=1)
+        self.two_months_ago = (self.last_month - timedelta(days=1)).replace(day=1)
+
+        self._tx(self.income, "1000.00", self.two_months_ago)
+        self._tx(self.expense, "200.00", self.two_months_ago + timedelta(days=5))
+        self._tx(self.expense, "50.00", self.last_month + timedelta(days=2))
+        self._tx(self.income, "10.00", self.this_month)
+        Transfer.objects.create(from_account=self.account, to_account=self.savings, amount=Decimal('300.00'),
+                                date=self.last_month + timedelta(days=10), owner=self.user)
+
+    def _tx(self, category, amount, day):
+        return Transaction.objects.create(
+            account=self.account, category=category, amount=Decimal(amount), date=day, owner=self.user
+        )
+
+    def test_balance_at_uses_checkpoints(self):
+        """
+        Historical balances replay the partial month on top of a checkpoint
+        """
+        self.account.refresh_from_db()
+        # Current balance: 100 + 1000 - 200 - 50 - 300 + 10
+        self.assertEqual(self.account.balance, Decimal('560.00'))
+
+        before_everything = self.two_months_ago - timedelta(days=1)
+        self.assertEqual(balance_at(self.account, before_everything), Decimal('100.00'))
+        self.assertEqual(balance_at(self.account, self.two_months_ago + timedelta(days=5)), Decimal('900.00'))
+        self.assertEqual(balance_at(self.account, self.this_month - timedelta(days=1)), Decimal('550.00'))
+        self.assertTrue(BalanceCheckpoint.objects.filter(account=self.account, month=self.last_month).exists())
+
+        # A second lookup reads the stored checkpoints: 1 checkpoint SELECT + 4 partial aggregates
+        with self.assertNumQueries(5):
+            balance_at(self.account, self.last_month + timedelta(days=3))
+
+    def test_backdated_edit_invalidates_later_checkpoints(self):
+        """
+        Editing an old transaction drops every checkpoint after its date
+        """
+        balance_at(self.account, self.last_month + timedelta(days=3))
+        self.assertTrue(BalanceCheckpoint.objects.filter(account=self.account, month=self.this_month).exists())
+
+        tx = Transaction.objects.get(amount=Decimal('200.00'))
+        tx.amount = Decimal('150.00')
+        tx.save()
+        self.account.refresh_from_db()
+        self.assertFalse(
+            BalanceCheckpoint.objects.filter(account=self.account, month__gt=self.two_months_ago).exists()
+        )
+        self.assertEqual(balance_at(self.account, self.this_month - timedelta(days=1)), Decimal('600.00'))
+
+    def test_checkpoints_racing_a_write_are_not_stored(self):
+        """
+        Checkpoints aggregated before a back-dated write commits are not persisted
+        """
+        real_ledger_effects = checkpoints.ledger_effects
+        calls = []
+
+        def ledger_effects_then_write(*args, **kwargs):
+            result = real_ledger_effects(*args, **kwargs)
+            if kwargs.get('group') == 'month' and not calls:
+                # Another request commits a back-dated transaction after the aggregate
+                calls.append(self._tx(self.expense, "40.00", self.two_months_ago + timedelta(days=1)))
+            return result
+
+        with patch('finance.checkpoints.ledger_effects', side_effect=ledger_effects_then_write):
+            balance_at(self.account, self.last_month + timedelta(days=3))
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(BalanceCheckpoint.objects.filter(account=self.account).exists())
+
+        self.account.refresh_from_db()
+        # 100 + 1000 - 200 - 40 - 50 - 300 + 10 - 10
+        self.assertEqual(balance_at(self.account, self.this_month - timedelta(days=1)), Decimal('510.00'))
+
+    def test_months_before_the_base_checkpoint_are_built(self):
+        """
+        A missing month older than the checkpoint a build starts from is built, not read as zero
+        """
+        next_month = (self.this_month + timedelta(days=31)).replace(day=1)
+        later = next_month + timedelta(days=3)
+        self.account.refresh_from_db()
+        balance_at(self.account, self.two_months_ago + timedelta(days=5), today=later)
+        BalanceCheckpoint.objects.filter(account=self.account, month__in=[self.last_month, next_month]).delete()
+
+        # 100 + 1000 - 200 - 50
+        self.assertEqual(balance_at(self.account, self.last_month + timedelta(days=3), today=later), Decimal('850.00'))
+        self.assertEqual(
+            BalanceCheckpoint.objects.get(account=self.account, month=self.last_month).ledger_total, Decimal('800.00')
+        )
+
+    def test_balance_history_endpoint(self):
+        """
+        The endpoint serves single dates and month-end series
+        """
+        url = f"/api/accounts/{self.account.id}/balance-history/"
+        response = self.client.get(url, {"at": (self.this_month - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["balance"], "550.00")
+
+        response = self.client.get(url, {
+            "from": self.two_months_ago.isoformat(),
+            "to": (self.this_month - timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p["balance"] for p in response.data["results"]], ["900.00", "550.00"])
+
+        response = self.client.get(url, {"to": "2025-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,123 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from finance.models import Account, Budget, BudgetPeriod, Category, Transaction
+from decimal import Decimal
+from datetime import date
+
+class BudgetTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="budgetuser",
+            password="testpassword123",
+            email="budgetuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.food = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        self.fun = Category.objects.create(name="Cinema", type="EXPENSE", owner=self.user)
+        self.salary = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+
+    def _tx(self, category, amount, day):
+        return Transaction.objects.create(
+            account=self.account, category=category, amount=Decimal(amount), date=day, owner=self.user
+        )
+
+    def _period(self, budget, month):
+        period = BudgetPeriod.objects.filter(budget=budget, month=month).first()
+        return (period.spent, period.count) if period else None
+
+    def test_counters_follow_create_update_delete(self):
+        """
+        Signals keep the budget periods in step with the ledger
+        """
+        food = Budget.objects.create(category=self.food, amount=Decimal('200.00'), owner=self.user)
+        fun = Budget.objects.create(category=self.fun, amount=Decimal('50.00'), owner=self.user)
+
+        tx = self._tx(self.food, "20.00", date(2025, 1, 10))
+        self._tx(self.food, "5.00", date(2025, 1, 20))
+        self._tx(self.salary, "900.00", date(2025, 1, 1))
+        self.assertEqual(self._period(food, date(2025, 1, 1)), (Decimal('25.00'), 2))
+
+        # Move one transaction to another month and category
+        tx.date = date(2025, 2, 3)
+        tx.category = self.fun
+        tx.save()
+        self.assertEqual(self._period(food, date(2025, 1, 1)), (Decimal('5.00'), 1))
+        self.assertEqual(self._period(fun, date(2025, 2, 1)), (Decimal('20.00'), 1))
+
+        tx.delete()
+        self.assertEqual(self._period(fun, date(2025, 2, 1)), (Decimal('0.00'), 0))
+        # Income categories have no budget, so nothing else was written
+        self.assertEqual(BudgetPeriod.objects.count(), 2)
+
+        call_command('rebuild_budget_counters', check=True, verbosity=0, stdout=open('/dev/null', 'w'))
+
+    def test_status_reads_counters_only(self):
+        """
+        The status endpoint reads one counter row per budget instead of aggregating the ledger
+        """
+        response = self.client.post("/api/budgets/", {"category": self.food.id, "amount": "100.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.post("/api/budgets/", {"category": self.fun.id, "amount": "40.00"}, format='json')
+        self.client.post("/api/transactions/bulk/", [
+            {"account": self.account.id, "category": self.food.id, "amount": "30.00", "date": "2025-03-02"},
+            {"account": self.account.id, "category": self.food.id, "amount": "45.50", "date": "2025-03-20"},
+            {"account": self.account.id, "category": self.food.id, "amount": "99.00", "date": "2025-04-01"},
+        ], format='json')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/budgets/status/?month=2025-03")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('finance_transaction', ctx.captured_queries[0]['sql'])
+
+        rows = [(r["category_name"], r["spent"], r["remaining"], r["count"], r["percent"])
+                for r in response.data["results"]]
+        self.assertEqual(response.data["month"], "2025-03")
+        self.assertEqual(rows, [
+            ("Cinema", "0.00", "40.00", 0, "0.0"),
+            ("Groceries", "75.50", "24.50", 2, "75.5"),
+        ])
+
+    def test_new_budget_is_backfilled(self):
+        """
+        A budget created after the fact (or moved to another category) starts from the existing spending
+        """
+        self._tx(self.food, "12.00", date(2025, 3, 3))
+        self._tx(self.food, "8.00", date(2025, 3, 9))
+        self._tx(self.fun, "15.00", date(2025, 3, 4))
+
+        response = self.client.post("/api/budgets/", {"category": self.food.id, "amount": "100.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        budget = Budget.objects.get(pk=response.data["id"])
+        self.assertEqual(self._period(budget, date(2025, 3, 1)), (Decimal('20.00'), 2))
+
+        response = self.client.patch(f"/api/budgets/{budget.id}/", {"category": self.fun.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._period(budget, date(2025, 3, 1)), (Decimal('15.00'), 1))
+
+        # Only expense categories, one budget per category
+        response = self.client.post("/api/budgets/", {"category": self.salary.id, "amount": "10.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post("/api/budgets/", {"category": self.fun.id, "amount": "10.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        """
+        Rebuilding restores corrupted counters from the ledger
+        """
+        budget = Budget.objects.create(category=self.food, amount=Decimal('200.00'), owner=self.user)
+        self._tx(self.food, "12.00", date(2025, 3, 3))
+        BudgetPeriod.objects.update(spent=Decimal('999.00'))
+
+        with self.assertRaises(Exception):
+            call_command('rebuild_budget_counters', check=True, verbosity=0, stderr=open('/dev/null', 'w'))
+
+        call_command('rebuild_budget_counters', verbosity=0, stdout=open('/dev/null', 'w'))
+        self.assertEqual(self._period(budget, date(2025, 3, 1)), (Decimal('12.00'), 1))
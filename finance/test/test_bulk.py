@@ -0,0 +1,95 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+
+class BulkCreateTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="bulkuser",
+            password="testpassword123",
+            email="bulkuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        # Create accounts
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('1000.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('500.00'), owner=self.user)
+
+        # Test categories
+        self.income_category = Category.objects.create(name="Freelance", type="INCOME", owner=self.user)
+        self.expense_category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+    def test_bulk_transactions_apply_one_delta_per_account(self):
+        """
+        Bulk transaction create inserts every row and applies the summed effect per account
+        """
+        rows = [
+            {"account": self.checking.id, "category": self.income_category.id, "amount": "100.00", "date": "2025-01-05"},
+            {"account": self.checking.id, "category": self.expense_category.id, "amount": "40.00", "date": "2025-01-06"},
+            {"account": self.savings.id, "category": self.income_category.id, "amount": "10.00", "date": "2025-01-07"},
+            {"account": self.savings.id, "category": None, "amount": "99.00", "date": "2025-01-08"},
+        ]
+        response = self.client.post("/api/transactions/bulk/", rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 4)
+        self.assertTrue(all(row["id"] for row in response.data))
+        self.assertEqual(Transaction.objects.filter(owner=self.user).count(), 4)
+
+        self.checking.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('1060.00'))
+        self.assertEqual(self.savings.balance, Decimal('510.00'))
+
+    def test_bulk_transactions_query_count_is_constant(self):
+        """
+        The number of queries does not grow with the number of rows (one INSERT per batch)
+        """
+        rows = [
+            {"account": self.checking.id, "category": self.expense_category.id, "amount": "1.00", "date": "2025-02-01"}
+            for _ in range(100)
+        ]
+        # lookups (2) + INSERT + balance UPDATE + monthly rollup upsert + budget upsert
+        # + checkpoint invalidation + change watermark UPDATE
+        with self.assertNumQueries(8):
+            response = self.client.post("/api/transactions/bulk/", rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('900.00'))
+
+    def test_bulk_rejects_foreign_accounts(self):
+        """
+        A row referencing another user's account invalidates the whole batch
+        """
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        foreign = Account.objects.create(name="Foreign", balance=Decimal('0.00'), owner=other)
+        rows = [
+            {"account": self.checking.id, "category": self.income_category.id, "amount": "5.00", "date": "2025-01-01"},
+            {"account": foreign.id, "category": self.income_category.id, "amount": "5.00", "date": "2025-01-01"},
+        ]
+        response = self.client.post("/api/transactions/bulk/", rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Transaction.objects.count(), 0)
+
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.balance, Decimal('0.00'))
+
+    def test_bulk_transfers(self):
+        """
+        Bulk transfer create moves the summed amount between accounts
+        """
+        rows = [
+            {"from_account": self.checking.id, "to_account": self.savings.id, "amount": "300.00", "date": "2025-01-01"},
+            {"from_account": self.savings.id, "to_account": self.checking.id, "amount": "50.00", "date": "2025-01-02"},
+        ]
+        response = self.client.post("/api/transfers/bulk/", rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Transfer.objects.filter(owner=self.user).count(), 2)
+
+        self.checking.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('750.00'))
+        self.assertEqual(self.savings.balance, Decimal('750.00'))
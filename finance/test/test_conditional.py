@@ -0,0 +1,110 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils.http import http_date
+from finance.models import Account, Category, Transaction
+from decimal import Decimal
+from datetime import date
+import time
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="etaguser",
+            password="testpassword123",
+            email="etaguser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        self.transaction = Transaction.objects.create(account=self.account, category=self.category,
+                                                      amount=Decimal('10.00'), date=date(2025, 1, 1),
+                                                      description="Market", owner=self.user)
+
+    def test_responses_carry_validators(self):
+        """
+        List and detail responses of every resource carry a strong ETag and Last-Modified
+        """
+        for url in ("/api/accounts/", f"/api/accounts/{self.account.id}/", "/api/categories/",
+                    "/api/transactions/", f"/api/transactions/{self.transaction.id}/", "/api/transfers/"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response['ETag'].startswith('"'), url)
+            self.assertIn('Last-Modified', response)
+
+        self.assertNotEqual(self.client.get("/api/accounts/")['ETag'], self.client.get("/api/categories/")['ETag'])
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_not_modified_reads_only_the_watermark(self):
+        """
+        A matching If-None-Match is answered with 304 after a single watermark query
+        """
+        for url in ("/api/accounts/", "/api/transactions/", f"/api/transactions/{self.transaction.id}/"):
+            etag = self.client.get(url)['ETag']
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+            self.assertFalse(response.content)
+
+    def test_not_modified_from_response_cache(self):
+        """
+        With the response cache warm, the 304 path still reads only the watermark
+        """
+        etag = self.client.get("/api/accounts/")['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/accounts/", HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_the_etag(self):
+        """
+        Any change to the user's data (including description-only edits) changes the ETag
+        """
+        etag = self.client.get("/api/transactions/")['ETag']
+        self.transaction.description = "Farmers market"
+        self.transaction.save()
+        response = self.client.get("/api/transactions/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        response = self.client.get("/api/transactions/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Other users' writes do not
+        etag = response['ETag']
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        response = self.client.get("/api/transactions/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since(self):
+        """
+        If-Modified-Since is honored when no ETag is sent
+        """
+        self.client.get("/api/categories/")
+        response = self.client.get("/api/categories/", HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get("/api/categories/", HTTP_IF_MODIFIED_SINCE=http_date(time.time() - 3600))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_wildcard_and_dates_need_an_existing_object(self):
+        """
+        If-None-Match: * and If-Modified-Since answer 304 only for objects that exist
+        """
+        url = f"/api/transactions/{self.transaction.id}/"
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        foreign = Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        for url in ("/api/transactions/999999/", f"/api/accounts/{foreign.id}/"):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, url)
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, url)
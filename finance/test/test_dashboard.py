@@ -0,0 +1,95 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.utils import timezone
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+from datetime import timedelta
+
+
+class DashboardTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="dashboarduser",
+            password="testpassword123",
+            email="dashboarduser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.salary = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+        self.food = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        self.today = timezone.localdate()
+        self.last_month = self.today.replace(day=1) - timedelta(days=1)
+
+    def _tx(self, category, amount, day, account=None):
+        return Transaction.objects.create(
+            account=account or self.checking, category=category, amount=Decimal(amount), date=day, owner=self.user
+        )
+
+    def test_dashboard_content(self):
+        """
+        The dashboard combines profile, balances, this month's totals and the latest activity
+        """
+        self._tx(self.salary, "1000.00", self.last_month)
+        self._tx(self.salary, "2000.00", self.today)
+        self._tx(self.food, "30.00", self.today)
+        self._tx(self.food, "12.50", self.today, account=self.savings)
+        Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('100.00'),
+                                date=self.today, owner=self.user)
+
+        response = self.client.get("/api/dashboard/?limit=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["user"]["username"], "dashboarduser")
+        self.assertEqual(data["month"], self.today.strftime('%Y-%m'))
+        self.assertEqual([(a["name"], a["balance"]) for a in data["accounts"]],
+                         [("Checking", "2870.00"), ("Savings", "87.50")])
+        self.assertEqual(data["net_worth"], "2957.50")
+
+        # Last month's salary is not part of the month totals
+        self.assertEqual(data["income"]["total"], "2000.00")
+        self.assertEqual(data["expense"]["total"], "42.50")
+        self.assertEqual(data["expense"]["categories"], [
+            {"category": self.food.id, "category_name": "Groceries", "total": "42.50", "count": 2},
+        ])
+
+        # Latest first, limited, with account and category names
+        self.assertEqual([tx["amount"] for tx in data["transactions"]], ["12.50", "30.00"])
+        self.assertEqual(data["transactions"][0]["account"], {"id": self.savings.id, "name": "Savings"})
+        self.assertEqual(data["transactions"][0]["category"],
+                         {"id": self.food.id, "name": "Groceries", "type": "EXPENSE"})
+        self.assertEqual(data["transfers"][0]["to_account"], {"id": self.savings.id, "name": "Savings"})
+
+        response = self.client.get("/api/dashboard/?limit=500")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_budget_does_not_grow_with_data(self):
+        """
+        The dashboard is built from four queries however many rows the user has
+        """
+        self._tx(self.food, "10.00", self.today)
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        categories = [Category.objects.create(name=f"Expense {i}", type="EXPENSE", owner=self.user)
+                      for i in range(10)]
+        accounts = [Account.objects.create(name=f"Account {i}", balance=Decimal('0.00'), owner=self.user)
+                    for i in range(5)]
+        for i in range(200):
+            self._tx(categories[i % 10], "1.00", self.today - timedelta(days=i % 40), account=accounts[i % 5])
+        Transfer.objects.bulk_create([
+            Transfer(from_account=accounts[i % 5], to_account=self.checking, amount=Decimal('1.00'),
+                     date=self.today, owner=self.user)
+            for i in range(50)
+        ])
+
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["accounts"]), 7)
+        self.assertEqual(len(response.data["transactions"]), 10)
+        self.assertEqual(len(response.data["transfers"]), 10)
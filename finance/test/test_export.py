@@ -0,0 +1,75 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+from datetime import date
+import json
+
+class LedgerExportTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="exportuser",
+            password="testpassword123",
+            email="exportuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        for day, amount in ((date(2025, 1, 2), "10.50"), (date(2025, 1, 1), "4.00"), (date(2025, 3, 1), "7.25")):
+            Transaction.objects.create(account=self.account, category=self.category, amount=Decimal(amount),
+                                       date=day, description="Market, weekly", owner=self.user)
+        Transfer.objects.create(from_account=self.account, to_account=self.savings, amount=Decimal('100.00'),
+                                date=date(2025, 2, 1), owner=self.user)
+
+        # Rows of other users never leak into an export
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        other_account = Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        Transaction.objects.create(account=other_account, category=None, amount=Decimal('1.00'),
+                                   date=date(2025, 1, 1), owner=other)
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        """
+        CSV export streams a header plus one chronological line per transaction
+        """
+        response = self.client.get("/api/transactions/export/?format=csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        lines = self._content(response).splitlines()
+        self.assertEqual(lines[0], "id,date,account,category,type,amount,description")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].endswith('2025-01-01,Checking,Groceries,EXPENSE,4.00,"Market, weekly"'))
+
+    def test_ndjson_export_with_range(self):
+        """
+        NDJSON export honors the from/to range and keeps amounts as strings
+        """
+        response = self.client.get("/api/transactions/export/?format=ndjson&from=2025-01-02&to=2025-02-28")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["amount"], "10.50")
+        self.assertEqual(rows[0]["account"], "Checking")
+
+    def test_transfer_export(self):
+        """
+        Transfers export with account names joined in SQL
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/transfers/export/?format=csv")
+            lines = self._content(response).splitlines()
+        self.assertEqual(lines[1].split(",")[2:5], ["Checking", "Savings", "100.00"])
+
+    def test_invalid_range(self):
+        """
+        An inverted date range is rejected
+        """
+        response = self.client.get("/api/transactions/export/?format=csv&from=2025-03-01&to=2025-01-01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
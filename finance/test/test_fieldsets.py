@@ -0,0 +1,94 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+from datetime import date
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class FieldsetsTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="fieldsuser",
+            password="testpassword123",
+            email="fieldsuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.food = Category.objects.get(name="Food", owner=self.user)
+        Transaction.objects.create(account=self.checking, category=self.food, amount=Decimal('12.50'),
+                                   date=date(2025, 1, 2), description="Groceries", owner=self.user)
+        Transaction.objects.create(account=self.checking, category=None, amount=Decimal('3.00'),
+                                   date=date(2025, 1, 1), description="Uncategorized", owner=self.user)
+        Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('100.00'),
+                                date=date(2025, 1, 3), owner=self.user)
+
+    def _list_query(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        selects = [q['sql'] for q in queries.captured_queries if 'FROM "finance_transaction"' in q['sql']
+                   or 'FROM "finance_transfer"' in q['sql']]
+        self.assertEqual(len(selects), 1)
+        return response, selects[0]
+
+    def test_sparse_fields(self):
+        """
+        ?fields= limits both the payload and the SQL projection
+        """
+        response, sql = self._list_query("/api/transactions/?fields=id,amount,date")
+        self.assertEqual(response.data["results"], [
+            {"id": response.data["results"][0]["id"], "amount": "12.50", "date": "2025-01-02"},
+            {"id": response.data["results"][1]["id"], "amount": "3.00", "date": "2025-01-01"},
+        ])
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"category_id"', sql)
+
+    def test_sparse_fields_keep_cursor_columns(self):
+        """
+        Pagination still works when the cursor columns are not requested
+        """
+        amounts = []
+        url = "/api/transactions/?fields=amount&page_size=1"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(list(response.data["results"][0]), ["amount"])
+            amounts.extend(row["amount"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(amounts, ["12.50", "3.00"])
+
+    def test_expand(self):
+        """
+        ?expand= inlines related names through a JOIN in the same query
+        """
+        response, sql = self._list_query("/api/transactions/?expand=account,category&fields=amount")
+        self.assertEqual(response.data["results"], [
+            {"account": {"id": self.checking.id, "name": "Checking"},
+             "category": {"id": self.food.id, "name": "Food", "type": "EXPENSE"}, "amount": "12.50"},
+            {"account": {"id": self.checking.id, "name": "Checking"}, "category": None, "amount": "3.00"},
+        ])
+        self.assertIn('JOIN "finance_account"', sql)
+
+        response, sql = self._list_query("/api/transfers/?expand=from_account,to_account")
+        row = response.data["results"][0]
+        self.assertEqual(row["from_account"], {"id": self.checking.id, "name": "Checking"})
+        self.assertEqual(row["to_account"], {"id": self.savings.id, "name": "Savings"})
+        self.assertEqual(row["amount"], "100.00")
+
+    def test_invalid_selection(self):
+        """
+        Unknown fields and relations are rejected
+        """
+        response = self.client.get("/api/transactions/?fields=amount,owner")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+        response = self.client.get("/api/transfers/?expand=category")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expand", response.data)
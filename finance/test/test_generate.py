@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from finance.models import Account, Category, Transaction, Transfer
+from finance.reconcile import ledger_balances
+from finance.rollups import live_monthly_totals, stored_monthly_totals
+from datetime import date
+from io import StringIO
+
+
+class GenerateFinanceDataTest(TestCase):
+    def generate(self, prefix, seed=7):
+        out = StringIO()
+        call_command('generate_finance_data', users=5, years=1, end=date(2025, 6, 30), transactions_per_month=6,
+                     seed=seed, prefix=prefix, chunk_size=2, workers=1, stdout=out, stderr=StringIO())
+        return User.objects.filter(username__startswith=prefix)
+
+    def test_generated_data_is_consistent(self):
+        """
+        Generated users get the default categories, balances matching the ledger and an exact rollup
+        """
+        users = self.generate("gen")
+        owner_ids = list(users.values_list('pk', flat=True))
+        self.assertEqual(len(owner_ids), 5)
+        self.assertEqual(Category.objects.filter(owner_id__in=owner_ids).count(),
+                         5 * len(Category.DEFAULT_CATEGORIES))
+        self.assertGreater(Transaction.objects.filter(owner_id__in=owner_ids).count(), 5 * 12 * 3)
+        self.assertTrue(Transfer.objects.filter(owner_id__in=owner_ids).exists())
+
+        for _, _, stored, expected in ledger_balances(owner_ids):
+            self.assertEqual(stored, expected)
+        self.assertEqual(live_monthly_totals(owner_ids), stored_monthly_totals(owner_ids))
+        self.assertTrue(self.client.login(username="gen0", password="generatedpassword123"))
+
+    def test_seed_is_reproducible(self):
+        """
+        The same seed produces the same ledger; existing prefixes are refused
+        """
+        def ledger(prefix, seed=7):
+            self.generate(prefix, seed)
+            return list(
+                Transaction.objects.filter(owner__username__startswith=prefix)
+                .order_by('pk').values_list('owner__username', 'account__name', 'category__name', 'amount', 'date')
+            )
+
+        first = [(username[1:], *rest) for username, *rest in ledger("a")]
+        second = [(username[1:], *rest) for username, *rest in ledger("b")]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, [(username[1:], *rest) for username, *rest in ledger("c", seed=8)])
+        self.assertEqual(
+            list(Account.objects.filter(owner__username="a0").order_by('pk').values_list('name', 'balance')),
+            list(Account.objects.filter(owner__username="b0").order_by('pk').values_list('name', 'balance')),
+        )
+
+        with self.assertRaises(CommandError):
+            self.generate("a")
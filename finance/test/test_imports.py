@@ -0,0 +1,182 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DataError
+from unittest import mock
+from finance.models import Account, Category, Transaction, StatementImport, MonthlyCategoryTotal
+from decimal import Decimal
+from datetime import date
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250105120000[-5:EST]
+<TRNAMT>-42.10
+<NAME>HARDWARE STORE
+<MEMO>Card 1234
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250110
+<TRNAMT>1500.00
+<NAME>PAYROLL
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class StatementImportTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="importuser",
+            password="testpassword123",
+            email="importuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.groceries = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        self.salary = Category.objects.get(name="Salary", owner=self.user)
+        self.other = Category.objects.get(name="Food", owner=self.user)
+
+    def _upload(self, content, name="statement.csv", **data):
+        data.setdefault('account', self.account.id)
+        data.setdefault('expense_category', self.other.id)
+        data['file'] = SimpleUploadedFile(name, content.encode('utf-8'))
+        return self.client.post('/api/imports/', data, format='multipart')
+
+    def test_csv_import_matches_and_flags_errors(self):
+        """
+        Rows are matched to categories and accounts by name; bad rows are flagged, not fatal
+        """
+        content = (
+            "Date,Amount,Description,Category,Account\n"
+            "2025-01-02,-12.50,Market,Groceries,\n"
+            "2025-01-03,2000.00,Payroll,Salary,\n"
+            "2025-01-04,-5.00,Coffee,,Savings\n"
+            "not-a-date,-1.00,Broken,,\n"
+            "2025-01-05,3.00,Refund,,\n"
+        )
+        response = self._upload(content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_rows'], 5)
+        self.assertEqual(response.data['accepted_rows'], 3)
+        # Invalid date + credit without an income category
+        self.assertEqual(response.data['error_rows'], 2)
+
+        rows = self.client.get(f"/api/imports/{response.data['id']}/rows/").data['results']
+        self.assertEqual([row['status'] for row in rows], ['NEW', 'NEW', 'NEW', 'ERROR', 'ERROR'])
+        self.assertEqual(rows[0]['category'], self.groceries.id)
+        self.assertEqual(rows[1]['category'], self.salary.id)
+        self.assertEqual(rows[2]['account'], self.savings.id)
+        self.assertEqual(rows[2]['category'], self.other.id)
+
+        errors = self.client.get(f"/api/imports/{response.data['id']}/rows/?status=error").data['results']
+        self.assertEqual([row['row_number'] for row in errors], [4, 5])
+
+    def test_commit_updates_ledger(self):
+        """
+        Committing creates the transactions and maintains balances and rollups
+        """
+        content = "date,amount,description\n2025-01-02,-12.50,Market\n2025-01-20,-7.50,Bakery\n"
+        statement_id = self._upload(content).data['id']
+
+        response = self.client.post(f"/api/imports/{statement_id}/commit/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'COMMITTED')
+        self.assertEqual(response.data['committed_rows'], 2)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('-20.00'))
+        self.assertEqual(Transaction.objects.filter(owner=self.user, account=self.account).count(), 2)
+        total = MonthlyCategoryTotal.objects.get(account=self.account, category=self.other, month=date(2025, 1, 1))
+        self.assertEqual((total.total, total.count), (Decimal('20.00'), 2))
+
+        # A second commit is rejected
+        response = self.client.post(f"/api/imports/{statement_id}/commit/")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_reimport_flags_duplicates(self):
+        """
+        Re-importing an overlapping statement only accepts rows missing from the ledger
+        """
+        first = "date,amount,description\n2025-01-02,-12.50,Market\n2025-01-02,-12.50,Market\n"
+        statement_id = self._upload(first).data['id']
+        self.client.post(f"/api/imports/{statement_id}/commit/")
+
+        # Two identical rows already exist, a third one is new
+        second = first + "2025-01-02,-12.50,market \n2025-01-03,-1.00,Bus\n"
+        response = self._upload(second)
+        self.assertEqual(response.data['duplicate_rows'], 2)
+        self.assertEqual(response.data['accepted_rows'], 2)
+
+        self.client.post(f"/api/imports/{response.data['id']}/commit/")
+        self.assertEqual(Transaction.objects.filter(owner=self.user).count(), 4)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('-38.50'))
+
+    def test_ofx_import(self):
+        """
+        OFX (SGML) statements are parsed from their STMTTRN records
+        """
+        response = self._upload(OFX_STATEMENT, name="bank.ofx", income_category=self.salary.id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['format'], 'OFX')
+        self.assertEqual(response.data['accepted_rows'], 2)
+
+        rows = self.client.get(f"/api/imports/{response.data['id']}/rows/").data['results']
+        self.assertEqual(rows[0]['date'], '2025-01-05')
+        self.assertEqual(rows[0]['amount'], '-42.10')
+        self.assertEqual(rows[0]['description'], 'HARDWARE STORE - Card 1234')
+        self.assertEqual(rows[1]['category'], self.salary.id)
+
+    def test_out_of_range_amounts_are_row_errors(self):
+        """
+        NaN, infinite and too large amounts are flagged per row instead of failing the import
+        """
+        content = (
+            "Date,Amount,Description\n"
+            "2025-01-02,NaN,Not a number\n"
+            "2025-01-03,-Infinity,Infinite\n"
+            "2025-01-04,12345678901.00,Too large\n"
+            "2025-01-05,-99999999.99,Largest\n"
+        )
+        response = self._upload(content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'PARSED')
+        self.assertEqual((response.data['error_rows'], response.data['accepted_rows']), (3, 1))
+
+        errors = self.client.get(f"/api/imports/{response.data['id']}/rows/?status=error").data['results']
+        self.assertEqual([row['error'] for row in errors], ["Invalid amount", "Invalid amount", "Amount out of range"])
+
+    def test_database_errors_fail_the_import(self):
+        """
+        A row the database rejects while staging leaves the import FAILED, not PARSED without rows
+        """
+        with mock.patch('finance.imports.mark_duplicates', side_effect=DataError("value out of range")):
+            response = self._upload("date,amount\n2025-01-01,-1.00\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['status'], 'FAILED')
+        statement = StatementImport.objects.get(pk=response.data['id'])
+        self.assertEqual(statement.rows.count(), 0)
+
+    def test_invalid_uploads(self):
+        """
+        Unparseable files fail, and other users' accounts are rejected
+        """
+        response = self._upload("foo,bar\n1,2\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['status'], 'FAILED')
+
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        other_account = Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        response = self._upload("date,amount\n2025-01-01,-1.00\n", account=other_account.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('account', response.data)
+        self.assertEqual(StatementImport.objects.filter(owner=self.user, status='PARSED').count(), 0)
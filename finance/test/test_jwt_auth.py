@@ -0,0 +1,80 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from finance.authentication import user_cache
+from finance.models import Account, Transaction
+from decimal import Decimal
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="jwtuser",
+            password="testpassword123",
+            email="jwtuser@example.com"
+        )
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        response = self.client.post("/api/auth/token/", {"username": "jwtuser", "password": "testpassword123"},
+                                    format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        user_cache.clear()
+
+    def test_cached_response_needs_no_user(self):
+        """
+        An authenticated request that only needs the owner id never loads the user
+        """
+        self.client.get("/api/accounts/")
+        user_cache.clear()
+        # The change watermark is the only query
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/accounts/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_user_is_resolved_once_when_needed(self):
+        """
+        Views that need the full user resolve it from the in-process cache
+        """
+        response = self.client.get("/api/users/me/")
+        self.assertEqual(response.data['username'], "jwtuser")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/users/me/").data['email'], "jwtuser@example.com")
+
+        response = self.client.post("/api/transactions/", {
+            "account": self.account.id, "category": None, "amount": "5.00", "date": "2025-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Transaction.objects.get(pk=response.data['id']).owner_id, self.user.id)
+
+    def test_user_saves_refresh_the_cache(self):
+        """
+        Profile changes are visible immediately and deactivated users are rejected
+        """
+        self.client.get("/api/users/me/")
+        self.client.patch("/api/users/me/profile/", {"first_name": "Ada"}, format='json')
+        self.assertEqual(self.client.get("/api/users/me/").data['first_name'], "Ada")
+
+        self.user.refresh_from_db()
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/accounts/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sessions_do_not_authenticate_the_api(self):
+        """
+        A logged-in session (e.g. the admin's) is not accepted by the API
+        """
+        self.client.credentials()
+        self.assertTrue(self.client.login(username="jwtuser", password="testpassword123"))
+        response = self.client.get("/api/accounts/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_invalid_token(self):
+        """
+        Invalid tokens are still rejected
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        self.assertEqual(self.client.get("/api/accounts/").status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,83 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+
+
+class OwnerLookupTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="lookupuser",
+            password="testpassword123",
+            email="lookupuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('100.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        self.foreign_account = Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        self.foreign_category = Category.objects.create(name="Other", type="EXPENSE", owner=other)
+
+    def test_transfer_create_query_budget(self):
+        """
+        Creating a transfer resolves both accounts with one query
+        """
+        payload = {"from_account": self.checking.id, "to_account": self.savings.id,
+                   "amount": "40.00", "date": "2025-01-01"}
+        # accounts map + INSERT + balance UPDATE + checkpoint DELETE + watermark UPDATE
+        with self.assertNumQueries(5):
+            response = self.client.post("/api/transfers/", payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.savings.refresh_from_db()
+        self.assertEqual(self.savings.balance, Decimal('40.00'))
+
+    def test_transaction_create_query_budget(self):
+        """
+        Creating a transaction resolves the account and category from per-request maps, and the
+        balance signals reuse the resolved category instead of querying its type
+        """
+        payload = {"account": self.checking.id, "category": self.category.id, "amount": "10.00", "date": "2025-01-01"}
+        # accounts + categories maps + INSERT + balance UPDATE + rollup upsert + budget upsert
+        # + checkpoint DELETE + watermark UPDATE
+        with self.assertNumQueries(8):
+            response = self.client.post("/api/transactions/", payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_foreign_ids_are_rejected(self):
+        """
+        Accounts and categories of other users cannot be referenced
+        """
+        response = self.client.post("/api/transactions/", {
+            "account": self.foreign_account.id, "category": self.foreign_category.id,
+            "amount": "10.00", "date": "2025-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('account', response.data)
+        self.assertIn('category', response.data)
+
+        response = self.client.post("/api/transfers/", {
+            "from_account": self.checking.id, "to_account": self.foreign_account.id,
+            "amount": "10.00", "date": "2025-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Transaction.objects.count() + Transfer.objects.count(), 0)
+
+    def test_permission_check_does_not_load_owner(self):
+        """
+        Object permissions compare owner ids without fetching the owner
+        """
+        tx = Transaction.objects.create(account=self.checking, category=self.category, amount=Decimal('1.00'),
+                                        date="2025-01-01", owner=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/transactions/{tx.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [q['sql'] for q in ctx.captured_queries if '"auth_user"' in q['sql']]
+        self.assertEqual(queries, [])
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import AsyncClient, override_settings
+from finance.metrics import (
+    RequestMetricsMiddleware, registry, merge_snapshots, render_prometheus, COUNT, QUERIES, RESPONSE_BYTES,
+    SERIALIZE_TIME,
+)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='secret')
+class RequestMetricsTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpassword123",
+            email="testuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        registry.clear()
+
+    def test_requests_are_recorded_per_route(self):
+        """
+        Latency, queries, serialization and render time and size are exported per route and method
+        """
+        self.client.get("/api/accounts/")
+        self.client.get("/api/accounts/")
+        self.client.post("/api/accounts/", {"name": "Cash", "balance": "1.00"}, format='json')
+
+        response = self._scrape()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('finance_http_request_duration_seconds_count{route="account-list",method="GET"} 2', body)
+        self.assertIn('finance_http_request_duration_seconds_bucket{route="account-list",method="GET",le="+Inf"} 2',
+                      body)
+        self.assertIn('finance_http_responses_total{route="account-list",method="POST",status="201"} 1', body)
+        self.assertIn('finance_db_queries_total{route="account-list",method="POST"}', body)
+        self.assertIn('finance_response_serialize_seconds_total{route="account-list",method="GET"}', body)
+        self.assertIn('finance_response_render_seconds_total{route="account-list",method="GET"}', body)
+        # The scrape itself is not recorded
+        self.assertNotIn('route="metrics"', body)
+
+        counters = registry.snapshot()['routes']['account-list\tGET']
+        self.assertGreater(counters[QUERIES], 0)
+        self.assertGreater(counters[RESPONSE_BYTES], 0)
+        self.assertGreater(counters[SERIALIZE_TIME], 0)
+
+    def _scrape(self):
+        return self.client.get("/api/_metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    def test_token(self):
+        """
+        Scraping requires the configured token, and is refused when none is configured
+        """
+        self.assertEqual(self.client.get("/api/_metrics").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/api/_metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self._scrape().status_code, status.HTTP_200_OK)
+
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self._scrape().status_code, status.HTTP_403_FORBIDDEN)
+            # Staff sessions do not open it either
+            self.user.is_staff = True
+            self.user.save()
+            self.assertEqual(self.client.get("/api/_metrics").status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(ROOT_URLCONF='project_finance.asgi_urls')
+    async def test_async_views_stay_async(self):
+        """
+        Under ASGI the middleware runs as a coroutine and records the async views' queries
+        """
+        async def view(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(RequestMetricsMiddleware(view)))
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(lambda request: HttpResponse())))
+
+        token = RefreshToken.for_user(self.user).access_token
+        response = await AsyncClient().get("/api/accounts/", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Served by the async handler (the sync view returns a DRF Response)
+        self.assertIs(type(response), HttpResponse)
+        counters = registry.snapshot()['routes']['account-list\tGET']
+        self.assertEqual(counters[COUNT], 1)
+        self.assertGreater(counters[QUERIES], 0)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        """
+        The endpoint does not exist unless metrics are enabled
+        """
+        self.assertEqual(self._scrape().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_worker_files_are_merged(self):
+        """
+        With METRICS_DIR the endpoint sums the totals of every worker
+        """
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            self.client.get("/api/categories/")
+            other = registry.snapshot()
+            with open(os.path.join(directory, 'metrics-999999.json'), 'w') as f:
+                json.dump(other, f)
+            body = self._scrape().content.decode()
+            self.assertIn('finance_http_request_duration_seconds_count{route="category-list",method="GET"} 2', body)
+
+    def test_render_prometheus(self):
+        """
+        Merged snapshots render cumulative histogram buckets
+        """
+        counters = [1, 0.02, 3, 0.01, 0.002, 0.001, 1, 120] + [0, 0, 1] + [0] * 8
+        merged = merge_snapshots([
+            {'routes': {'transfer-list\tGET': counters}, 'responses': {}, 'cache': {'hits': 1}},
+            {'routes': {'transfer-list\tGET': counters}, 'responses': {}, 'cache': {'misses': 2}},
+        ])
+        body = render_prometheus(merged)
+        self.assertIn('finance_http_request_duration_seconds_bucket{route="transfer-list",method="GET",le="0.01"} 0',
+                      body)
+        self.assertIn('finance_http_request_duration_seconds_bucket{route="transfer-list",method="GET",le="0.025"} 2',
+                      body)
+        self.assertIn('finance_http_request_duration_seconds_bucket{route="transfer-list",method="GET",le="10.0"} 2',
+                      body)
+        self.assertIn('finance_db_queries_total{route="transfer-list",method="GET"} 6', body)
+        self.assertIn('finance_response_cache_requests_total{result="miss"} 2', body)
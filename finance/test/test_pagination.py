@@ -0,0 +1,93 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from finance.models import Account, Category, Transaction
+from decimal import Decimal
+from datetime import date
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="pageuser",
+            password="testpassword123",
+            email="pageuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Freelance", type="INCOME", owner=self.user)
+
+        # Several rows share the same date to exercise the id tie-breaker
+        dates = [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 2), date(2025, 1, 2),
+                 date(2025, 1, 3), date(2025, 1, 3), date(2025, 1, 4)]
+        Transaction.objects.bulk_create([
+            Transaction(account=self.account, category=self.category, amount=Decimal('1.00'),
+                        date=d, owner=self.user)
+            for d in dates
+        ])
+        self.expected = list(
+            Transaction.objects.filter(owner=self.user).order_by('-date', '-id').values_list('id', flat=True)
+        )
+
+    def _walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_pages_follow_date_then_id(self):
+        """
+        Walking the next links yields every row once, ordered by (-date, -id)
+        """
+        self.assertEqual(self._walk("/api/transactions/?page_size=3"), self.expected)
+
+    def test_no_count_query(self):
+        """
+        A page is served by a single LIMIT query without COUNT(*)
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/transactions/?page_size=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["next"])
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+
+    def test_pages_stable_under_concurrent_inserts(self):
+        """
+        Rows inserted after the first page was served do not shift later pages
+        """
+        response = self.client.get("/api/transactions/?page_size=3")
+        first_page = [row["id"] for row in response.data["results"]]
+
+        # A new, most recent transaction arrives between requests
+        Transaction.objects.create(account=self.account, category=self.category,
+                                   amount=Decimal('1.00'), date=date(2025, 2, 1), owner=self.user)
+
+        rest = self._walk(response.data["next"])
+        self.assertEqual(first_page + rest, self.expected)
+
+    def test_previous_link(self):
+        """
+        The previous link of the second page returns the first page
+        """
+        first = self.client.get("/api/transactions/?page_size=3")
+        second = self.client.get(first.data["next"])
+        self.assertIsNone(first.data["previous"])
+
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in back.data["results"]],
+            [row["id"] for row in first.data["results"]],
+        )
+
+    def test_invalid_cursor(self):
+        """
+        A malformed cursor is rejected with 404
+        """
+        response = self.client.get("/api/transactions/?cursor=bm90LWEtY3Vyc29y")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
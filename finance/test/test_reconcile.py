@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from finance.models import Account, Category, Transaction, Transfer
+from finance.reconcile import ledger_balances, reconcile_owners
+from decimal import Decimal
+from datetime import date
+from io import StringIO
+
+
+class ReconcileBalancesTest(TestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="reconcileuser",
+            password="testpassword123",
+            email="reconcileuser@example.com"
+        )
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.salary = Category.objects.get(name="Salary", owner=self.user)
+        self.groceries = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+        Transaction.objects.create(account=self.checking, category=self.salary, amount=Decimal('1000.00'),
+                                   date=date(2025, 1, 1), owner=self.user)
+        Transaction.objects.create(account=self.checking, category=self.groceries, amount=Decimal('50.00'),
+                                   date=date(2025, 1, 2), owner=self.user)
+        Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('300.00'),
+                                date=date(2025, 1, 3), owner=self.user)
+
+    def test_ledger_balances_match_signals(self):
+        """
+        The set-based ledger total equals the balances maintained by the signals
+        """
+        rows = {pk: (stored, expected) for pk, _, stored, expected in ledger_balances([self.user.id])}
+        self.assertEqual(rows[self.checking.id], (Decimal('650.00'), Decimal('650.00')))
+        self.assertEqual(rows[self.savings.id], (Decimal('300.00'), Decimal('300.00')))
+        self.assertEqual(reconcile_owners([self.user.id]), [])
+
+    def test_opening_balances_are_not_drift(self):
+        """
+        Balances entered on create or edited later are part of the expected balance and survive --fix
+        """
+        cash = Account.objects.create(name="Cash", balance=Decimal('1000.00'), owner=self.user)
+        Transaction.objects.create(account=cash, category=self.groceries, amount=Decimal('30.00'),
+                                   date=date(2025, 1, 5), owner=self.user)
+        self.assertEqual(reconcile_owners([self.user.id]), [])
+
+        account = Account.objects.get(pk=cash.pk)
+        account.balance = Decimal('1200.00')
+        account.save()
+        account.refresh_from_db()
+        self.assertEqual(account.opening_balance, Decimal('1230.00'))
+        self.assertEqual(reconcile_owners([self.user.id], fix=True), [])
+        account.refresh_from_db()
+        self.assertEqual(account.balance, Decimal('1200.00'))
+
+    def test_detects_and_fixes_drift(self):
+        """
+        Drift from raw updates and category deletes is reported, then fixed with --fix
+        """
+        Account.objects.filter(pk=self.savings.pk).update(balance=Decimal('999.00'))
+        # The deleted category's transactions no longer affect the ledger
+        self.groceries.delete()
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_balances', workers=1, stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('reconcile_balances', workers=1, fix=True, stdout=out, stderr=StringIO())
+        self.assertIn("Fixed 2 account balances", out.getvalue())
+
+        self.checking.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('700.00'))
+        self.assertEqual(self.savings.balance, Decimal('300.00'))
+        call_command('reconcile_balances', workers=1, stdout=StringIO())
+
+    def test_one_query_per_batch(self):
+        """
+        Each user batch is reconciled with a single aggregate query
+        """
+        for i in range(3):
+            user = User.objects.create_user(username=f"u{i}", password="testpassword123", email=f"u{i}@example.com")
+            Account.objects.create(name="Cash", balance=Decimal('0.00'), owner=user)
+        owner_ids = list(Account.objects.values_list('owner_id', flat=True).distinct())
+        with self.assertNumQueries(1):
+            reconcile_owners(owner_ids)
@@ -0,0 +1,108 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from finance.models import Account, Category, MonthlyCategoryTotal, RecurringRule, Transaction
+from finance.archive import archive_ledger
+from finance.recurring import due_occurrences, materialize_due, reschedule
+from decimal import Decimal
+from datetime import date
+
+class RecurringRuleTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="recurringuser",
+            password="testpassword123",
+            email="recurringuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.checking = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.salary = Category.objects.get(owner=self.user, name="Salary")
+        self.housing = Category.objects.get(owner=self.user, name="Housing")
+
+    def _rule(self, **kwargs):
+        values = {'account': self.checking, 'category': self.housing, 'amount': Decimal('1000.00'),
+                  'frequency': 'MONTHLY', 'start_date': date(2025, 1, 31), 'owner': self.user}
+        values.update(kwargs)
+        rule = RecurringRule(**values)
+        reschedule(rule)
+        rule.save()
+        return rule
+
+    def test_schedule_clamps_to_month_end(self):
+        """
+        Monthly occurrences keep the start day, clamped to shorter months, and stop at the end date
+        """
+        rule = self._rule(end_date=date(2025, 5, 30))
+        dates, next_date = due_occurrences(rule, date(2025, 12, 31))
+        self.assertEqual(dates, [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)])
+        self.assertIsNone(next_date)
+
+        weekly = self._rule(frequency='WEEKLY', interval=2, start_date=date(2025, 1, 1))
+        self.assertEqual(due_occurrences(weekly, date(2025, 1, 29))[0],
+                         [date(2025, 1, 1), date(2025, 1, 15), date(2025, 1, 29)])
+
+    def test_materialize_is_idempotent(self):
+        """
+        Materializing writes each due occurrence once, with balances and rollups updated in bulk
+        """
+        self._rule()
+        self._rule(category=self.salary, amount=Decimal('2500.00'), start_date=date(2025, 1, 1))
+
+        rules, created = materialize_due(date(2025, 3, 31))
+        self.assertEqual((rules, created), (2, 6))
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('4500.00'))
+        self.assertEqual(
+            MonthlyCategoryTotal.objects.get(category=self.housing, month=date(2025, 2, 1)).total, Decimal('1000.00')
+        )
+
+        # Nothing is due any more
+        self.assertEqual(materialize_due(date(2025, 3, 31)), (0, 0))
+        call_command('materialize_recurring', date=date(2025, 4, 30), stdout=open('/dev/null', 'w'))
+        self.assertEqual(Transaction.objects.filter(recurring_rule__isnull=False).count(), 8)
+        call_command('rebuild_monthly_totals', check=True, verbosity=0, stdout=open('/dev/null', 'w'))
+
+        # Archived occurrences are not re-created when a rule's schedule is rewound
+        archive_ledger(date(2025, 3, 1))
+        RecurringRule.objects.update(next_date=date(2025, 1, 1))
+        self.assertEqual(materialize_due(date(2025, 4, 30)), (2, 0))
+        self.checking.refresh_from_db()
+        self.assertEqual(self.checking.balance, Decimal('6000.00'))
+
+    def test_occurrence_is_unique(self):
+        """
+        The (rule, occurrence date) key rejects a second copy of an occurrence
+        """
+        rule = self._rule()
+        materialize_due(date(2025, 1, 31))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Transaction.objects.create(account=self.checking, category=self.housing, amount=Decimal('1.00'),
+                                       date=date(2025, 1, 31), owner=self.user,
+                                       recurring_rule=rule, occurrence_date=date(2025, 1, 31))
+
+    def test_rule_endpoints(self):
+        """
+        Rules are created through the API and rescheduled after already materialized occurrences
+        """
+        response = self.client.post("/api/recurring/", {
+            "account": self.checking.id, "category": self.housing.id, "amount": "800.00",
+            "description": "Rent", "frequency": "MONTHLY", "start_date": "2025-01-05",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["next_date"], "2025-01-05")
+        materialize_due(date(2025, 2, 10))
+
+        response = self.client.patch(f"/api/recurring/{response.data['id']}/",
+                                     {"frequency": "WEEKLY"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["next_date"], "2025-02-09")
+
+        response = self.client.post("/api/recurring/", {
+            "account": self.checking.id, "amount": "5.00", "frequency": "DAILY",
+            "start_date": "2025-02-01", "end_date": "2025-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
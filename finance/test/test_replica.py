@@ -0,0 +1,131 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from unittest import mock
+from finance.models import Account, Category, ChangeWatermark, Transaction
+from finance.routers import ReplicaRouter, read_database, reads_from
+from decimal import Decimal
+from datetime import timedelta
+
+
+# The primary stands in for the replica: reads routed to it return 'default' instead of None
+@override_settings(REPLICA_DATABASE='default', REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="replicauser",
+            password="testpassword123",
+            email="replicauser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        cache.clear()
+        # The setup writes are older than the sticky window
+        self._age_watermark(self.user, 60)
+
+    def _routed(self, method, url, data=None):
+        """Performs a request and returns the databases the finance reads were routed to"""
+        routed = set()
+        db_for_read = ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            database = db_for_read(router, model, **hints)
+            if model._meta.app_label == 'finance':
+                routed.add(database)
+            return database
+
+        with mock.patch.object(ReplicaRouter, 'db_for_read', spy):
+            response = getattr(self.client, method)(url, data, format='json')
+            if response.streaming:
+                # Exports read their rows while streaming
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, status.HTTP_400_BAD_REQUEST)
+        return routed
+
+    def test_router(self):
+        """
+        Only the finance models are read from the request's database; writes go to the primary
+        """
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Transaction))
+        with reads_from('replica'):
+            self.assertEqual(router.db_for_read(Transaction), 'replica')
+            self.assertIsNone(router.db_for_read(User))
+            self.assertEqual(router.db_for_write(Transaction), 'default')
+        self.assertIsNone(router.db_for_read(Transaction))
+
+    def test_safe_reads_use_the_replica(self):
+        """
+        Lists, details, exports and reports read from the replica; other actions from the primary
+        """
+        self.assertEqual(self._routed('get', "/api/accounts/"), {'default'})
+        self.assertEqual(self._routed('get', f"/api/accounts/{self.account.id}/"), {'default'})
+        self.assertEqual(self._routed('get', "/api/transactions/export/?format=csv"), {'default'})
+        self.assertEqual(self._routed('get', "/api/reports/monthly/"), {'default'})
+        self.assertEqual(self._routed('get', "/api/dashboard/"), {'default'})
+        # Balance history builds checkpoints from what it reads
+        self.assertEqual(self._routed('get', f"/api/accounts/{self.account.id}/balance-history/"), {None})
+
+    def _age_watermark(self, user, seconds):
+        ChangeWatermark.objects.update_or_create(
+            owner=user, defaults={'modified_at': timezone.now() - timedelta(seconds=seconds)}
+        )
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        """
+        After a write the user's reads go to the primary until the sticky window ends
+        """
+        category = Category.objects.get(owner=self.user, name="Salary")
+        self._routed('post', "/api/transactions/", {
+            "account": self.account.id, "category": category.id, "amount": "10.00", "date": "2025-01-01",
+        })
+        self.assertEqual(self._routed('get', "/api/transactions/"), {None})
+        self.assertEqual(self._routed('get', "/api/accounts/"), {None})
+
+        # Other users are not affected
+        other = User.objects.create_user(username="otheruser", password="testpassword123",
+                                         email="otheruser@example.com")
+        self._age_watermark(other, 60)
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self._routed('get', "/api/accounts/"), {'default'})
+
+        # The window ends
+        self.client.force_authenticate(user=self.user)
+        self._age_watermark(self.user, 6)
+        self.assertEqual(self._routed('get', "/api/transactions/"), {'default'})
+
+    def test_new_users_read_from_the_primary(self):
+        """
+        Users without a change watermark yet (e.g. just signed up) read from the primary
+        """
+        ChangeWatermark.objects.filter(owner=self.user).delete()
+        self.assertEqual(read_database(self.user.pk), None)
+
+    def test_stickiness_is_shared_between_workers(self):
+        """
+        A write served by one worker keeps the user's reads on the primary in every other worker
+        """
+        self.assertEqual(read_database(self.user.pk), 'default')
+
+        # Worker A serves the write, worker B (with its own local cache) the next read
+        with self._worker_cache('worker-a'):
+            self._routed('patch', f"/api/accounts/{self.account.id}/", {"name": "Main"})
+        with self._worker_cache('worker-b'):
+            self.assertEqual(self._routed('get', "/api/accounts/"), {None})
+
+    @staticmethod
+    def _worker_cache(location):
+        return override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': location},
+        })
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_without_replica(self):
+        """
+        Without a replica every read goes to the primary
+        """
+        self.assertEqual(self._routed('get', "/api/accounts/"), {None})
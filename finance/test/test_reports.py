@@ -0,0 +1,95 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from finance.models import Account, Category, Transaction, MonthlyCategoryTotal
+from decimal import Decimal
+from datetime import date
+
+class MonthlyReportTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="reportuser",
+            password="testpassword123",
+            email="reportuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.salary = Category.objects.create(name="Payroll", type="INCOME", owner=self.user)
+        self.food = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+
+    def _tx(self, category, amount, day):
+        return Transaction.objects.create(
+            account=self.account, category=category, amount=Decimal(amount), date=day, owner=self.user
+        )
+
+    def _total(self, category, month):
+        row = MonthlyCategoryTotal.objects.get(account=self.account, category=category, month=month)
+        return row.total, row.count
+
+    def test_rollup_follows_create_update_delete(self):
+        """
+        Signals keep the rollup in step with the ledger
+        """
+        tx = self._tx(self.food, "20.00", date(2025, 1, 10))
+        self._tx(self.food, "5.00", date(2025, 1, 20))
+        self.assertEqual(self._total(self.food, date(2025, 1, 1)), (Decimal('25.00'), 2))
+
+        # Move one transaction to another month and category
+        tx.date = date(2025, 2, 3)
+        tx.category = self.salary
+        tx.save()
+        self.assertEqual(self._total(self.food, date(2025, 1, 1)), (Decimal('5.00'), 1))
+        self.assertEqual(self._total(self.salary, date(2025, 2, 1)), (Decimal('20.00'), 1))
+
+        tx.delete()
+        self.assertEqual(self._total(self.salary, date(2025, 2, 1)), (Decimal('0.00'), 0))
+
+        # Deleting a category moves its totals to the uncategorized bucket
+        self.food.delete()
+        self.assertEqual(self._total(None, date(2025, 1, 1)), (Decimal('5.00'), 1))
+
+        call_command('rebuild_monthly_totals', check=True, verbosity=0)
+
+    def test_monthly_report_endpoint(self):
+        """
+        The report groups pre-aggregated rows by month and category within the range
+        """
+        self._tx(self.salary, "1000.00", date(2025, 1, 1))
+        self._tx(self.food, "30.00", date(2025, 1, 15))
+        self._tx(self.food, "45.50", date(2025, 2, 2))
+        self._tx(self.food, "99.00", date(2025, 4, 2))
+
+        # Bulk created rows are rolled up as well
+        response = self.client.post("/api/transactions/bulk/", [
+            {"account": self.account.id, "category": self.food.id, "amount": "4.50", "date": "2025-02-20"},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/reports/monthly/?from=2025-01&to=2025-02")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [(r["month"], r["category_name"], r["total"], r["count"]) for r in response.data["results"]]
+        self.assertEqual(rows, [
+            ("2025-01", "Groceries", "30.00", 1),
+            ("2025-01", "Payroll", "1000.00", 1),
+            ("2025-02", "Groceries", "50.00", 2),
+        ])
+
+        response = self.client.get("/api/reports/monthly/?from=2025-03&to=2025-01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_command(self):
+        """
+        Rebuilding restores a corrupted rollup from the ledger
+        """
+        self._tx(self.food, "12.00", date(2025, 3, 3))
+        MonthlyCategoryTotal.objects.update(total=Decimal('999.00'))
+
+        with self.assertRaises(Exception):
+            call_command('rebuild_monthly_totals', check=True, verbosity=0, stderr=open('/dev/null', 'w'))
+
+        call_command('rebuild_monthly_totals', verbosity=0, stdout=open('/dev/null', 'w'))
+        self.assertEqual(self._total(self.food, date(2025, 3, 1)), (Decimal('12.00'), 1))
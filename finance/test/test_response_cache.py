@@ -0,0 +1,109 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.db.models import F
+from finance.models import Account, Category, ChangeWatermark
+from finance.caching import cache_stats, reset_cache_stats
+from decimal import Decimal
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="cacheuser",
+            password="testpassword123",
+            email="cacheuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        reset_cache_stats()
+
+    def test_repeated_list_is_served_from_cache(self):
+        """
+        A repeated GET is a cache hit that only reads the change watermark
+        """
+        first = self.client.get("/api/accounts/")
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(1):
+            second = self.client.get("/api/accounts/")
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        # Query params are part of the key
+        self.assertEqual(self.client.get("/api/accounts/?search=check")['X-Cache'], 'MISS')
+        self.assertEqual(cache_stats(), {'hits': 1, 'misses': 2})
+
+    def test_writes_invalidate_owner_responses(self):
+        """
+        Saves, deletes and bulk writes of the owner's objects invalidate cached responses
+        """
+        self.client.get("/api/accounts/")
+        self.client.get(f"/api/accounts/{self.account.id}/")
+
+        # A transaction changes the account balance through the ledger signals
+        response = self.client.post("/api/transactions/", {
+            "account": self.account.id, "category": self.category.id,
+            "amount": "25.00", "date": "2025-01-01",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(f"/api/accounts/{self.account.id}/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['balance'], '-25.00')
+
+        self.client.get("/api/transactions/")
+        response = self.client.post("/api/transactions/bulk/", [
+            {"account": self.account.id, "category": self.category.id, "amount": "5.00", "date": "2025-01-02"},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get("/api/transactions/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.category.delete()
+        self.assertEqual(self.client.get("/api/transactions/")['X-Cache'], 'MISS')
+
+    def test_writes_from_other_workers_invalidate_responses(self):
+        """
+        A write committed by another process is seen at once, whatever this process's cache holds
+        """
+        self.client.get("/api/accounts/")
+        self.assertEqual(self.client.get("/api/accounts/")['X-Cache'], 'HIT')
+
+        # Another worker's write: the database changes, this process's cache is left as it was
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal('10.00'))
+        ChangeWatermark.objects.filter(owner=self.user).update(version=F('version') + 1)
+
+        response = self.client.get("/api/accounts/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data[0]['balance'], '10.00')
+
+    def test_cache_is_per_user(self):
+        """
+        Users never see each other's cached responses, and other users' writes do not invalidate them
+        """
+        self.client.get("/api/accounts/")
+
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        self.client.force_authenticate(user=other)
+        response = self.client.get("/api/accounts/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([row['name'] for row in response.data], ["Other"])
+
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get("/api/accounts/")['X-Cache'], 'HIT')
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        """
+        RESPONSE_CACHE_TIMEOUT = 0 turns the response cache off
+        """
+        self.client.get("/api/accounts/")
+        response = self.client.get("/api/accounts/")
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(cache_stats(), {'hits': 0, 'misses': 0})
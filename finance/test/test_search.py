@@ -0,0 +1,97 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from finance.models import Account, Category, Transaction, Transfer
+from decimal import Decimal
+from datetime import date
+
+
+class DescriptionSearchTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="searchuser",
+            password="testpassword123",
+            email="searchuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.account = Account.objects.create(name="Checking", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('0.00'), owner=self.user)
+        self.category = Category.objects.create(name="Groceries", type="EXPENSE", owner=self.user)
+        self.rows = {}
+        for day, description in (
+            (date(2025, 1, 1), "Groceries at the market"),
+            (date(2025, 1, 2), "Coffee"),
+            (date(2025, 1, 3), "Market market market stall"),
+            (date(2025, 1, 4), "Café Olé"),
+        ):
+            self.rows[description] = Transaction.objects.create(
+                account=self.account, category=self.category, amount=Decimal('5.00'),
+                date=day, description=description, owner=self.user,
+            )
+        Transfer.objects.create(from_account=self.account, to_account=self.savings, amount=Decimal('10.00'),
+                                date=date(2025, 1, 5), description="Monthly savings", owner=self.user)
+
+        # Other users' rows never match
+        other = User.objects.create_user(username="other", password="testpassword123", email="other@example.com")
+        other_account = Account.objects.create(name="Other", balance=Decimal('0.00'), owner=other)
+        Transaction.objects.create(account=other_account, category=None, amount=Decimal('1.00'),
+                                   date=date(2025, 1, 1), description="market", owner=other)
+
+    def _descriptions(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['description'] for row in response.data['results']]
+
+    def test_list_search_prefix(self):
+        """
+        ?search= matches every word as a prefix and keeps the date ordering
+        """
+        response = self.client.get("/api/transactions/?search=mark")
+        self.assertEqual(self._descriptions(response), ["Market market market stall", "Groceries at the market"])
+
+        response = self.client.get("/api/transactions/?search=gro mar")
+        self.assertEqual(self._descriptions(response), ["Groceries at the market"])
+
+        # Accents are folded
+        response = self.client.get("/api/transactions/?search=cafe")
+        self.assertEqual(self._descriptions(response), ["Café Olé"])
+
+        response = self.client.get("/api/transfers/?search=sav")
+        self.assertEqual(self._descriptions(response), ["Monthly savings"])
+
+    def test_index_follows_writes(self):
+        """
+        Updated and deleted descriptions are reflected in the index
+        """
+        coffee = self.rows["Coffee"]
+        coffee.description = "Espresso bar"
+        coffee.save()
+        self.assertEqual(self._descriptions(self.client.get("/api/transactions/?search=coffee")), [])
+        self.assertEqual(self._descriptions(self.client.get("/api/transactions/?search=espr")), ["Espresso bar"])
+
+        Transaction.objects.bulk_create([
+            Transaction(account=self.account, category=self.category, amount=Decimal('1.00'),
+                        date=date(2025, 2, 1), description="Espresso beans", owner=self.user),
+        ])
+        coffee.delete()
+        self.assertEqual(self._descriptions(self.client.get("/api/transactions/?search=espr")), ["Espresso beans"])
+
+    def test_ranked_search(self):
+        """
+        /search/ returns the best matches first and honors the other filters
+        """
+        response = self.client.get("/api/transactions/search/?q=market")
+        self.assertEqual(self._descriptions(response), ["Market market market stall", "Groceries at the market"])
+
+        response = self.client.get("/api/transactions/search/?q=market&limit=1")
+        self.assertEqual(self._descriptions(response), ["Market market market stall"])
+
+        response = self.client.get(f"/api/transactions/search/?q=market&account={self.savings.id}")
+        self.assertEqual(self._descriptions(response), [])
+
+        response = self.client.get("/api/transactions/search/?q=%21%21")
+        self.assertEqual(self._descriptions(response), [])
+
+        response = self.client.get("/api/transactions/search/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -27,7 +27,8 @@ class TransactionCRUDTest(APITestCase):
             type="INCOME",
             owner=self.user
         )
-        self.expense_category = Category.objects.create(
+        # "Food" is one of the default categories
+        self.expense_category, _ = Category.objects.get_or_create(
             name="Food",
             type="EXPENSE",
             owner=self.user
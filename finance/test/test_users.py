@@ -3,6 +3,7 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth.models import User
+from finance.models import Category
 
 class UserRegistrationTest(APITestCase):
     def setUp(self):
@@ -32,3 +33,50 @@ class UserRegistrationTest(APITestCase):
         # Check that the response contains the username and email
         self.assertEqual(response.data["username"], self.user_data["username"])
         self.assertEqual(response.data["email"], self.user_data["email"])
+
+
+class OnboardingTest(APITestCase):
+    def setUp(self):
+        self.register_url = reverse('register')
+        self.user_data = {
+            "username": "newuser",
+            "password": "testpassword123",
+            "email": "newuser@example.com",
+        }
+
+    def test_registration_query_budget(self):
+        """
+        Registration validates, creates the user and its default categories and mints tokens in a fixed number of queries
+        """
+        # username + email checks, user INSERT, default categories INSERT
+        with self.assertNumQueries(4):
+            response = self.client.post(self.register_url, self.user_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('access', response.data['tokens'])
+        self.assertIn('refresh', response.data['tokens'])
+
+        user = User.objects.get(username="newuser")
+        self.assertEqual(user.category_set.count(), len(Category.DEFAULT_CATEGORIES))
+
+    def test_default_categories_are_idempotent(self):
+        """
+        Creating the default set again skips the categories the user already has
+        """
+        user = User.objects.create_user(username="again", password="testpassword123", email="again@example.com")
+        Category.create_default_categories(user)
+        self.assertEqual(user.category_set.count(), len(Category.DEFAULT_CATEGORIES))
+
+    def test_duplicate_email_and_category(self):
+        """
+        A taken email is rejected, and so is a second category with the same name and type
+        """
+        self.client.post(self.register_url, self.user_data, format='json')
+        response = self.client.post(self.register_url, {**self.user_data, "username": "other"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+        self.client.force_authenticate(user=User.objects.get(username="newuser"))
+        response = self.client.post("/api/categories/", {"name": "Food", "type": "EXPENSE"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post("/api/categories/", {"name": "Food", "type": "INCOME"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
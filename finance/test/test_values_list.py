@@ -0,0 +1,72 @@
+from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from django.contrib.auth.models import User
+from django.test import override_settings
+from unittest import mock
+from finance.models import Account, Category, Transaction, Transfer
+from finance.renderers import FastJSONRenderer
+from finance.views import AccountViewSet, CategoryViewSet, TransactionViewSet, TransferViewSet
+from decimal import Decimal
+from datetime import date, datetime, timezone
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class ValuesListTest(APITestCase):
+    def setUp(self):
+        # Create user
+        self.user = User.objects.create_user(
+            username="valuesuser",
+            password="testpassword123",
+            email="valuesuser@example.com"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.checking = Account.objects.create(name="Checking €", balance=Decimal('0.00'), owner=self.user)
+        self.savings = Account.objects.create(name="Savings", balance=Decimal('-5.10'), owner=self.user)
+        food = Category.objects.get(name="Food", owner=self.user)
+        for i, amount in enumerate([Decimal('0.10'), Decimal('1234567.89'), Decimal('5.00')]):
+            Transaction.objects.create(account=self.checking, category=food if i else None, amount=amount,
+                                       date=date(2025, 1, i + 1), description=f"Café \u2028 \"{i}\"",
+                                       owner=self.user)
+        Transfer.objects.create(from_account=self.checking, to_account=self.savings, amount=Decimal('10.50'),
+                                date=date(2025, 2, 1), description=None, owner=self.user)
+
+    def test_output_matches_model_serializers(self):
+        """
+        The values() path renders the same bytes as the model serializers with DRF's JSONRenderer
+        """
+        for url, view in (
+            ("/api/accounts/", AccountViewSet),
+            ("/api/categories/", CategoryViewSet),
+            ("/api/transactions/?page_size=2", TransactionViewSet),
+            ("/api/transactions/?ordering=amount", TransactionViewSet),
+            ("/api/transfers/", TransferViewSet),
+        ):
+            fast = self.client.get(url)
+            with mock.patch.object(view, 'values_serializer_class', None):
+                slow = self.client.get(url)
+            self.assertEqual(fast.status_code, 200)
+            self.assertEqual(fast.content, slow.content, url)
+            self.assertEqual(fast.content, JSONRenderer().render(slow.data), url)
+
+    def test_list_skips_model_instances(self):
+        """
+        Listing does not build model instances
+        """
+        with mock.patch.object(Transaction, 'from_db', side_effect=AssertionError):
+            response = self.client.get("/api/transactions/")
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_fast_renderer_matches_json_renderer(self):
+        """
+        FastJSONRenderer output is byte-identical to JSONRenderer
+        """
+        data = {
+            "decimal": Decimal('1.10'), "date": date(2025, 3, 1),
+            "datetime": datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc),
+            "text": "line\u2028separator ü", "nested": [1, 2.5, None, True, {"a": ()}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
@@ -1,6 +1,7 @@
 # finance/urls.py
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, AccountViewSet, CategoryViewSet, TransactionViewSet, TransferViewSet
+from .views import UserViewSet, AccountViewSet, CategoryViewSet, TransactionViewSet, TransferViewSet, ReportViewSet
+from .views import StatementImportViewSet, BudgetViewSet, RecurringRuleViewSet, DashboardViewSet
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -8,5 +9,13 @@ router.register(r'accounts', AccountViewSet, basename='account')
 router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'transactions', TransactionViewSet, basename='transaction')
 router.register(r'transfers', TransferViewSet, basename='transfer')
+router.register(r'budgets', BudgetViewSet, basename='budget')
+router.register(r'recurring', RecurringRuleViewSet, basename='recurring-rule')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'reports', ReportViewSet, basename='report')
+router.register(r'imports', StatementImportViewSet, basename='import')
+
+# Routes served by async views under ASGI (see finance/async_urls.py)
+ASYNC_READ_ROUTES = {'user-get-current-user', 'account-list', 'category-list', 'transaction-list', 'transaction-detail'}
 
 urlpatterns = router.urls
\ No newline at end of file
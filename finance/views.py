@@ -1,19 +1,80 @@
 # finance/views.py
-from rest_framework import generics, viewsets, filters
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework import generics, mixins, viewsets, filters, status
+from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.models import User
 
-from .models import Account, Category, Transaction, Transfer
+from django.db import transaction
+from django.db.models import Sum
+from .models import Account, Budget, Category, RecurringRule, Transaction, Transfer, MonthlyCategoryTotal, StatementImport
+from .models import ArchivedTransaction, ArchivedTransfer
 from .serializers import (
     UserRegisterSerializer, UserSerializer, AccountSerializer, CategorySerializer, 
     TransactionSerializer, TransferSerializer
 )
 from .permissions import IsOwner
-from .serializers import UserUpdateSerializer
+from .pagination import KeysetPagination, StagedRowPagination
+from .lookups import request_lookups
+from .serializers import UserUpdateSerializer, BULK_MAX_ITEMS
+from .serializers import MonthlyReportQuerySerializer, MonthlyReportRowSerializer
+from .serializers import BalanceHistoryQuerySerializer, BalancePointSerializer
+from .serializers import ExportQuerySerializer, SearchQuerySerializer
+from .serializers import (
+    AccountValuesSerializer, CategoryValuesSerializer, TransactionValuesSerializer, TransferValuesSerializer,
+    split_field_list,
+)
+from .serializers import RecurringRuleSerializer, DashboardQuerySerializer
+from .serializers import BudgetSerializer, BudgetStatusQuerySerializer, BudgetStatusRowSerializer
+from .serializers import StatementUploadSerializer, StatementImportSerializer, StagedTransactionSerializer
+from .balances import ledger_batch
+from .budgets import backfill_budget, budget_status
+from .dashboard import build_dashboard
+from .recurring import reschedule
+from .checkpoints import balance_at, balance_series
+from .exports import export_rows, merge_export_rows, stream_csv, stream_ndjson
+from .renderers import CSVRenderer, NDJSONRenderer
+from .imports import StatementError, commit_import, create_import
+from .search import FullTextSearchFilter, ranked_search, search_tokens
+from .caching import (
+    aget_cached_response, aset_cached_response, get_cached_response, is_not_modified, response_cache_key,
+    response_cache_timeout, response_etag, set_cached_response,
+)
+from .watermarks import aget_watermark, get_watermark, touch_owners
+from .authentication import CachedJWTAuthentication
+from .routers import aread_database, read_database, reads_from, replica_database, use_database
+from .renderers import FastJSONRenderer
+from .metrics import timed_serialization
+from django.http import Http404, StreamingHttpResponse
+from django.utils.http import http_date
+from django.utils import timezone
+from decimal import Decimal
+
+
+def serialized_data(serializer):
+    """``serializer.data``, counted as serialization time in the request metrics"""
+    with timed_serialization():
+        return serializer.data
+
 
+def serialize_rows(serializer, rows):
+    """``ValuesSerializer.serialize(rows)``, counted as serialization time in the request metrics"""
+    with timed_serialization():
+        return serializer.serialize(rows)
+
+# Mixin timing the serializer work of DRF's list and retrieve (see finance/metrics.py)
+class SerializationMetricsMixin:
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialized_data(self.get_serializer(page, many=True)))
+        return Response(serialized_data(self.get_serializer(list(queryset), many=True)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(serialized_data(self.get_serializer(self.get_object())))
 
 # View for handling user registration
 class UserRegisterView(generics.CreateAPIView):
@@ -25,11 +86,99 @@ class UserRegisterView(generics.CreateAPIView):
         response = super().create(request, *args, **kwargs)
         return response
 
+# Mixin sending the reads of read-only actions to the read replica (see finance/routers.py)
+class ReplicaReadMixin:
+    # Actions that only read; the owner's reads stay on the primary for a while after they write
+    replica_actions = frozenset({'list', 'retrieve', 'export', 'search'})
+
+    def dispatch(self, request, *args, **kwargs):
+        with reads_from(None):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            use_database(read_database(request.user.pk))
+        elif request.method not in SAFE_METHODS and replica_database() is not None:
+            # Covers writes that do not go through touch_owners() (budgets, recurring rules)
+            touch_owners(request.user.pk)
+
+    def reads_from_replica(self, request):
+        return request.method in SAFE_METHODS and self.action in self.replica_actions
+
+    async def aget_read_database(self, request):
+        """Database of an async view's reads, see initial()"""
+        if self.reads_from_replica(request):
+            return await aread_database(request.user.pk)
+        return None
+
+# Mixin serving selected GET actions from async handlers (``a<action>``) under ASGI, see finance/async_views.py
+class AsyncReadMixin:
+    # {action: query parameters the async handler supports}; other requests take the sync path
+    async_actions = {}
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        dispatch() for the actions in ``async_actions``. Returns None when the
+        request has to go through the sync view instead: unsupported query
+        parameters, a media type other than JSON (e.g. the browsable API) or
+        no JWT.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        params = self.async_actions.get(self.action)
+        if params is None or not request.query_params.keys() <= params:
+            return None
+
+        try:
+            self.format_kwarg = self.get_format_suffix(**kwargs)
+            request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+            if not isinstance(request.accepted_renderer, FastJSONRenderer) or not self.authenticate_token(request):
+                return None
+            self.check_permissions(request)
+            self.check_throttles(request)
+            database = await self.aget_read_database(request) if isinstance(self, ReplicaReadMixin) else None
+            with reads_from(database):
+                response = await getattr(self, f'a{self.action}')(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    def authenticate_token(self, request):
+        """Authenticates the request from its JWT alone (no query); False without a token"""
+        for authenticator in request.authenticators:
+            if isinstance(authenticator, CachedJWTAuthentication):
+                user_auth = authenticator.authenticate(request)
+                if user_auth is None:
+                    return False
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return True
+        return False
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """retrieve() for async views: the row is read with aget()"""
+        return Response(serialized_data(self.get_serializer(await self.aget_object())))
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
 # ViewSet for managing user profile
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(AsyncReadMixin, SerializationMetricsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    async_actions = {'get_current_user': frozenset()}
     
     def get_queryset(self):
         # Solo permitir que el usuario vea su propio perfil
@@ -40,6 +189,11 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         """Endpoint para obtener datos del usuario actual"""
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
+
+    async def aget_current_user(self, request):
+        """get_current_user() for async views: the user is loaded without blocking"""
+        user = await request.user.aresolve()
+        return Response(self.get_serializer(user).data)
     
     def get_serializer_class(self):
         if self.action == 'update_profile':
@@ -59,45 +213,521 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
 
 # Mixin to handle owner-specific operations
 class OwnerMixin:
+    # Owner-scoped {id: instance} maps used by LookupPrimaryKeyRelatedField (loaded once per request)
+    owner_lookups = {}
+
     # Filter queryset to only show objects owned by the current user
     def get_queryset(self):
-        return super().get_queryset().filter(owner=self.request.user)
+        return super().get_queryset().filter(owner_id=self.request.user.pk)
 
-    # Automatically set the owner when creating new objects
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.owner_lookups and self.request is not None and self.request.user.is_authenticated:
+            context.update(request_lookups(self.request, self.owner_lookups))
+        return context
+
+    # Automatically set the owner when creating new objects. Every write flushes its ledger
+    # changes, and those of the rows it cascades to, once per request
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        with ledger_batch(savepoint=False):
+            serializer.save(owner=self.request.user)
+
+    def perform_update(self, serializer):
+        with ledger_batch(savepoint=False):
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with ledger_batch(savepoint=False):
+            instance.delete()
+
+# Mixin answering conditional GETs and caching list/detail responses per user until one of the user's objects changes
+class ResponseCacheMixin:
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Answers 304 Not Modified from the user's change watermark, or serves the
+        response data from the cache, keyed by the watermark version read from
+        the database (so every worker sees a write as soon as it commits)
+        """
+        version, modified_at = get_watermark(request.user.pk)
+        etag = response_etag(request, self, version)
+        if is_not_modified(request, etag, modified_at, resolved=False):
+            return self.validated_response(request, None, etag, modified_at)
+
+        use_cache = bool(response_cache_timeout())
+        if use_cache:
+            key = response_cache_key(request, (version, modified_at), self)
+            cached = get_cached_response(key)
+            if cached is not None:
+                return self.validated_response(request, cached, etag, modified_at, cache='HIT')
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            if is_not_modified(request, etag, modified_at):
+                # If-None-Match: * or If-Modified-Since, answered once the object is known to exist
+                return self.validated_response(request, None, etag, modified_at)
+            if use_cache:
+                set_cached_response(key, response.data)
+                response['X-Cache'] = 'MISS'
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(modified_at.timestamp())
+        return response
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """cached_response() for async views: the cache and the watermark are read without blocking"""
+        version, modified_at = await aget_watermark(request.user.pk)
+        etag = response_etag(request, self, version)
+        if is_not_modified(request, etag, modified_at, resolved=False):
+            return self.validated_response(request, None, etag, modified_at)
+
+        use_cache = bool(response_cache_timeout())
+        if use_cache:
+            key = response_cache_key(request, (version, modified_at), self)
+            cached = await aget_cached_response(key)
+            if cached is not None:
+                return self.validated_response(request, cached, etag, modified_at, cache='HIT')
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            if is_not_modified(request, etag, modified_at):
+                # If-None-Match: * or If-Modified-Since, answered once the object is known to exist
+                return self.validated_response(request, None, etag, modified_at)
+            if use_cache:
+                await aset_cached_response(key, response.data)
+                response['X-Cache'] = 'MISS'
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(modified_at.timestamp())
+        return response
+
+    @staticmethod
+    def validated_response(request, data, etag, modified_at, cache=None):
+        if is_not_modified(request, etag, modified_at):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified_at.timestamp())
+        if cache:
+            response['X-Cache'] = cache
+        return response
+
+# Mixin adding ?include_archived=1 to list and export: the archive table is merged with the hot one
+class ArchiveMixin:
+    # Model holding the archived rows (see finance/archive.py)
+    archive_model = None
+
+    @property
+    def include_archived(self):
+        return (
+            self.archive_model is not None
+            and self.request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def get_archive_queryset(self):
+        return self.archive_model.objects.filter(owner_id=self.request.user.pk)
+
+    def get_ledger_querysets(self):
+        """The filtered hot queryset, plus the archived one when requested"""
+        querysets = [self.get_queryset()]
+        if self.include_archived:
+            querysets.append(self.get_archive_queryset())
+        return [self.filter_queryset(queryset) for queryset in querysets]
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived:
+            return super().list(request, *args, **kwargs)
+
+        querysets = self.get_ledger_querysets()
+        serializer = self.get_values_serializer(querysets[0])
+        querysets = [queryset.values(*serializer.lookups) for queryset in querysets]
+        page = None
+        if self.paginator is not None:
+            page = self.paginator.paginate_union(querysets, request, view=self)
+        if page is not None:
+            return self.get_paginated_response(serialize_rows(serializer, page))
+        return Response(serialize_rows(serializer, [row for queryset in querysets for row in queryset]))
+
+# Mixin building list responses from values() rows instead of model instances and serializer fields
+class ValuesListMixin:
+    # ValuesSerializer producing the same output as serializer_class
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_values_serializer(queryset)
+        queryset = queryset.values(*serializer.lookups)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_rows(serializer, page))
+        return Response(serialize_rows(serializer, list(queryset)))
+
+    async def alist(self, request, *args, **kwargs):
+        """list() for async views: the rows are read with aiterator()"""
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_values_serializer(queryset)
+        queryset = queryset.values(*serializer.lookups)
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(serialize_rows(serializer, page))
+        return Response(serialize_rows(serializer, [row async for row in queryset.aiterator()]))
+
+    def get_values_serializer(self, queryset):
+        """Applies ?fields= (sparse fieldset) and ?expand= (related objects) to the projection"""
+        params = self.request.query_params
+        fields = params.get('fields')
+        # The keyset paginator reads its cursor columns from the page rows
+        extra = []
+        if hasattr(self.paginator, 'get_keyset_ordering'):
+            extra = [field.lstrip('-') for field in self.paginator.get_keyset_ordering(self.request, queryset, self)]
+        return self.values_serializer_class(
+            fields=split_field_list(fields) if fields is not None else None,
+            expand=split_field_list(params.get('expand', '')),
+            extra=extra,
+        )
+
+# Mixin adding a POST <resource>/bulk/ endpoint that creates a list of objects at once
+class BulkCreateMixin:
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Validates a list of objects and creates them in one database transaction"""
+        serializer = self.get_serializer_class()(
+            data=request.data,
+            many=True,
+            max_length=BULK_MAX_ITEMS,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+# Mixin adding a GET <resource>/export/ endpoint that streams the user's rows as CSV or NDJSON
+class ExportMixin:
+    # (header, values_list lookup) pairs; related names are joined in SQL
+    export_columns = []
+
+    @action(detail=False, methods=['get'], url_path='export',
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """Streams rows chronologically without building serializer instances"""
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        if isinstance(self, ArchiveMixin):
+            querysets = self.get_ledger_querysets()
+        else:
+            querysets = [self.filter_queryset(self.get_queryset())]
+        row_iterators = []
+        for queryset in querysets:
+            if query.get('from'):
+                queryset = queryset.filter(date__gte=query['from'])
+            if query.get('to'):
+                queryset = queryset.filter(date__lte=query['to'])
+            # The rows are streamed after the view returns: pin the database routed for this request
+            queryset = queryset.using(queryset.db)
+            row_iterators.append(export_rows(queryset.order_by('date', 'id'), self.export_columns))
+        rows = row_iterators[0] if len(row_iterators) == 1 else merge_export_rows(row_iterators, self.export_columns)
+
+        renderer = request.accepted_renderer
+        stream = stream_ndjson if renderer.format == 'ndjson' else stream_csv
+        response = StreamingHttpResponse(
+            stream(rows, self.export_columns),
+            content_type=f'{renderer.media_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}s.{renderer.format}"'
+        return response
+
+# Mixin adding a GET <resource>/search/ endpoint returning the best description matches
+class RankedSearchMixin:
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Ranked prefix search on descriptions (?q=&limit=), best match first"""
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        tokens = search_tokens(params.validated_data['q'])
+        if not tokens:
+            return Response({'results': []})
+        rows = ranked_search(self.filter_queryset(self.get_queryset()), tokens, params.validated_data['limit'])
+        return Response({'results': self.get_serializer(rows, many=True).data})
 
 # ViewSet for managing bank accounts
-class AccountViewSet(OwnerMixin, viewsets.ModelViewSet):
-    queryset = Account.objects.all()
+class AccountViewSet(OwnerMixin, ReplicaReadMixin, ResponseCacheMixin, ValuesListMixin, AsyncReadMixin,
+                     SerializationMetricsMixin, viewsets.ModelViewSet):
+    # The carry-forward of archived rows is read with the account (balance history)
+    queryset = Account.objects.all().select_related('carry_forward')
     serializer_class = AccountSerializer
+    values_serializer_class = AccountValuesSerializer
     permission_classes = [IsAuthenticated, IsOwner]
+    async_actions = {'list': frozenset({'fields'})}
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
 
+    @action(detail=True, methods=['get'], url_path='balance-history')
+    def balance_history(self, request, pk=None):
+        """Balance at a past date (?at=) or a series (?from=&to=&interval=day|month)"""
+        account = self.get_object()
+        params = BalanceHistoryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        if query.get('from'):
+            points = balance_series(account, query['from'], query['to'], interval=query['interval'])
+            return Response({
+                'account': account.pk,
+                'interval': query['interval'],
+                'results': BalancePointSerializer(
+                    [{'date': day, 'balance': balance} for day, balance in points], many=True
+                ).data,
+            })
+
+        at = query.get('at') or timezone.localdate()
+        point = BalancePointSerializer({'date': at, 'balance': balance_at(account, at)}).data
+        return Response({'account': account.pk, **point})
+
 # ViewSet for managing transaction categories
-class CategoryViewSet(OwnerMixin, viewsets.ModelViewSet):
+class CategoryViewSet(OwnerMixin, ReplicaReadMixin, ResponseCacheMixin, ValuesListMixin, AsyncReadMixin,
+                      SerializationMetricsMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    values_serializer_class = CategoryValuesSerializer
     permission_classes = [IsAuthenticated, IsOwner]
+    async_actions = {'list': frozenset({'fields'})}
     filter_backends = [filters.SearchFilter]
     search_fields = ['name', 'type']
 
 # ViewSet for managing financial transactions
-class TransactionViewSet(OwnerMixin, viewsets.ModelViewSet):
+class TransactionViewSet(OwnerMixin, ReplicaReadMixin, ResponseCacheMixin, ArchiveMixin, ValuesListMixin, AsyncReadMixin,
+                         BulkCreateMixin, ExportMixin, RankedSearchMixin, SerializationMetricsMixin,
+                         viewsets.ModelViewSet):
     # Use select_related to optimize database queries
     queryset = Transaction.objects.all().select_related('account', 'category')
+    archive_model = ArchivedTransaction
     serializer_class = TransactionSerializer
+    values_serializer_class = TransactionValuesSerializer
+    owner_lookups = {'accounts_by_id': Account, 'categories_by_id': Category}
     permission_classes = [IsAuthenticated, IsOwner]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    pagination_class = KeysetPagination
+    async_actions = {'list': frozenset({'fields', 'expand', 'cursor', 'page_size'}), 'retrieve': frozenset()}
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['account', 'category', 'date']
     ordering_fields = ['date', 'amount']
     search_fields = ['description']
+    export_columns = [
+        ('id', 'id'),
+        ('date', 'date'),
+        ('account', 'account__name'),
+        ('category', 'category__name'),
+        ('type', 'category__type'),
+        ('amount', 'amount'),
+        ('description', 'description'),
+    ]
 
 # ViewSet for managing transfers between accounts
-class TransferViewSet(OwnerMixin, viewsets.ModelViewSet):
+class TransferViewSet(OwnerMixin, ReplicaReadMixin, ResponseCacheMixin, ArchiveMixin, ValuesListMixin, BulkCreateMixin,
+                      ExportMixin, RankedSearchMixin, SerializationMetricsMixin, viewsets.ModelViewSet):
     queryset = Transfer.objects.all()
+    archive_model = ArchivedTransfer
+    owner_lookups = {'accounts_by_id': Account}
     serializer_class = TransferSerializer
+    values_serializer_class = TransferValuesSerializer
     permission_classes = [IsAuthenticated, IsOwner]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['description']
\ No newline at end of file
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ['description']
+    export_columns = [
+        ('id', 'id'),
+        ('date', 'date'),
+        ('from_account', 'from_account__name'),
+        ('to_account', 'to_account__name'),
+        ('amount', 'amount'),
+        ('description', 'description'),
+    ]
+
+# ViewSet for monthly category budgets and their consumption
+class BudgetViewSet(OwnerMixin, ReplicaReadMixin, SerializationMetricsMixin, viewsets.ModelViewSet):
+    queryset = Budget.objects.all().select_related('category')
+    serializer_class = BudgetSerializer
+    owner_lookups = {'categories_by_id': Category}
+    permission_classes = [IsAuthenticated, IsOwner]
+    replica_actions = frozenset({'list', 'retrieve', 'consumption'})
+
+    # Fill the periods of a new budget from the monthly rollup
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+            backfill_budget(serializer.instance)
+
+    # Moving a budget to another category refills its periods
+    def perform_update(self, serializer):
+        category_id = serializer.instance.category_id
+        with transaction.atomic():
+            budget = serializer.save()
+            if budget.category_id != category_id:
+                backfill_budget(budget)
+
+    @action(detail=False, methods=['get'], url_path='status')
+    def consumption(self, request):
+        """Spent and remaining amount of every budget in a month (default: the current one)"""
+        params = BudgetStatusQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        month = params.validated_data.get('month') or timezone.localdate().replace(day=1)
+
+        results = []
+        for row in budget_status(request.user.pk, month):
+            spent = row['current__spent'] or Decimal('0.00')
+            results.append({
+                'budget': row['pk'],
+                'category': row['category_id'],
+                'category_name': row['category__name'],
+                'amount': row['amount'],
+                'spent': spent,
+                'remaining': row['amount'] - spent,
+                'count': row['current__count'] or 0,
+                'percent': (spent * 100 / row['amount']).quantize(Decimal('0.1')),
+            })
+        return Response({
+            'month': month.strftime('%Y-%m'),
+            'results': BudgetStatusRowSerializer(results, many=True).data,
+        })
+
+# ViewSet for recurring transaction rules (materialized by the materialize_recurring command)
+class RecurringRuleViewSet(OwnerMixin, ReplicaReadMixin, SerializationMetricsMixin, viewsets.ModelViewSet):
+    queryset = RecurringRule.objects.all()
+    serializer_class = RecurringRuleSerializer
+    owner_lookups = {'accounts_by_id': Account, 'categories_by_id': Category}
+    permission_classes = [IsAuthenticated, IsOwner]
+
+    # Schedule fields that move the next occurrence
+    schedule_fields = ('frequency', 'interval', 'start_date', 'end_date')
+
+    def perform_create(self, serializer):
+        rule = RecurringRule(**serializer.validated_data)
+        reschedule(rule)
+        serializer.save(owner=self.request.user, next_date=rule.next_date)
+
+    def perform_update(self, serializer):
+        schedule = [getattr(serializer.instance, name) for name in self.schedule_fields]
+        rule = serializer.save()
+        if schedule != [getattr(rule, name) for name in self.schedule_fields]:
+            reschedule(rule)
+            rule.save(update_fields=['next_date'])
+
+# ViewSet for importing bank statements (CSV/OFX) through a staging table
+class StatementImportViewSet(OwnerMixin, SerializationMetricsMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                             mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    queryset = StatementImport.objects.all()
+    serializer_class = StatementImportSerializer
+    permission_classes = [IsAuthenticated, IsOwner]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def create(self, request):
+        """Parses an uploaded statement into staging and reports matches and duplicates"""
+        upload = StatementUploadSerializer(data=request.data, context=self.get_serializer_context())
+        upload.is_valid(raise_exception=True)
+        data = upload.validated_data
+        statement = create_import(
+            owner=request.user,
+            account=data['account'],
+            stream=data['file'],
+            format=data['format'],
+            file_name=data['file'].name[:255],
+            date_format=data.get('date_format'),
+            income_category=data.get('income_category'),
+            expense_category=data.get('expense_category'),
+        )
+        response_status = status.HTTP_400_BAD_REQUEST if statement.status == 'FAILED' else status.HTTP_201_CREATED
+        return Response(self.get_serializer(statement).data, status=response_status)
+
+    @action(detail=True, methods=['get'], url_path='rows')
+    def rows(self, request, pk=None):
+        """Staged rows of an import, optionally filtered by ?status="""
+        statement = self.get_object()
+        rows = statement.rows.all()
+        if request.query_params.get('status'):
+            rows = rows.filter(status=request.query_params['status'].upper())
+        paginator = StagedRowPagination()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response(StagedTransactionSerializer(page, many=True).data)
+
+    @action(detail=True, methods=['post'], url_path='commit')
+    def commit(self, request, pk=None):
+        """Writes the accepted rows to the ledger in chunks"""
+        statement = self.get_object()
+        try:
+            statement = commit_import(statement)
+        except StatementError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(statement).data)
+
+    def destroy(self, request, *args, **kwargs):
+        """Discards an import and its staged rows (committed transactions are kept)"""
+        if self.get_object().status == 'COMMITTING':
+            return Response({'detail': "The import is being committed."}, status=status.HTTP_409_CONFLICT)
+        return super().destroy(request, *args, **kwargs)
+
+# ViewSet for the home screen: profile, accounts, month totals and latest activity in one response
+class DashboardViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        """Dashboard of the current user, built from a fixed number of queries (see finance/dashboard.py)"""
+        params = DashboardQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(build_dashboard(request.user, timezone.localdate(), params.validated_data['limit']))
+
+# ViewSet for reports built from pre-aggregated rollup tables
+class ReportViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    replica_actions = frozenset({'monthly'})
+
+    @action(detail=False, methods=['get'], url_path='monthly')
+    def monthly(self, request):
+        """Monthly totals per category read from the MonthlyCategoryTotal rollup"""
+        params = MonthlyReportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        rows = MonthlyCategoryTotal.objects.filter(owner_id=request.user.pk).exclude(count=0)
+        if query.get('from'):
+            rows = rows.filter(month__gte=query['from'])
+        if query.get('to'):
+            rows = rows.filter(month__lte=query['to'])
+        if query.get('account'):
+            rows = rows.filter(account_id=query['account'])
+
+        rows = (
+            rows.order_by('month', 'category__name')
+            .values('month', 'category', 'category__name', 'category__type')
+            .annotate(total=Sum('total'), count=Sum('count'))
+        )
+        results = [
+            {
+                'month': row['month'],
+                'category': row['category'],
+                'category_name': row['category__name'],
+                'type': row['category__type'],
+                'total': row['total'],
+                'count': row['count'],
+            }
+            for row in rows
+        ]
+        return Response({
+            'from': query['from'].strftime('%Y-%m') if query.get('from') else None,
+            'to': query['to'].strftime('%Y-%m') if query.get('to') else None,
+            'results': MonthlyReportRowSerializer(results, many=True).data,
+        })
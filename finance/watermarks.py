@@ -0,0 +1,47 @@
+# finance/watermarks.py
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ChangeWatermark
+
+
+def touch_owners(*owner_ids):
+    """
+    Records that the owners' data changed: bumps their change watermark (in
+    the current transaction, which also moves their cached responses to new
+    keys). Its ``modified_at`` keeps their reads on the primary while the
+    replica catches up (see ``finance.routers.read_database``).
+    """
+    owner_ids = {owner_id for owner_id in owner_ids if owner_id is not None}
+    if not owner_ids:
+        return
+    ChangeWatermark.objects.filter(owner_id__in=owner_ids).update(
+        version=F('version') + 1, modified_at=timezone.now()
+    )
+
+
+def get_watermark(owner_id):
+    """
+    Returns ``(version, modified_at)`` of the owner's data.
+
+    The row is created on first use; changes made before that need no
+    tracking since no client can hold a validator for them.
+    """
+    watermark = ChangeWatermark.objects.filter(owner_id=owner_id).values_list('version', 'modified_at').first()
+    if watermark is None:
+        row, _ = ChangeWatermark.objects.get_or_create(owner_id=owner_id, defaults={'modified_at': timezone.now()})
+        watermark = (row.version, row.modified_at)
+    return watermark
+
+
+async def aget_watermark(owner_id):
+    """``get_watermark()`` for async views."""
+    watermark = await (
+        ChangeWatermark.objects.filter(owner_id=owner_id).values_list('version', 'modified_at').afirst()
+    )
+    if watermark is None:
+        row, _ = await ChangeWatermark.objects.aget_or_create(
+            owner_id=owner_id, defaults={'modified_at': timezone.now()}
+        )
+        watermark = (row.version, row.modified_at)
+    return watermark
@@ -0,0 +1,9 @@
+# project_finance/asgi_urls.py
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+# URLconf of the ASGI entry point: the API routes of finance/async_urls.py replace finance.urls
+urlpatterns = [pattern for pattern in wsgi_urlpatterns if str(pattern.pattern) != 'api/'] + [
+    path('api/', include('finance.async_urls')),
+]
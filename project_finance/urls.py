@@ -3,11 +3,13 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from finance.views import UserRegisterView
+from finance.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/register/', UserRegisterView.as_view(), name='register'),
     path('api/auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/_metrics', metrics_view, name='metrics'),
     path('api/', include('finance.urls')),
 ]